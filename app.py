@@ -1,176 +1,148 @@
+import os
+import re
+
+import numpy as np
 import streamlit as st
 import pandas as pd
 from PIL import Image
-import re
-
-def clean_prices(prices):
-    """
-    Cleans a group of price strings by:
-      1. Removing HTML tags.
-      2. Stripping out all non-numeric, comma, dot, or minus chars.
-      3. Returning a comma-separated string of unique cleaned values.
-    """
-    cleaned = []
-    for price in prices:
-        if pd.notna(price):
-            s = str(price)
-            # 1) Remove any HTML tags entirely
-            s = re.sub(r"<[^>]*>", "", s)
-
-            # 2) Keep only digits, ., ,, -, (and strip leftover spaces)
-            s = re.sub(r"[^0-9.,\-]+", "", s).strip()
-            
-            # Now s should be mostly numeric with . or , or - 
-            # If it's not empty and not already in our list, add it
-            if s and s not in cleaned:
-                cleaned.append(s)
-    return ', '.join(cleaned)
-
-def load_welding_data():
-    """Load the welding CSV file."""
-    try:
-        data = pd.read_csv("combined_csvs/combined_20250327_121553.csv")
-        return data
-    except Exception as e:
-        st.error(f"Error loading Welding CSV file: {e}")
-        return None
 
-def load_helmet_data():
-    """Load the helmet CSV file."""
-    try:
-        # Update path if your helmet CSV is located elsewhere
-        data = pd.read_csv("combined_csv/helmet_combined_20250330_212159.csv")
-        return data
-    except Exception as e:
-        st.error(f"Error loading Helmet CSV file: {e}")
-        return None
-
-def pivot_data(df):
+from comparison import (
+    PIVOT_INDEX, PivotIndex, build_pivot, card_page, cheapest_mask, comparison_frame, pivot_path, product_cards,
+    read_pivot, shop_columns,
+)
+from price_store import PARQUET_AVAILABLE, PriceStore, run_id_from_filename
+
+# Shown when the price store has no run of a catalogue yet.
+FALLBACK_CSVS = {
+    "welders": "combined_csvs/combined_20250327_121553.csv",
+    "helmets": "combined_csv/helmet_combined_20250330_212159.csv",
+}
+# Columns the comparison pages need; only these are read from the price store.
+DISPLAY_COLUMNS = ["BRAND", "PRODUCT NAME", "Shop Name", "Price"]
+PRICE_FORMAT = "{:,.2f}"
+# Products per page in the Styled view; only the visible page is rendered.
+CARDS_PER_PAGE = 20
+
+def current_source(catalogue):
+    """Return (path, mtime) of the run to show: the newest stored run, else the fallback CSV."""
+    if PARQUET_AVAILABLE:
+        store = PriceStore()
+        run_id = store.latest_run(catalogue)
+        if run_id:
+            path = store.run_path(catalogue, run_id)
+            return path, os.path.getmtime(path)
+    path = FALLBACK_CSVS[catalogue]
+    return path, os.path.getmtime(path)
+
+@st.cache_data(show_spinner=False, max_entries=4)
+def load_source(path, mtime):
     """
-    Pivot the DataFrame so each unique Shop Name becomes a column,
-    using BRAND and PRODUCT NAME as the index.
+    Read a run with Price as a float. mtime is only part of the cache key, so
+    a rewritten file is read again.
     """
-    try:
-        # Ensure BRAND is not all NaN; otherwise pivoting will be empty.
-        if "BRAND" in df.columns:
-            df["BRAND"] = df["BRAND"].fillna("Unknown")
-
-        # Ensure PRODUCT NAME is not all NaN in case that column is empty too.
-        if "PRODUCT NAME" in df.columns:
-            df["PRODUCT NAME"] = df["PRODUCT NAME"].fillna("NoProductName")
-
-        # Pivot
-        pivot_df = df.pivot_table(
-            index=["BRAND", "PRODUCT NAME"],
-            columns="Shop Name",
-            values="Price",
-            aggfunc=clean_prices  # Clean up price values during aggregation.
-        ).reset_index()
-        
-        # Convert all column labels to string (avoid multi-index or unexpected dtypes).
-        pivot_df.columns = [str(c) for c in pivot_df.columns]
-
-        # Check for duplicate columns
-        cols = pivot_df.columns.tolist()
-        if len(cols) != len(set(cols)):
-            st.warning("Duplicate columns found in pivot DataFrame!")
-            st.write("Columns:", cols)
-
-        # Reorder columns so that ELECTROWELD WEBSITE and ELECTROWELD EBAY appear after BRAND, PRODUCT NAME
-        all_columns = list(pivot_df.columns)
-        new_order = ["BRAND", "PRODUCT NAME"]
-        electroweld_columns = ["ELECTROWELD WEBSITE", "ELECTROWELD EBAY"]
-        for col in electroweld_columns:
-            if col in all_columns:
-                new_order.append(col)
-        
-        # Append everything else not already in new_order
-        for col in all_columns:
-            if col not in new_order:
-                new_order.append(col)
-        
-        pivot_df = pivot_df[new_order]
-        return pivot_df
-    except Exception as e:
-        st.error(f"Error pivoting data: {e}")
-        return None
-
-def highlight_min(row):
-    numeric_values = []
-    for cell in row:
-        try:
-            # Convert cell to string, remove commas (thousands separators), strip whitespace
-            value_str = str(cell).replace(",", "").strip()
-            # Now parse the entire string as a float
-            numeric_values.append(float(value_str))
-        except:
-            numeric_values.append(float('inf'))
-            
-    # Find the minimum and highlight all columns that match it
-    min_value = min(numeric_values)
-    is_min = [val == min_value for val in numeric_values]
-    return ['background-color: yellow' if flag else '' for flag in is_min]
-
-
-def display_comparison_page(df, page_title):
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path, columns=DISPLAY_COLUMNS)
+    # CSV prices are scraped text; normalise them once here rather than per cell later.
+    return comparison_frame(pd.read_csv(path, dtype=str))
+
+# cache_resource hands every rerun the same table instead of a copy; pages only slice it.
+@st.cache_resource(show_spinner="Building the comparison table...", max_entries=4)
+def load_pivot(catalogue, path, mtime):
+    """The comparison table of a run: the one the scraper precomputed, or built here once."""
+    run_id = run_id_from_filename(path)
+    if run_id:
+        artifact = pivot_path(catalogue, run_id)
+        if os.path.exists(artifact):
+            return read_pivot(artifact)
+    return build_pivot(load_source(path, mtime))
+
+@st.cache_resource(show_spinner=False, max_entries=4)
+def load_index(catalogue, path, mtime):
+    """The filter indexes of a run's comparison table, built once alongside it (None if the table is empty)."""
+    pivot_df = load_pivot(catalogue, path, mtime)
+    return PivotIndex(pivot_df) if not pivot_df.empty else None
+
+def highlight_min(frame):
+    """Styler.apply(axis=None) callback: highlight each row's lowest price, for the whole table at once."""
+    styles = pd.DataFrame("", index=frame.index, columns=frame.columns)
+    mask = cheapest_mask(frame)
+    styles[mask.columns] = np.where(mask.to_numpy(), "background-color: yellow", "")
+    return styles
+
+def style_prices(frame):
+    """Highlighted, thousands-separated prices; shops without a price stay blank."""
+    return frame.style.apply(highlight_min, axis=None).format(PRICE_FORMAT, subset=shop_columns(frame), na_rep="")
+
+
+def markdown_text(text):
+    """Escape text so Streamlit markdown shows it literally ($ would otherwise start LaTeX)."""
+    return re.sub(r"([\\`*_\[\]$~:<>#|])", r"\\\1", str(text))
+
+def card_markdown(card):
+    """One product's card: its name, then every shop's price, cheapest first and highlighted."""
+    first = card.iloc[0]
+    prices = []
+    for shop, price, cheapest in zip(card["Shop Name"], card["Price"], card["cheapest"]):
+        text = f"{markdown_text(shop)} {PRICE_FORMAT.format(price)}"
+        prices.append(f":orange-background[**{text}**]" if cheapest else text)
+    return f"**{markdown_text(first['BRAND'])}** · {markdown_text(first['PRODUCT NAME'])}\n\n" + " · ".join(prices)
+
+def display_cards(pivot_df, page_title):
+    """The Styled view: one card per product, a page at a time."""
+    cards = product_cards(pivot_df)
+    products = int(cards["row"].iloc[-1]) + 1 if len(cards) else 0
+    if not products:
+        st.info(f"No {page_title} product has a price for the selected shops.")
+        return
+    pages = -(-products // CARDS_PER_PAGE)
+    page = st.number_input(f"{page_title} page (of {pages})", min_value=1, max_value=pages, value=1, step=1)
+    start = (page - 1) * CARDS_PER_PAGE
+    stop = min(start + CARDS_PER_PAGE, products)
+    st.caption(f"Products {start + 1}–{stop} of {products}")
+    for _, card in card_page(cards, start, stop).groupby("row", sort=True):
+        with st.container(border=True):
+            st.markdown(card_markdown(card))
+
+def display_comparison_page(pivot_df, page_title, index, debug=False):
     """
     Reusable function to display a comparison page (for Welders or Helmets).
-    df: Loaded DataFrame from CSV
+    pivot_df: the run's comparison table, from load_pivot
     page_title: A string like "Welders" or "Helmets"
+    index: the table's PivotIndex, from load_index
+    debug: also show the DEBUG output (the sidebar's developer toggle)
     """
-    if df is None:
-        return
-    
-    pivot_df = pivot_data(df)
     if pivot_df is None or pivot_df.empty:
         st.warning(f"{page_title} pivot table is empty or could not be created. Check your CSV data.")
         return
 
-    # Debug info about pivot_df
-    st.write(f"DEBUG: {page_title} pivot_df shape:", pivot_df.shape)
-    st.write(f"DEBUG: {page_title} pivot_df columns:", pivot_df.columns.tolist())
-
-    # Attempt a plain display first (comment this out if not needed)
-    try:
-        st.write(f"DEBUG: Preview of unstyled {page_title} pivot_df:")
-        st.dataframe(pivot_df, use_container_width=True)
-    except:
-        st.error("Plain pivot_df display crashed. Likely due to structure issues.")
-        return
+    if debug:
+        st.write(f"DEBUG: {page_title} pivot_df shape:", pivot_df.shape)
+        st.write(f"DEBUG: {page_title} pivot_df columns:", pivot_df.columns.tolist())
+        try:
+            st.write(f"DEBUG: Preview of unstyled {page_title} pivot_df:")
+            st.dataframe(pivot_df, use_container_width=True)
+        except Exception:
+            st.error("Plain pivot_df display crashed. Likely due to structure issues.")
+            return
 
     # -------------------
     # Build filters
     # -------------------
-    all_brands = sorted(pivot_df["BRAND"].unique())
-    selected_brands = st.sidebar.multiselect(f"Filter {page_title} by Brand", all_brands, default=[])
-    if not selected_brands:
-        selected_brands = all_brands
-        
-    filtered_by_brand = pivot_df[pivot_df["BRAND"].isin(selected_brands)]
-    all_products = sorted(filtered_by_brand["PRODUCT NAME"].unique())
-    
-    selected_products = st.sidebar.multiselect(f"Filter {page_title} by Product Name", all_products, default=[])
-    if not selected_products:
-        selected_products = all_products
-    
-    # All columns except BRAND, PRODUCT NAME are potential "shop" columns
-    company_columns = list(pivot_df.columns[2:])  
-    selected_companies = st.sidebar.multiselect(f"Filter {page_title} by Companies", company_columns, default=[])
-    if not selected_companies:
-        selected_companies = company_columns
-    
+    # Options come from the run's cached index, so a rerun only does lookups.
+    # An empty selection means everything; products narrow to the chosen
+    # brands, to those the chosen companies have a price for, and to the search.
+    selected_brands = st.sidebar.multiselect(f"Filter {page_title} by Brand", index.brand_names, default=[])
+    selected_companies = st.sidebar.multiselect(f"Filter {page_title} by Companies", index.shops, default=[])
+    query = st.sidebar.text_input(f"Search {page_title} products", "",
+                                  help="Every word must appear in the product name; close spellings also match.")
+    product_options = index.product_options(selected_brands, selected_companies, query)
+    selected_products = st.sidebar.multiselect(f"Filter {page_title} by Product Name", product_options, default=[])
+
     # -------------------
     # Apply filters
     # -------------------
-    pivot_df = pivot_df[
-        (pivot_df["BRAND"].isin(selected_brands)) &
-        (pivot_df["PRODUCT NAME"].isin(selected_products))
-    ]
-    
-    # Only keep the columns we need
-    columns_to_show = ["BRAND", "PRODUCT NAME"] + selected_companies
-    columns_to_show = [col for col in columns_to_show if col in pivot_df.columns]
-    pivot_df = pivot_df[columns_to_show]
+    mask = index.row_mask(selected_brands, selected_products, selected_companies, query)
+    pivot_df = pivot_df.loc[mask, PIVOT_INDEX + (selected_companies or index.shops)]
 
     # If there's no data left, warn and return
     if pivot_df.empty or pivot_df.shape[1] < 3:
@@ -182,45 +154,18 @@ def display_comparison_page(df, page_title):
     # Style Choice
     style_choice = st.sidebar.radio(f"{page_title} Table Style", ["Basic", "Styled"])
     
-    # If it's not empty, let's show a quick shape:
-    st.write(f"DEBUG: Final {page_title} pivot_df shape (post-filter):", pivot_df.shape)
+    if debug:
+        st.write(f"DEBUG: Final {page_title} pivot_df shape (post-filter):", pivot_df.shape)
 
     if style_choice == "Basic":
         # Show the full pivot table with highlighting
         try:
-            styled_df = pivot_df.style.apply(highlight_min, axis=1)
+            styled_df = style_prices(pivot_df)
             st.dataframe(styled_df, use_container_width=True)
         except Exception as e:
             st.error(f"Error during styling the {page_title} DataFrame in Basic mode: {e}")
     else:  # "Styled"
-        # Display each product row individually
-        for i, (_, row) in enumerate(pivot_df.iterrows()):
-            product_data = row.to_dict()
-            filtered_data = {
-                "BRAND": product_data.get("BRAND"),
-                "PRODUCT NAME": product_data.get("PRODUCT NAME")
-            }
-            # Only include columns with non-empty values
-            for col in selected_companies:
-                val = product_data.get(col)
-                if pd.notna(val) and val != "" and val != "nan":
-                    filtered_data[col] = val
-            
-            # If there’s no actual shop data here, skip
-            if len(filtered_data) <= 2:  # only BRAND & PRODUCT NAME
-                continue
-
-            product_df = pd.DataFrame([filtered_data])
-
-            # Debug: show the mini DataFrame before styling
-            st.write(f"DEBUG: Mini DataFrame for {page_title} row {i}: shape={product_df.shape}")
-            st.dataframe(product_df)  # unstyled, to ensure it renders
-
-            try:
-                styled_df = product_df.style.apply(highlight_min, axis=1)
-                st.dataframe(styled_df, use_container_width=True)
-            except Exception as e:
-                st.error(f"Error styling mini DataFrame for row {i} ({page_title}): {e}")
+        display_cards(pivot_df, page_title)
 
 def main():
     # Set up the page with a logo and config.
@@ -234,13 +179,24 @@ def main():
     
     # Navigation
     page = st.sidebar.radio("Navigation", ["Welders Comparison", "Helmet Comparison"])
+    debug = st.sidebar.checkbox("Developer mode", value=False, help="Show the DEBUG output of each page")
     
     if page == "Welders Comparison":
-        df_welders = load_welding_data()
-        display_comparison_page(df_welders, "Welders")
+        catalogue, page_title = "welders", "Welders"
     else:  # "Helmet Comparison"
-        df_helmets = load_helmet_data()
-        display_comparison_page(df_helmets, "Helmets")
+        catalogue, page_title = "helmets", "Helmets"
+    try:
+        path, mtime = current_source(catalogue)
+    except OSError as e:
+        st.error(f"Error loading {page_title} data: {e}")
+        return
+    try:
+        pivot_df = load_pivot(catalogue, path, mtime)
+        index = load_index(catalogue, path, mtime)
+    except Exception as e:
+        st.error(f"Error pivoting {page_title} data: {e}")
+        return
+    display_comparison_page(pivot_df, page_title, index, debug)
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,204 @@
+import difflib
+import os
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+import config
+from price_parser import amounts
+from price_store import COLUMN_ALIASES, PARQUET_AVAILABLE, PRICE_COLUMNS
+
+# Rows of the comparison table; every shop becomes a column.
+PIVOT_INDEX = ["BRAND", "PRODUCT NAME"]
+# Our own listings come first, right after the index columns.
+LEADING_SHOPS = ["ELECTROWELD WEBSITE", "ELECTROWELD EBAY"]
+# Bumped whenever the table's layout or dtypes change, so older precomputed tables are not reused.
+PIVOT_VERSION = 2
+
+
+def comparison_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The BRAND / PRODUCT NAME / Shop Name / Price columns of a welder or helmet
+    run, whichever spelling of them (CSV, helmet CSV or price store) it uses,
+    with Price as a float. Scraped text is normalised here, once, in one
+    vectorised pass; the price store's Price is already a float.
+    """
+    aliases = {**COLUMN_ALIASES, "Price": PRICE_COLUMNS}
+    out = pd.DataFrame(index=df.index)
+    for column in PIVOT_INDEX + ["Shop Name", "Price"]:
+        source = next((alias for alias in aliases[column] if alias in df.columns), None)
+        out[column] = df[source] if source else pd.NA
+    if not is_numeric_dtype(out["Price"]):
+        out["Price"] = amounts(out["Price"])
+    # Without these the pivot would drop the rows entirely.
+    out["BRAND"] = out["BRAND"].fillna("Unknown")
+    out["PRODUCT NAME"] = out["PRODUCT NAME"].fillna("NoProductName")
+    return out
+
+
+def build_pivot(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Pivot a run so each unique Shop Name becomes a float column, using BRAND
+    and PRODUCT NAME as the index, with our own shops first. A shop listing a
+    product more than once shows its lowest price.
+    """
+    # groupby keeps products whose shops all came back without a price, which pivot_table drops.
+    pivot_df = (
+        comparison_frame(df)
+        .groupby(PIVOT_INDEX + ["Shop Name"], sort=True)["Price"]
+        .min()
+        .unstack("Shop Name")
+        .reset_index()
+    )
+    pivot_df.columns.name = None
+    # Convert all column labels to string (avoid multi-index or unexpected dtypes).
+    pivot_df.columns = [str(c) for c in pivot_df.columns]
+    leading = PIVOT_INDEX + [shop for shop in LEADING_SHOPS if shop in pivot_df.columns]
+    return pivot_df[leading + [column for column in pivot_df.columns if column not in leading]]
+
+
+def shop_columns(pivot_df: pd.DataFrame) -> list:
+    return [column for column in pivot_df.columns if column not in PIVOT_INDEX]
+
+
+def cheapest_mask(pivot_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    True where a shop's price is the lowest of its row (every shop on a tie),
+    computed over the whole float matrix at once.
+    """
+    prices = pivot_df[shop_columns(pivot_df)]
+    return prices.eq(prices.min(axis=1), axis=0)
+
+
+def product_cards(pivot_df: pd.DataFrame) -> pd.DataFrame:
+    """
+    The comparison table as one row per product and shop with a price, for
+    the dashboard's card view. row numbers the products that have any price
+    in table order, shops within a product are cheapest first and cheapest
+    marks the lowest price. Built in one pass, so a page of cards is a slice.
+    """
+    shops = shop_columns(pivot_df)
+    table = pivot_df[pivot_df[shops].notna().any(axis=1)].reset_index(drop=True)
+    cards = table.reset_index(names="row").melt(
+        id_vars=["row"] + PIVOT_INDEX, value_vars=shops, var_name="Shop Name", value_name="Price",
+    ).dropna(subset=["Price"])
+    cards["cheapest"] = cards["Price"].eq(cards.groupby("row")["Price"].transform("min"))
+    # Stable, so shops on the same price keep their column order.
+    return cards.sort_values(["row", "Price"], kind="mergesort").reset_index(drop=True)
+
+
+def card_page(cards: pd.DataFrame, start: int, stop: int) -> pd.DataFrame:
+    """The rows of product_cards for products start <= row < stop."""
+    rows = cards["row"].to_numpy()
+    return cards.iloc[rows.searchsorted(start):rows.searchsorted(stop)]
+
+
+class PivotIndex:
+    """
+    Lookup tables over a comparison table for the dashboard's filters, built
+    once per run: brands and products as categorical codes (categories in
+    sorted order), each brand's product codes, which products each shop has
+    a price for, and lowercased product names for search. Sidebar options
+    are then dictionary lookups and filters are integer and boolean array
+    operations instead of isin over strings on every rerun.
+    """
+    def __init__(self, pivot_df: pd.DataFrame):
+        brands = pd.Categorical(pivot_df["BRAND"].astype(str))
+        products = pd.Categorical(pivot_df["PRODUCT NAME"].astype(str))
+        self.brand_names = list(brands.categories)
+        self.product_names = list(products.categories)
+        self.brand_codes = brands.codes
+        self.product_codes = products.codes
+        self._brand_code = {name: code for code, name in enumerate(self.brand_names)}
+        self._product_code = {name: code for code, name in enumerate(self.product_names)}
+        self.products_by_brand = {
+            self.brand_names[brand]: np.unique(codes)
+            for brand, codes in pd.Series(self.product_codes).groupby(self.brand_codes)
+        }
+        self.shops = shop_columns(pivot_df)
+        self._shop_position = {shop: position for position, shop in enumerate(self.shops)}
+        # Row x shop and product x shop: does the shop have a price?
+        self.priced = pivot_df[self.shops].notna().to_numpy()
+        self.carried = np.zeros((len(self.product_names), len(self.shops)), dtype=bool)
+        np.logical_or.at(self.carried, self.product_codes, self.priced)
+        self._search_names = np.array([name.lower() for name in self.product_names], dtype=str)
+        self._vocabulary = sorted({word for name in self._search_names for word in name.split()})
+
+    def _codes(self, lookup: dict, names) -> np.ndarray:
+        return np.array([lookup[name] for name in names if name in lookup], dtype=np.int64)
+
+    def shops_for(self, product: str) -> list:
+        """The shops with a price for product, in column order."""
+        code = self._product_code.get(product)
+        return [] if code is None else [shop for shop, has in zip(self.shops, self.carried[code]) if has]
+
+    def search(self, query: str) -> np.ndarray:
+        """
+        Codes of the products whose name contains every word of query,
+        ignoring case. A word no name contains matches the name words closest
+        to it in spelling instead, so "mlti" still finds MULTI.
+        """
+        hits = np.ones(len(self.product_names), dtype=bool)
+        for word in query.lower().split():
+            word_hits = np.char.find(self._search_names, word) >= 0
+            if not word_hits.any():
+                for close in difflib.get_close_matches(word, self._vocabulary, n=3, cutoff=0.7):
+                    word_hits |= np.char.find(self._search_names, close) >= 0
+            hits &= word_hits
+        return np.flatnonzero(hits)
+
+    def product_codes_for(self, brands=(), shops=(), query: str = "") -> np.ndarray:
+        """Sorted codes of the products of brands (all if empty) carried by any of shops and matching query."""
+        if brands:
+            known = [brand for brand in brands if brand in self.products_by_brand]
+            codes = np.unique(np.concatenate([self.products_by_brand[brand] for brand in known])) if known else np.array([], dtype=np.int64)
+        else:
+            codes = np.arange(len(self.product_names))
+        if shops:
+            codes = codes[self.carried[codes][:, self._codes(self._shop_position, shops)].any(axis=1)]
+        if query.strip():
+            codes = np.intersect1d(codes, self.search(query))
+        return codes
+
+    def product_options(self, brands=(), shops=(), query: str = "") -> list:
+        return [self.product_names[code] for code in self.product_codes_for(brands, shops, query)]
+
+    def row_mask(self, brands=(), products=(), shops=(), query: str = "") -> np.ndarray:
+        """
+        Rows of the table to show: the chosen products, or when none are
+        chosen every product of brands carried by shops that matches query.
+        """
+        if products:
+            codes = self._codes(self._product_code, products)
+        else:
+            codes = self.product_codes_for(brands, shops, query)
+        mask = np.isin(self.product_codes, codes)
+        if brands:
+            mask &= np.isin(self.brand_codes, self._codes(self._brand_code, brands))
+        if shops:
+            mask &= self.priced[:, self._codes(self._shop_position, shops)].any(axis=1)
+        return mask
+
+
+def pivot_path(catalogue: str, run_id: str, folder: str = config.PIVOT_DIR) -> str:
+    extension = "parquet" if PARQUET_AVAILABLE else "csv"
+    return os.path.join(folder, f"{catalogue}_{run_id}_v{PIVOT_VERSION}.{extension}")
+
+
+def write_pivot(df: pd.DataFrame, catalogue: str, run_id: str, folder: str = config.PIVOT_DIR) -> str:
+    """Precompute the comparison table of a run so the dashboard only has to load it."""
+    os.makedirs(folder, exist_ok=True)
+    path = pivot_path(catalogue, run_id, folder)
+    pivot_df = build_pivot(df)
+    if path.endswith(".parquet"):
+        pivot_df.to_parquet(path, index=False)
+    else:
+        pivot_df.to_csv(path, index=False)
+    return path
+
+
+def read_pivot(path: str) -> pd.DataFrame:
+    if path.endswith(".parquet"):
+        return pd.read_parquet(path)
+    return pd.read_csv(path, dtype={column: str for column in PIVOT_INDEX})
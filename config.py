@@ -0,0 +1,65 @@
+import os
+
+# Every knob can be overridden with an environment variable of the same name
+# prefixed with SCRAPER_, e.g. SCRAPER_MAX_WORKERS=4 python scraper_script.py
+
+
+def _int_setting(name: str, default: int) -> int:
+    return int(os.environ.get(f"SCRAPER_{name}", default))
+
+
+def _float_setting(name: str, default: float) -> float:
+    return float(os.environ.get(f"SCRAPER_{name}", default))
+
+
+# Companies scraped at the same time by scrape_all / scrape_helmets.
+MAX_WORKERS = _int_setting("MAX_WORKERS", 8)
+# Product links fetched at the same time across all companies.
+ROW_WORKERS = _int_setting("ROW_WORKERS", 16)
+# Product links fetched at the same time from any single host.
+PER_HOST_LIMIT = _int_setting("PER_HOST_LIMIT", 4)
+# Headless Chrome processes shared by the Selenium-backed shops.
+BROWSER_POOL_SIZE = _int_setting("BROWSER_POOL_SIZE", 3)
+# Rows per work unit when the scheduler splits a company for idle workers to pick up.
+CHUNK_ROWS = _int_setting("CHUNK_ROWS", 25)
+# Most recent run logs read when predicting how long each company will take.
+HISTORY_RUNS = _int_setting("HISTORY_RUNS", 10)
+# On-disk HTTP response cache used by fetch_engine. Set SCRAPER_HTTP_CACHE=0 to bypass it.
+HTTP_CACHE = _int_setting("HTTP_CACHE", 1)
+HTTP_CACHE_PATH = os.environ.get("SCRAPER_HTTP_CACHE_PATH", "http_cache.sqlite")
+# Seconds a cached page is served without asking the shop whether it changed.
+HTTP_CACHE_TTL = _int_setting("HTTP_CACHE_TTL", 6 * 60 * 60)
+# Least recently used pages are evicted once the stored pages exceed this size.
+HTTP_CACHE_MAX_MB = _int_setting("HTTP_CACHE_MAX_MB", 500)
+# Keep the raw HTML (or rendered DOM) of every page scraped so prices can be re-parsed offline.
+ARCHIVE_PAGES = _int_setting("ARCHIVE_PAGES", 1)
+PAGE_ARCHIVE_DIR = os.environ.get("SCRAPER_PAGE_ARCHIVE_DIR", "page_archive")
+# Processes used when re-parsing an archived run.
+REPARSE_WORKERS = _int_setting("REPARSE_WORKERS", os.cpu_count() or 4)
+# Incremental runs re-fetch prices older than this many hours (and any missing or changed rows).
+INCREMENTAL_MAX_AGE_HOURS = _int_setting("INCREMENTAL_MAX_AGE_HOURS", 24)
+# Per-run checkpoint journals, used to resume a run that stopped partway.
+RUN_JOURNAL_DIR = os.environ.get("SCRAPER_RUN_JOURNAL_DIR", "runs")
+# Per-host request rate (requests per second). Each host starts at RATE_INITIAL, doubles every
+# second until its first 429/503 or Retry-After, then speeds up slowly while requests succeed
+# and halves on a 429/503, staying within RATE_MIN..RATE_MAX.
+RATE_INITIAL = _float_setting("RATE_INITIAL", 4.0)
+RATE_MIN = _float_setting("RATE_MIN", 0.2)
+RATE_MAX = _float_setting("RATE_MAX", 20.0)
+# Retries after a throttled or failed request, and the base of their jittered exponential backoff.
+MAX_RETRIES = _int_setting("MAX_RETRIES", 3)
+RETRY_BACKOFF = _float_setting("RETRY_BACKOFF", 1.0)
+# Shared work queue that `queue work` processes pull urls from (see work_queue.py).
+WORK_QUEUE_PATH = os.environ.get("SCRAPER_WORK_QUEUE_PATH", "work_queue.sqlite")
+# Seconds a worker may hold a batch before it is handed to another worker.
+QUEUE_LEASE_SECONDS = _int_setting("QUEUE_LEASE_SECONDS", 300)
+# Attempts at a url that keeps coming back without a price before it is marked failed.
+QUEUE_MAX_ATTEMPTS = _int_setting("QUEUE_MAX_ATTEMPTS", 3)
+# Structured-data (JSON-LD, microdata, OpenGraph) prices further than this fraction from the
+# price the profile selector reads off the same page are ignored in favour of the selector's.
+STRUCTURED_PRICE_TOLERANCE = _float_setting("STRUCTURED_PRICE_TOLERANCE", 0.01)
+# Typed Parquet copy of every combined run, partitioned by catalogue and run date (needs pyarrow).
+PRICE_STORE = _int_setting("PRICE_STORE", 1)
+PRICE_STORE_DIR = os.environ.get("SCRAPER_PRICE_STORE_DIR", "price_store")
+# Comparison tables precomputed after each run for the dashboard.
+PIVOT_DIR = os.environ.get("SCRAPER_PIVOT_DIR", "pivots")
@@ -0,0 +1,160 @@
+import atexit
+import queue
+import threading
+from contextlib import contextmanager
+
+import config
+
+# Upper bound on Chrome processes shared by every Selenium-backed scraper.
+POOL_SIZE = config.BROWSER_POOL_SIZE
+PAGE_LOAD_TIMEOUT = 15
+
+# Requests Chrome never needs to make just to read a price node, blocked the same
+# way for every shop. Only media, fonts and third-party tags are listed: the shops'
+# own scripts and XHR calls, which render their price widgets, are never blocked.
+# A pattern that some shop's price does depend on has to come off this list.
+# Patterns use the wildcard syntax of the DevTools Network.setBlockedURLs command.
+BLOCKED_URL_PATTERNS = (
+    # Images and media
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico", "*.mp4", "*.webm",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    # Analytics, ad and chat tags
+    "*google-analytics.com*", "*googletagmanager.com*", "*googleadservices.com*",
+    "*googlesyndication.com*", "*doubleclick.net*", "*facebook.net*", "*connect.facebook.com*",
+    "*hotjar.com*", "*clarity.ms*", "*bat.bing.com*", "*analytics.tiktok.com*",
+    "*klaviyo.com*", "*nr-data.net*", "*livechatinc.com*", "*zopim.com*", "*youtube.com*",
+)
+
+
+def build_chrome_options():
+    # Selenium is imported on first use so that importing the scraper doesn't pay for it.
+    from selenium.webdriver.chrome.options import Options
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-infobars")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+    # Hand control back once the DOM is parsed; page_waits then waits for the price node itself.
+    chrome_options.page_load_strategy = "eager"
+    chrome_options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2,
+        "profile.default_content_setting_values.notifications": 2,
+    })
+    return chrome_options
+
+
+def apply_resource_blocking(driver):
+    """
+    Block images, fonts and third-party tags for every later navigation. The
+    block list lasts for the driver's life, so it is sent once per driver.
+    """
+    if getattr(driver, "_blocking_applied", False):
+        return
+    try:
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": list(BLOCKED_URL_PATTERNS)})
+    except Exception:
+        # Not a Chromium driver; the content-settings prefs still block images.
+        return
+    driver._blocking_applied = True
+
+
+class DriverPool:
+    """
+    A bounded pool of headless Chrome drivers.
+
+    Drivers are started lazily the first time a scraper borrows one, so shops
+    that are never scraped never launch a browser. At most `size` drivers exist
+    at once; borrowers block until one is returned.
+    """
+    def __init__(self, size: int = POOL_SIZE):
+        self.size = size
+        self._slots = threading.BoundedSemaphore(size)
+        self._idle = queue.LifoQueue()
+        self._drivers = []
+        self._lock = threading.Lock()
+
+    def _start_driver(self):
+        from selenium import webdriver
+        driver = webdriver.Chrome(options=build_chrome_options())
+        driver.set_page_load_timeout(PAGE_LOAD_TIMEOUT)
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+        except Exception:
+            pass
+        with self._lock:
+            self._drivers.append(driver)
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    @staticmethod
+    def _is_alive(driver) -> bool:
+        try:
+            driver.current_url
+            return True
+        except Exception:
+            return False
+
+    @contextmanager
+    def driver(self):
+        """Borrow a driver for the duration of the with-block."""
+        self._slots.acquire()
+        try:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                driver = self._start_driver()
+            try:
+                yield driver
+            finally:
+                # A driver whose browser crashed is replaced on the next borrow.
+                if self._is_alive(driver):
+                    self._idle.put(driver)
+                else:
+                    self._discard(driver)
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Quit every driver started by this pool."""
+        with self._lock:
+            drivers = list(self._drivers)
+            self._drivers.clear()
+        while not self._idle.empty():
+            self._idle.get_nowait()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool() -> DriverPool:
+    """Return the process-wide driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+        return _pool
+
+
+@atexit.register
+def close_driver_pool():
+    if _pool is not None:
+        _pool.close()
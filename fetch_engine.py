@@ -0,0 +1,345 @@
+import asyncio
+import atexit
+import concurrent.futures
+import functools
+import logging
+import sqlite3
+import threading
+from urllib.parse import urlsplit
+
+import numpy as np
+import pandas as pd
+
+import config
+from rate_limiter import MAX_RETRY_AFTER, THROTTLE_STATUSES, HostRateLimiter, backoff_delay, parse_retry_after
+from response_cache import get_response_cache
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/113.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
+}
+DEFAULT_TIMEOUT = 15.0
+# Maximum number of requests in flight against a single host, and in total.
+PER_HOST_LIMIT = config.PER_HOST_LIMIT
+GLOBAL_LIMIT = config.ROW_WORKERS
+# How long an idle keep-alive connection is kept open for the next row of the same shop.
+KEEPALIVE_EXPIRY = 60.0
+# Threads that run response cache calls (SQLite and zlib) off the event loop.
+CACHE_THREADS = 4
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# All fetching happens on one event loop running in a background thread, so the
+# engine can be called from the ThreadPoolExecutor workers in scrape_all. The
+# per-host and cache state below is only created and changed on that thread, so
+# none of it needs locking.
+_loop = None
+_loop_lock = threading.Lock()
+_host_semaphores = {}
+_global_semaphore = None
+# Process-wide pooled clients, one per host, reused across every company and catalogue.
+_clients = {}
+_pool_counters = {}
+_rate_limiters = {}
+_cache_counters = {"fresh": 0, "revalidated": 0, "stale": 0, "fetched": 0, "errors": 0}
+_cache_executor = None
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=_loop.run_forever, name="fetch-engine", daemon=True)
+            thread.start()
+        return _loop
+
+
+def host_of(url: str) -> str:
+    return urlsplit(url).netloc.lower()
+
+
+def is_valid_url(url, url_prefixes=()) -> bool:
+    """Return True if url is a non-empty string starting with one of url_prefixes."""
+    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
+        return False
+    if url_prefixes and not url.startswith(tuple(url_prefixes)):
+        return False
+    return True
+
+
+def _host_semaphore(host: str) -> asyncio.Semaphore:
+    semaphore = _host_semaphores.get(host)
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(PER_HOST_LIMIT)
+        _host_semaphores[host] = semaphore
+    return semaphore
+
+
+def _rate_limiter(host: str) -> HostRateLimiter:
+    limiter = _rate_limiters.get(host)
+    if limiter is None:
+        limiter = HostRateLimiter()
+        _rate_limiters[host] = limiter
+    return limiter
+
+
+def _global_limit() -> asyncio.Semaphore:
+    global _global_semaphore
+    if _global_semaphore is None:
+        _global_semaphore = asyncio.Semaphore(GLOBAL_LIMIT)
+    return _global_semaphore
+
+
+def _client_for(host: str):
+    client = _clients.get(host)
+    if client is None:
+        # Imported on first fetch so that importing the scraper stays fast.
+        import httpx
+        client = httpx.AsyncClient(
+            http2=HTTP2_AVAILABLE,
+            follow_redirects=True,
+            limits=httpx.Limits(
+                max_connections=PER_HOST_LIMIT,
+                max_keepalive_connections=PER_HOST_LIMIT,
+                keepalive_expiry=KEEPALIVE_EXPIRY,
+            ),
+        )
+        _clients[host] = client
+        _pool_counters[host] = {"opened": 0, "reused": 0}
+    return client
+
+
+def _connection_tracer(host: str):
+    """Build an httpcore trace hook that counts new versus reused connections for one request."""
+    state = {"connected": False}
+
+    async def trace(event_name, info):
+        if event_name == "connection.connect_tcp.complete":
+            state["connected"] = True
+            _pool_counters[host]["opened"] += 1
+        elif event_name in ("http11.send_request_headers.started", "http2.send_request_headers.started"):
+            if not state["connected"]:
+                _pool_counters[host]["reused"] += 1
+            state["connected"] = False
+
+    return trace
+
+
+async def _cache_call(call, *args):
+    """
+    Run one response cache call on the cache threads, so disk I/O and
+    compression never hold up requests to other hosts on the event loop.
+
+    The cache is best-effort, like the page archive: a SQLite error (e.g.
+    "database is locked" while shard or queue processes share the file)
+    counts as a miss, or a skipped write, instead of failing the page and
+    with it the shop's whole chunk.
+    """
+    global _cache_executor
+    if _cache_executor is None:
+        _cache_executor = concurrent.futures.ThreadPoolExecutor(CACHE_THREADS, thread_name_prefix="response-cache")
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_cache_executor, functools.partial(call, *args))
+    except sqlite3.Error as e:
+        _cache_counters["errors"] += 1
+        target = f" for {args[0]}" if args else ""
+        logging.warning(f"HTTP cache {call.__name__} failed{target}: {e}")
+        return None
+
+
+async def _fetch_page(url: str, headers, timeout):
+    import httpx
+    # Opening the cache touches SQLite too, so it goes through _cache_call like every read.
+    cache = await _cache_call(get_response_cache)
+    cached = await _cache_call(cache.get, url) if cache else None
+    if cached is not None and cached.is_fresh(cache.ttl):
+        _cache_counters["fresh"] += 1
+        return cached.text
+    if cached is not None:
+        # Stale: ask the shop whether the page changed instead of downloading it again.
+        headers = {**headers, **cached.revalidation_headers()}
+    host = host_of(url)
+    limiter = _rate_limiter(host)
+    response = None
+    for attempt in range(config.MAX_RETRIES + 1):
+        if attempt:
+            limiter.stats["retries"] += 1
+        await limiter.acquire()
+        async with _host_semaphore(host), _global_limit():
+            client = _client_for(host)
+            try:
+                response = await client.get(
+                    url,
+                    headers=headers,
+                    timeout=timeout,
+                    extensions={"trace": _connection_tracer(host)},
+                )
+            except httpx.TransportError:
+                # Connection resets and timeouts are worth another try; anything else is not.
+                response = None
+            except Exception:
+                return None
+        if response is not None and response.status_code not in THROTTLE_STATUSES:
+            limiter.on_success(parse_retry_after(response.headers.get("Retry-After")))
+            break
+        retry_after = None
+        if response is not None:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            limiter.on_throttle(retry_after)
+            if retry_after is not None and retry_after > MAX_RETRY_AFTER:
+                break
+        if attempt < config.MAX_RETRIES:
+            # Sleep outside the semaphores so other hosts keep moving.
+            await asyncio.sleep(backoff_delay(attempt, retry_after))
+    if response is None and cached is not None:
+        # The shop could not be reached to revalidate; a stale page beats no page.
+        _cache_counters["stale"] += 1
+        return cached.text
+    if response is None or response.status_code in THROTTLE_STATUSES:
+        limiter.stats["gave_up"] += 1
+        return None
+    if cached is not None and response.status_code == 304:
+        _cache_counters["revalidated"] += 1
+        await _cache_call(cache.touch, url)
+        return cached.text
+    _cache_counters["fetched"] += 1
+    if cache and response.status_code == 200:
+        await _cache_call(cache.put, url, response.text, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+    return response.text
+
+
+async def _fetch_pages(urls, headers, timeout):
+    # One page going wrong in an unexpected way must not take the rest of the batch with it.
+    pages = await asyncio.gather(*(_fetch_page(url, headers, timeout) for url in urls), return_exceptions=True)
+    for url, page in zip(urls, pages):
+        if isinstance(page, BaseException):
+            logging.warning(f"Fetching {url} failed: {page!r}")
+    return [None if isinstance(page, BaseException) else page for page in pages]
+
+
+def _idle_connections(client) -> int:
+    # httpx does not expose its pool, so peek at the httpcore pool behind the transport.
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = getattr(pool, "connections", [])
+    return sum(1 for connection in connections if connection.is_idle())
+
+
+async def _collect_pool_stats():
+    return {
+        host: {**_pool_counters[host], "idle": _idle_connections(client)}
+        for host, client in _clients.items()
+    }
+
+
+def pool_stats() -> dict:
+    """Return {host: {"opened", "reused", "idle"}} for every pooled client created so far."""
+    if _loop is None:
+        return {}
+    return asyncio.run_coroutine_threadsafe(_collect_pool_stats(), _loop).result()
+
+
+async def _collect_throttle_stats():
+    return {host: limiter.summary() for host, limiter in _rate_limiters.items()}
+
+
+def throttle_stats() -> dict:
+    """Return {host: {"requests", "throttled", "retries", "gave_up", "rate", "slow_start"}} for every host fetched so far."""
+    if _loop is None:
+        return {}
+    return asyncio.run_coroutine_threadsafe(_collect_throttle_stats(), _loop).result()
+
+
+def cache_stats() -> dict:
+    """
+    Return how many pages were served fresh from the cache, revalidated with a
+    304, served stale because the shop could not be reached, or fetched, and
+    how many cache reads or writes failed.
+    """
+    return dict(_cache_counters)
+
+
+async def _close_clients():
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+@atexit.register
+def close_clients():
+    """Close every pooled client. Safe to call more than once."""
+    if _loop is None or not _loop.is_running():
+        return
+    try:
+        asyncio.run_coroutine_threadsafe(_close_clients(), _loop).result(timeout=5)
+    except Exception:
+        pass
+
+
+def fetch_pages(urls, headers=None, timeout=DEFAULT_TIMEOUT) -> list:
+    """
+    Fetch all urls concurrently over the shared per-host connection pools and
+    return their HTML in the same order. Failed requests come back as None.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    coro = _fetch_pages(urls, headers or DEFAULT_HEADERS, timeout)
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop()).result()
+
+
+async def _forget_pages(urls):
+    cache = await _cache_call(get_response_cache)
+    if cache:
+        await _cache_call(cache.discard, urls)
+
+
+def forget_pages(urls):
+    """
+    Drop urls from the response cache. Pages that gave no price (challenge
+    pages, empty bodies, a changed layout) must not be served fresh to the
+    incremental or resumed run that retries them.
+    """
+    urls = list(urls)
+    if urls:
+        asyncio.run_coroutine_threadsafe(_forget_pages(urls), _get_loop()).result()
+
+
+def fetch_prices(urls, parse, url_prefixes=(), headers=None, timeout=DEFAULT_TIMEOUT, on_page=None, on_price=None) -> list:
+    """
+    Fetch every valid url concurrently and run parse(html) on each page.
+
+    Returns a list aligned with urls; invalid urls, failed requests and parser
+    errors all come back as np.nan, matching the old per-row get_*_price functions.
+    Pages that parse to no price are dropped from the response cache.
+    on_page(url, html), if given, is called for every page fetched, and
+    on_price(url, price) for every distinct valid url once it is priced.
+    """
+    urls = list(urls)
+    # Rows that share a url are fetched and parsed once.
+    unique = list(dict.fromkeys(url for url in urls if is_valid_url(url, url_prefixes)))
+    pages = fetch_pages(unique, headers=headers, timeout=timeout)
+    prices = {}
+    for url, html in zip(unique, pages):
+        if html is None:
+            continue
+        if on_page is not None:
+            on_page(url, html)
+        try:
+            prices[url] = parse(html)
+        except Exception:
+            prices[url] = np.nan
+    forget_pages(url for url, price in prices.items() if pd.isna(price))
+    if on_price is not None:
+        for url in unique:
+            on_price(url, prices.get(url, np.nan))
+    return [prices.get(url, np.nan) if isinstance(url, str) else np.nan for url in urls]
@@ -0,0 +1,112 @@
+import copy
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+
+import config
+from scheduler import run_scheduled
+
+# Row columns that hold a url to price.
+LINK_COLUMNS = ('PRODUCT LINK', 'BUNDLE LINK')
+
+
+def _source_of(scraper):
+    # Helmet scrapers borrow their extraction from the welder scraper they were built from.
+    return getattr(scraper, "source", scraper)
+
+
+class UniqueUrlJob:
+    """
+    The distinct urls one shop has to price, shaped like a company scraper so
+    the scheduler can chunk and order it the same way.
+    """
+    price_column = 'Price'
+
+    def __init__(self, source, urls, journal=None):
+        self.source = source
+        self.name = source.name
+        self.urls = sorted(urls)
+        self.journal = journal
+        self.df = None
+        self.stats = {}
+
+    def matching_rows(self, df) -> pd.DataFrame:
+        return pd.DataFrame({'PRODUCT LINK': self.urls})
+
+    def fill_prices(self, rows: pd.DataFrame) -> pd.DataFrame:
+        on_price = None
+        if self.journal is not None:
+            # Checkpoint each price as it arrives rather than when the chunk ends.
+            on_price = lambda url, price: self.journal.record(self.name, url, price)
+        rows['Price'] = self.source.get_prices(rows['PRODUCT LINK'].tolist(), on_price=on_price)
+        return rows
+
+    def compute_stats(self, df: pd.DataFrame) -> dict:
+        return {"unique_urls": len(df), "extracted_prices": df['Price'].notna().sum()}
+
+
+class FetchPlan:
+    """
+    Collects every link from every catalogue before anything is fetched, so
+    each shop fetches a url once no matter how many rows (or catalogues, or
+    PRODUCT / BUNDLE columns) reference it.
+    """
+    def __init__(self):
+        self.sources = {}
+        self.urls = defaultdict(set)
+        self.references = 0
+        # {shop: urls fetched by the last run()}, for the timing log lines.
+        self.fetched = {}
+
+    def add(self, scraper, rows: pd.DataFrame):
+        source = _source_of(scraper)
+        self.sources[source.name] = source
+        for column in LINK_COLUMNS:
+            if column not in rows.columns:
+                continue
+            for url in rows[column]:
+                if isinstance(url, str) and url.strip():
+                    self.urls[source.name].add(url)
+                    self.references += 1
+
+    def unique_count(self) -> int:
+        return sum(len(urls) for urls in self.urls.values())
+
+    def run(self, workers: int = config.MAX_WORKERS, journal=None):
+        """
+        Fetch every planned url once. Returns ({(shop, url): price},
+        {shop: seconds}, {shop: exception}).
+
+        With a journal, every price is checkpointed as it arrives and urls the
+        journal already has a price for are not fetched again.
+        """
+        prices = journal.prices() if journal is not None else {}
+        if prices:
+            print(f"Resuming: {len(prices)} prices already in the journal")
+        jobs = []
+        for name, urls in self.urls.items():
+            remaining = [url for url in urls if (name, url) not in prices]
+            if remaining:
+                if journal is not None:
+                    # Archive the run's pages under the journal's id, shard suffix included.
+                    self.sources[name].run_id = journal.run_id
+                jobs.append(UniqueUrlJob(self.sources[name], remaining, journal))
+        finished, errors = run_scheduled(None, jobs, workers=workers)
+        durations = {}
+        for name, (df, elapsed) in finished.items():
+            prices.update({(name, url): price for url, price in zip(df['PRODUCT LINK'], df['Price'])})
+            durations[name] = elapsed
+            self.fetched[name] = len(df)
+        return prices, durations, errors
+
+
+def replay_fill(scraper, rows: pd.DataFrame, prices: dict) -> pd.DataFrame:
+    """
+    Run scraper.fill_prices over rows, answering every url from prices
+    ({(shop, url): price}) instead of fetching it.
+    """
+    name = _source_of(scraper).name
+    replay = copy.copy(scraper)
+    replay.get_prices = lambda links: [prices.get((name, url), np.nan) for url in links]
+    return replay.fill_prices(rows)
@@ -0,0 +1,79 @@
+import datetime
+import glob
+import os
+import re
+
+import pandas as pd
+
+import config
+
+SCRAPED_AT = 'Scraped At'
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+_FILE_TIMESTAMP = re.compile(r"(\d{8}_\d{6})\.csv$")
+
+
+def now_stamp() -> str:
+    return datetime.datetime.now().strftime(TIMESTAMP_FORMAT)
+
+
+def latest_combined(combined_csv_folder: str, helmet: bool = False):
+    """Return the path of the newest welder (or helmet) combined CSV in the folder, or None."""
+    prefix = "helmet_combined" if helmet else "combined"
+    paths = [
+        path for path in glob.glob(os.path.join(combined_csv_folder, f"{prefix}_*.csv"))
+        if _FILE_TIMESTAMP.search(path)
+    ]
+    if not paths:
+        return None
+    return max(paths, key=lambda path: _FILE_TIMESTAMP.search(path).group(1))
+
+
+def load_previous(path: str) -> pd.DataFrame:
+    """
+    Read a combined CSV for reuse. Files written before the Scraped At column
+    existed take the time in their file name for every row.
+    """
+    # Read as text so carried-over prices are written back exactly as scraped.
+    previous = pd.read_csv(path, dtype=str)
+    if SCRAPED_AT not in previous.columns:
+        stamp = datetime.datetime.strptime(_FILE_TIMESTAMP.search(path).group(1), "%Y%m%d_%H%M%S")
+        previous[SCRAPED_AT] = stamp.strftime(TIMESTAMP_FORMAT)
+    return previous
+
+
+def row_keys(df: pd.DataFrame, columns) -> pd.Series:
+    """Hash the catalogue columns of each row, so an edited row in the spreadsheet gets a new key."""
+    # Compare as text: the same cell can come back from Excel and from CSV with different dtypes.
+    values = df[list(columns)].astype("string").fillna("")
+    return pd.util.hash_pandas_object(values, index=False)
+
+
+def split_stale(df_company: pd.DataFrame, previous: pd.DataFrame, key_columns, price_column: str,
+                output_columns, max_age_hours: float = config.INCREMENTAL_MAX_AGE_HOURS):
+    """
+    Split a company's rows into those that can keep their previous result and
+    those that must be fetched again.
+
+    A row is reused when an identical catalogue row exists in previous with a
+    price scraped within max_age_hours. Returns (reused, stale): reused carries
+    the previous output columns and Scraped At, stale is the rows to refresh.
+    """
+    if previous is None or df_company.empty:
+        return df_company.iloc[0:0], df_company
+    missing = [column for column in key_columns if column not in previous.columns]
+    if missing:
+        return df_company.iloc[0:0], df_company
+
+    cutoff = datetime.datetime.now() - datetime.timedelta(hours=max_age_hours)
+    scraped_at = pd.to_datetime(previous[SCRAPED_AT], format=TIMESTAMP_FORMAT, errors="coerce")
+    usable = previous[previous[price_column].notna() & (scraped_at >= cutoff)].copy()
+    usable.index = row_keys(usable, key_columns)
+    usable = usable[~usable.index.duplicated(keep="last")]
+
+    keys = row_keys(df_company, key_columns)
+    hit = keys.isin(usable.index).to_numpy()
+    reused = df_company[hit].copy()
+    reuse_columns = [column for column in output_columns if column in usable.columns] + [SCRAPED_AT]
+    for column in reuse_columns:
+        reused[column] = usable.loc[keys[hit], column].to_numpy()
+    return reused, df_company[~hit].copy()
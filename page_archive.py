@@ -0,0 +1,115 @@
+import datetime
+import glob
+import logging
+import os
+import sqlite3
+import threading
+import zlib
+
+import config
+
+class PageArchive:
+    """
+    The pages fetched during one run, stored zlib-compressed in SQLite.
+
+    Each url can have an "http" copy (the raw response) and a "browser" copy
+    (driver.page_source after the price node appeared). Pages are shared by
+    every catalogue in the run, so a url scraped for welders and helmets is
+    stored once.
+    """
+    def __init__(self, run_id: str, folder: str = config.PAGE_ARCHIVE_DIR):
+        self.run_id = run_id
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{run_id}.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                shop TEXT,
+                html BLOB NOT NULL,
+                PRIMARY KEY (url, kind)
+            )
+        """)
+        self._conn.commit()
+
+    def put(self, shop: str, url: str, kind: str, html: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, kind, shop, html) VALUES (?, ?, ?, ?)",
+                (url, kind, shop, zlib.compress(html.encode("utf-8"))),
+            )
+            self._conn.commit()
+
+    def pages(self, urls) -> dict:
+        """Return {url: {kind: html}} for every stored page of the given urls."""
+        found = {}
+        urls = list(set(urls))
+        with self._lock:
+            # Stay under SQLite's bound-parameter limit.
+            for start in range(0, len(urls), 500):
+                batch = urls[start:start + 500]
+                rows = self._conn.execute(
+                    f"SELECT url, kind, html FROM pages WHERE url IN ({','.join('?' * len(batch))})",
+                    batch,
+                ).fetchall()
+                for url, kind, html in rows:
+                    found.setdefault(url, {})[kind] = zlib.decompress(html).decode("utf-8")
+        return found
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+_archives = {}
+_archives_lock = threading.Lock()
+_session_run_id = None
+
+
+def _default_run_id() -> str:
+    # Pages fetched outside a journaled run; the pid keeps processes started
+    # in the same second (shard children) out of each other's archive.
+    global _session_run_id
+    if _session_run_id is None:
+        _session_run_id = f"{datetime.datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.getpid()}"
+    return _session_run_id
+
+
+def archive_page(shop: str, url: str, kind: str, html: str, run_id: str = None):
+    """
+    Store a page in the archive of run_id, the run journal's id, so reparse
+    finds it under the same name. Does nothing when ARCHIVE_PAGES is off or
+    html is empty.
+    """
+    if not config.ARCHIVE_PAGES or not html or not isinstance(url, str):
+        return
+    try:
+        with _archives_lock:
+            if run_id is None:
+                run_id = _default_run_id()
+            archive = _archives.get(run_id)
+            if archive is None:
+                archive = _archives[run_id] = PageArchive(run_id)
+        archive.put(shop, url, kind, html)
+    except sqlite3.Error as exc:
+        # Archiving is best-effort; never lose a price over it.
+        logging.warning(f"Could not archive {kind} page of {url} for run {run_id}: {exc}")
+
+
+def list_runs(folder: str = config.PAGE_ARCHIVE_DIR) -> list:
+    """Return the run ids with an archive in folder, oldest first."""
+    paths = sorted(glob.glob(os.path.join(folder, "*.sqlite")))
+    return [os.path.splitext(os.path.basename(path))[0] for path in paths]
+
+
+def open_run(run_id: str, folder: str = config.PAGE_ARCHIVE_DIR) -> PageArchive:
+    if not os.path.exists(os.path.join(folder, f"{run_id}.sqlite")):
+        raise FileNotFoundError(f"No page archive for run {run_id} in {folder}")
+    return PageArchive(run_id, folder)
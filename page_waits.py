@@ -0,0 +1,65 @@
+import threading
+import time
+from collections import defaultdict
+
+from driver_pool import apply_resource_blocking
+
+# Seconds to wait for the price node to appear, per site. These are upper
+# bounds only: the wait returns as soon as the node exists.
+SITE_WAIT_PROFILES = {
+    "hare and forbes": 12,
+    "sydney tools": 8,
+    "wa industrial supplies": 8,
+    "gasrep": 8,
+    "trade tools": 10,
+}
+DEFAULT_WAIT = 10
+POLL_FREQUENCY = 0.1
+
+_timings = defaultdict(list)
+_timings_lock = threading.Lock()
+
+
+def record_timing(site: str, seconds: float):
+    with _timings_lock:
+        _timings[site].append(seconds)
+
+
+def load_and_wait(driver, url: str, locators, site: str):
+    """
+    Open url with resource blocking on and wait until any of the (By, selector)
+    locators is present.
+
+    Returns the first matching element, or None if the site's timeout expires.
+    The time from navigation until the price node appeared (or the wait gave
+    up) is recorded against the site.
+    """
+    from selenium.common.exceptions import TimeoutException
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    timeout = SITE_WAIT_PROFILES.get(site, DEFAULT_WAIT)
+    start = time.perf_counter()
+    try:
+        apply_resource_blocking(driver)
+        driver.get(url)
+        conditions = [EC.presence_of_element_located(locator) for locator in locators]
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(EC.any_of(*conditions))
+    except TimeoutException:
+        return None
+    finally:
+        record_timing(site, time.perf_counter() - start)
+
+
+def timing_summary() -> dict:
+    """Return {site: {"pages", "mean", "max"}} for every page waited on so far."""
+    with _timings_lock:
+        return {
+            site: {
+                "pages": len(seconds),
+                "mean": sum(seconds) / len(seconds),
+                "max": max(seconds),
+            }
+            for site, seconds in _timings.items()
+            if seconds
+        }
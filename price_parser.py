@@ -0,0 +1,368 @@
+import functools
+import glob
+import html
+import os
+import random
+import re
+import time
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import is_numeric_dtype
+
+DEFAULT_CURRENCY = "AUD"
+CURRENCY_CODES = {"A$": "AUD", "AU$": "AUD", "AUD": "AUD", "NZ$": "NZD", "NZD": "NZD", "US$": "USD", "USD": "USD"}
+GST_INCLUDED = "inc"
+GST_EXCLUDED = "ex"
+
+_TAG = re.compile(r"<[^>]*>")
+# A bare decimal number. Text like this is read with float() directly, here
+# and (vectorised) in amounts(); anything else goes through the full parse.
+PLAIN_NUMBER = r"\s*-?\d+(?:\.\d+)?\s*"
+_PLAIN = re.compile(PLAIN_NUMBER)
+_GROUP_SPACE = re.compile(r"[ \u00a0\u202f]")
+# An optional minus sign, a currency marker, an amount and an optional trailing
+# currency code. Amounts may group thousands with commas (1,299.00), with
+# spaces (1 299,00) or, when a decimal comma follows, with dots (1.299,00).
+# A number is only read whole: "$1,2345" or "12.345.67" is no amount at all
+# rather than the 1,234 or 12.345 at its start.
+_AMOUNT = re.compile(
+    r"(?:(?<![\w.])(?P<sign>-))?"
+    r"(?P<currency>(?:AU?|NZ|US)\s?\$|AUD|NZD|USD|\$)?\s*"
+    r"(?<![\d.,])(?P<number>\d{1,3}(?:,\d{3})+(?:\.\d+)?"
+    r"|\d{1,3}(?:\.\d{3})+,\d+"
+    r"|\d{1,3}(?:[ \u00a0\u202f]\d{3})+(?:[.,]\d{1,2})?"
+    r"|\d+(?:\.\d+|,\d{1,2})?)(?![\d]|[.,]\d)"
+    r"(?:\s?(?P<code>AUD|NZD|USD)\b)?",
+    re.IGNORECASE,
+)
+# Labels read from the text just before an amount.
+_RRP_LABEL = re.compile(r"\b(?:rrp|was|reg(?:ular)?|list|orig(?:inal)?|compare at|msrp)\b[^\d$]*$", re.IGNORECASE)
+_SALE_LABEL = re.compile(r"\b(?:now|sale|special|only|deal)\b[^\d$]*$", re.IGNORECASE)
+_SAVE_LABEL = re.compile(r"\b(?:save|saving|discount)\b[^\d$]*$", re.IGNORECASE)
+_OFF = re.compile(r"\s*(?:%|off\b)", re.IGNORECASE)
+_RANGE = re.compile(r"\s*(?:-|–|—|to)\s*", re.IGNORECASE)
+_GST_INCLUDED = re.compile(r"\b(?:inc|incl|including)\b\.?\s*(?:of\s+)?gst\b", re.IGNORECASE)
+_GST_EXCLUDED = re.compile(r"\b(?:ex|exc|excl|excluding)\b\.?\s*(?:of\s+)?gst\b|\+\s*gst\b", re.IGNORECASE)
+# How far back from an amount a label such as "RRP" or "NOW" is looked for.
+LABEL_WINDOW = 24
+
+
+class ParsedPrice:
+    """
+    A scraped price. amount is what the shop charges (np.nan if the text has
+    no price), high is the top of a "$199 - $299" range, rrp the recommended
+    or previous price shown next to a sale price, gst "inc", "ex" or None when
+    the text doesn't say, and raw the text as scraped.
+
+    Results are cached and shared between calls, so treat them as read-only.
+    """
+    __slots__ = ("amount", "currency", "gst", "rrp", "high", "raw")
+
+    def __init__(self, raw: str, amount: float = np.nan, currency: str = None, gst: str = None,
+                 rrp: float = None, high: float = None):
+        self.raw = raw
+        self.amount = amount
+        self.currency = currency
+        self.gst = gst
+        self.rrp = rrp
+        self.high = high
+
+    @property
+    def ok(self) -> bool:
+        return not np.isnan(self.amount)
+
+    @property
+    def on_sale(self) -> bool:
+        return self.rrp is not None and self.ok and self.amount < self.rrp
+
+    @property
+    def is_range(self) -> bool:
+        return self.high is not None
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__ if getattr(self, name) is not None)
+        return f"ParsedPrice({fields})"
+
+
+def _number(text: str) -> float:
+    """The value of an _AMOUNT number, whichever of its separator conventions it uses."""
+    text = _GROUP_SPACE.sub("", text)
+    comma, dot = text.rfind(","), text.rfind(".")
+    # A comma after the last dot, not followed by exactly three digits, is a decimal comma: 12,50 or 1.299,00.
+    if comma > dot and len(text) - comma - 1 != 3:
+        return float(text.replace(".", "").replace(",", "."))
+    return float(text.replace(",", ""))
+
+
+def _currency(match) -> str:
+    marker = match.group("code") or match.group("currency")
+    if not marker:
+        return None
+    return CURRENCY_CODES.get(re.sub(r"\s", "", marker).upper())
+
+
+@functools.lru_cache(maxsize=65536)
+def _parse(raw: str) -> ParsedPrice:
+    text = raw
+    if "<" in text:
+        text = _TAG.sub(" ", text)
+    if "&" in text:
+        text = html.unescape(text)
+    if _PLAIN.fullmatch(text):
+        # What most shops (and every price this module has already normalised) look like.
+        return ParsedPrice(raw, float(text), DEFAULT_CURRENCY)
+
+    gst = GST_INCLUDED if _GST_INCLUDED.search(text) else GST_EXCLUDED if _GST_EXCLUDED.search(text) else None
+    candidates = []
+    values = {}
+    previous_end = 0
+    for match in _AMOUNT.finditer(text):
+        value = _number(match.group("number"))
+        # "$199 -$299" is a range, not a negative price: a dash right after another amount separates the two.
+        if match.group("sign") and not (previous_end and not text[previous_end:match.start()].strip()):
+            value = -value
+        values[match] = value
+        before = text[max(previous_end, match.start() - LABEL_WINDOW):match.start()]
+        if _RRP_LABEL.search(before):
+            label = "rrp"
+        elif _SAVE_LABEL.search(before) or _OFF.match(text, match.end()):
+            label = "save"
+        elif _SALE_LABEL.search(before):
+            label = "sale"
+        else:
+            label = "price"
+        candidates.append((label, match))
+        previous_end = match.end()
+    # Once any amount carries a currency, bare numbers (quantities, model numbers) are not prices.
+    if any(match.group("currency") or match.group("code") for _, match in candidates):
+        candidates = [(label, match) for label, match in candidates if match.group("currency") or match.group("code")]
+
+    rrps = [values[match] for label, match in candidates if label == "rrp"]
+    sales = [match for label, match in candidates if label == "sale"]
+    prices = [match for label, match in candidates if label == "price"]
+    if sales:
+        chosen = sales[0]
+        # An unlabelled amount beside a "NOW" price is the struck-through one.
+        rrps += [values[match] for match in prices if values[match] > values[chosen]]
+    elif prices:
+        chosen = prices[0]
+    elif rrps:
+        # Only a recommended price is shown, so that is what the shop charges.
+        return ParsedPrice(raw, rrps[0], DEFAULT_CURRENCY, gst)
+    else:
+        return ParsedPrice(raw, np.nan, None, gst)
+
+    high = None
+    following = prices[prices.index(chosen) + 1] if chosen in prices and prices.index(chosen) + 1 < len(prices) else None
+    # A dash read as the following amount's sign is part of the separator.
+    if following is not None and _RANGE.fullmatch(text, chosen.end(), following.end("sign") if following.group("sign") else following.start()):
+        high = abs(values[following])
+    return ParsedPrice(raw, values[chosen], _currency(chosen) or DEFAULT_CURRENCY, gst,
+                       max(rrps) if rrps else None, high)
+
+
+def parse_price(value) -> ParsedPrice:
+    """
+    Parse scraped price text such as "A$1,299.00 inc. GST", "NOW $199 RRP $249"
+    or '<span class="price">$349.00</span>'. Numbers pass straight through and
+    missing values give a ParsedPrice without an amount.
+    """
+    if value is None or (isinstance(value, float) and np.isnan(value)) or value is pd.NA:
+        return ParsedPrice("")
+    if isinstance(value, (int, float, np.number)):
+        return ParsedPrice(str(value), float(value), DEFAULT_CURRENCY)
+    return _parse(str(value))
+
+
+def amount(value) -> float:
+    """The price a shop charges in value, or np.nan; what scrapers store."""
+    return parse_price(value).amount
+
+
+def amounts(values) -> pd.Series:
+    """
+    parse_price(...).amount for a whole column of prices, as float64.
+
+    Values that are already numbers, or text matching PLAIN_NUMBER, convert
+    in one vectorised pass; the rest are parsed once per distinct value.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    if is_numeric_dtype(series):
+        return series.astype("float64")
+    series = series.astype("string")
+    plain = series.str.fullmatch(PLAIN_NUMBER).fillna(False).astype(bool)
+    numbers = pd.Series(np.nan, index=series.index, dtype="float64")
+    numbers[plain] = pd.to_numeric(series[plain].str.strip()).astype("float64")
+    rest = ~plain & series.notna()
+    if rest.any():
+        codes, uniques = pd.factorize(series[rest])
+        numbers[rest] = np.array([parse_price(text).amount for text in uniques], dtype="float64")[codes]
+    return numbers
+
+
+def price_details(values) -> pd.DataFrame:
+    """
+    The fields of parse_price for a whole column of scraped price text: amount
+    (float64), raw, currency and gst, on the column's index. Each distinct text
+    is parsed once.
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(values)
+    codes, uniques = pd.factorize(series.astype(object))
+    parsed = [parse_price(value) for value in uniques]
+    details = pd.DataFrame(index=series.index)
+    for field in ("raw", "currency", "gst"):
+        column = np.array([getattr(price, field) for price in parsed] + [None], dtype=object)[codes]
+        details[field] = pd.Series(column, index=series.index, dtype="string")
+    details["amount"] = np.array([price.amount for price in parsed] + [np.nan], dtype="float64")[codes]
+    details.loc[details["amount"].isna(), ["currency", "gst"]] = pd.NA
+    return details[["amount", "raw", "currency", "gst"]]
+
+
+def price_corpus(paths) -> list:
+    """Every distinct price text in the *Price* columns of the given CSV files."""
+    texts = set()
+    for path in paths:
+        df = pd.read_csv(path, dtype=str)
+        for column in df.columns:
+            if "price" in column.lower():
+                texts.update(text for text in df[column].dropna() if text.strip())
+    return sorted(texts)
+
+
+def default_corpus_files(folder: str = ".") -> list:
+    """The per-company and combined CSVs already on disk under folder."""
+    return sorted(glob.glob(os.path.join(folder, "scraper_output*", "**", "*.csv"), recursive=True)
+                  + glob.glob(os.path.join(folder, "combined_csv*", "*.csv")))
+
+
+def _decorations(amount_text: str, rng):
+    """Ways shops dress up the same amount, each with the attributes parsing must still find."""
+    value = float(amount_text)
+    grouped = f"{value:,.2f}"
+    yield f"${amount_text}", {}
+    yield f"A${grouped}", {"currency": "AUD"}
+    yield f"AU $ {grouped}", {"currency": "AUD"}
+    yield f"{grouped} AUD", {"currency": "AUD"}
+    yield f"NZ${amount_text}", {"currency": "NZD"}
+    yield f"${grouped.replace(',', ' ')}", {}
+    yield f"{grouped.replace(',', ' ').replace('.', ',')} AUD", {"currency": "AUD"}
+    yield f"€{grouped.replace(',', '_').replace('.', ',').replace('_', '.')}", {}
+    yield f'<span class="price"><sup>$</sup>{grouped}</span>', {}
+    yield f"\n   ${grouped}\n  ", {}
+    yield f"${grouped} inc. GST", {"gst": GST_INCLUDED}
+    yield f"${grouped} excl GST", {"gst": GST_EXCLUDED}
+    yield f"${grouped} + GST", {"gst": GST_EXCLUDED}
+    yield f"&#36;{grouped}", {}
+    yield f"Qty 1 ${grouped} per item", {}
+    yield f"-${grouped}", {"amount": -value}
+    rrp = round(value * rng.uniform(1.05, 2.0) + 1, 2)
+    yield f"NOW ${grouped} RRP ${rrp:,.2f}", {"rrp": rrp}
+    yield f"Was ${rrp:,.2f} Now ${grouped}", {"rrp": rrp}
+    yield f"${grouped} Save ${rrp - value:,.2f}", {}
+    yield f"${grouped} - ${rrp:,.2f}", {"high": rrp}
+    yield f"${grouped} -${rrp:,.2f}", {"high": rrp}
+
+
+def _fuzz_cases(corpus, rng, noise):
+    """
+    (text, expected attributes) pairs: each corpus text (expected None), every
+    decoration of the amount parsed from it, then `noise` strings of junk (None).
+    """
+    for raw in corpus:
+        yield raw, None
+        try:
+            parsed = parse_price(raw)
+        except Exception:
+            continue
+        if parsed.ok:
+            for text, expected in _decorations(f"{parsed.amount:.2f}", rng):
+                yield text, {"amount": parsed.amount, **expected}
+    alphabet = "0123456789.,$ AUDNZinc.exGSTRRPnowwas-<>/span&#;\n"
+    for _ in range(noise):
+        yield "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40))), None
+
+
+def fuzz_texts(corpus, seed: int = 0, noise: int = 2000) -> list:
+    """Every text fuzz() parses for this corpus and seed."""
+    return [text for text, _ in _fuzz_cases(corpus, random.Random(seed), noise)]
+
+
+def fuzz(corpus, seed: int = 0, noise: int = 2000) -> dict:
+    """
+    Check parse_price against the corpus: every text that parses must give
+    the same amount however it is decorated, random junk must never raise or
+    produce an infinite amount, and amounts() must agree with amount() on
+    every text. Returns the cases run and the first failures.
+    """
+    failures = []
+    texts = []
+
+    def check(text, expected, got):
+        if len(failures) < 20:
+            failures.append({"text": text, "expected": expected, "got": repr(got)})
+
+    for text, expected in _fuzz_cases(corpus, random.Random(seed), noise):
+        texts.append(text)
+        try:
+            result = parse_price(text)
+        except Exception as e:
+            check(text, "no exception", e)
+            continue
+        if expected is None:
+            if result.ok and not np.isfinite(result.amount):
+                check(text, "a finite amount", result)
+            continue
+        for name, value in expected.items():
+            got = getattr(result, name)
+            if isinstance(value, float):
+                if got is None or not np.isclose(got, value):
+                    check(text, {name: value}, result)
+            elif got != value:
+                check(text, {name: value}, result)
+
+    scalar = np.array([amount(text) for text in texts], dtype="float64")
+    column = amounts(pd.Series(texts, dtype="object")).to_numpy()
+    for index in np.flatnonzero(~((scalar == column) | (np.isnan(scalar) & np.isnan(column)))):
+        check(texts[index], {"amounts": scalar[index]}, column[index])
+    return {"corpus": len(corpus), "cases": len(texts), "errors": failures}
+
+
+def benchmark(corpus, repeat: int = 5, rows: int = 100000) -> dict:
+    """
+    Time parse_price per value, uncached and cached, and amounts() over a
+    column of `rows` prices drawn from the corpus. Best of `repeat` runs.
+    """
+    corpus = list(corpus)
+    if not corpus:
+        return {"corpus": 0}
+
+    def best(run):
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    def uncached():
+        for text in corpus:
+            _parse.__wrapped__(text)
+
+    def cached():
+        for text in corpus:
+            parse_price(text)
+
+    column = pd.Series(corpus * (rows // len(corpus) + 1))[:rows]
+    uncached_seconds = best(uncached)
+    cached()
+    cached_seconds = best(cached)
+    column_seconds = best(lambda: amounts(column))
+    return {
+        "corpus": len(corpus),
+        "parse_us": round(uncached_seconds / len(corpus) * 1e6, 3),
+        "cached_parse_us": round(cached_seconds / len(corpus) * 1e6, 3),
+        "column_rows": len(column),
+        "column_ms": round(column_seconds * 1e3, 2),
+        "column_rows_per_second": round(len(column) / column_seconds) if column_seconds else None,
+    }
@@ -0,0 +1,213 @@
+import datetime
+import functools
+import glob
+import importlib.util
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+import config
+from price_parser import amounts, price_details
+
+# pyarrow is imported by PriceStore, on first use, so importing this module stays cheap.
+PARQUET_AVAILABLE = importlib.util.find_spec("pyarrow") is not None
+
+CATALOGUES = ("welders", "helmets")
+RUN_ID_FORMAT = "%Y%m%d_%H%M%S"
+
+# Welder and helmet CSVs name the same things differently; the store uses one
+# set of columns for both. Each entry lists the CSV spellings, preferred first.
+COLUMN_ALIASES = {
+    "BRAND": ("BRAND",),
+    "PRODUCT SKU": ("PRODUCT SKU", "HELMET SKU"),
+    "PRODUCT NAME": ("PRODUCT NAME", "HELMET NAME"),
+    "Shop Name": ("Shop Name",),
+    "PRODUCT LINK": ("PRODUCT LINK",),
+    # Scrapers write the text a price was parsed from beside it; older CSVs
+    # only have the text, in the price column itself.
+    "Price Text": ("Price_Text", "Helmet_Price_Text", "Price", "Helmet_Price"),
+    "Bundle Price Text": ("Helmet_Price_Bundle_Text", "Price_Bundle", "Helmet_Price_Bundle"),
+    "Currency": ("Price_Currency", "Helmet_Price_Currency"),
+    "GST": ("Price_GST", "Helmet_Price_GST"),
+    "Scraped At": ("Scraped At",),
+}
+# The CSV columns holding the price itself.
+PRICE_COLUMNS = ("Price", "Helmet_Price")
+# Why a row has no price: no link to scrape, or a link whose page gave no price.
+STATUS_OK = "ok"
+STATUS_MISSING = "missing"
+STATUS_NO_LINK = "no_link"
+
+
+@functools.lru_cache(maxsize=None)
+def _schemas():
+    """Return the store's (schema, partitioning, schema with partition columns)."""
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    schema = pa.schema([
+        ("BRAND", pa.string()),
+        ("PRODUCT SKU", pa.string()),
+        ("PRODUCT NAME", pa.string()),
+        ("Shop Name", pa.string()),
+        ("PRODUCT LINK", pa.string()),
+        ("Price", pa.float64()),
+        ("Price Text", pa.string()),
+        ("Bundle Price Text", pa.string()),
+        ("Currency", pa.string()),
+        ("GST", pa.string()),
+        ("Scraped At", pa.timestamp("s")),
+        ("status", pa.string()),
+        ("run_id", pa.string()),
+    ])
+    # Directory names catalogue=welders/run_date=2025-03-27 carry the partition keys.
+    partitioning = ds.partitioning(
+        pa.schema([("catalogue", pa.string()), ("run_date", pa.string())]), flavor="hive",
+    )
+    return schema, partitioning, pa.schema(list(schema) + list(partitioning.schema))
+
+
+def _require_pyarrow():
+    if not PARQUET_AVAILABLE:
+        raise ImportError("The Parquet price store needs pyarrow: pip install pyarrow")
+
+
+def run_date(run_id: str) -> str:
+    return datetime.datetime.strptime(run_id[:15], RUN_ID_FORMAT).strftime("%Y-%m-%d")
+
+
+def to_store_frame(df: pd.DataFrame, run_id: str) -> pd.DataFrame:
+    """Map a combined welder or helmet CSV frame onto the store's typed columns."""
+    out = pd.DataFrame(index=df.index)
+    for column, aliases in COLUMN_ALIASES.items():
+        source = next((alias for alias in aliases if alias in df.columns), None)
+        out[column] = df[source].astype("string") if source else pd.Series(pd.NA, index=df.index, dtype="string")
+    price = next((column for column in PRICE_COLUMNS if column in df.columns), None)
+    out["Price"] = amounts(df[price]) if price else np.nan
+    if not any(alias in df.columns for alias in COLUMN_ALIASES["Currency"]):
+        # Older CSVs only have the price text; read the currency and GST basis from it.
+        details = price_details(out["Price Text"])
+        out["Currency"], out["GST"] = details["currency"], details["gst"]
+    links = out["PRODUCT LINK"].fillna("").str.strip()
+    out["status"] = np.where(out["Price"].notna(), STATUS_OK, np.where(links == "", STATUS_NO_LINK, STATUS_MISSING))
+    scraped_at = pd.to_datetime(out["Scraped At"], errors="coerce")
+    # Rows from before the Scraped At column existed are as old as their run.
+    out["Scraped At"] = scraped_at.fillna(pd.Timestamp(datetime.datetime.strptime(run_id[:15], RUN_ID_FORMAT)))
+    out["run_id"] = run_id
+    return out.reset_index(drop=True)
+
+
+class PriceStore:
+    """
+    Every combined run, stored as Parquet under
+    root/catalogue=<welders|helmets>/run_date=<YYYY-MM-DD>/<run_id>.parquet.
+
+    Prices are floats (with the scraped text, currency and GST basis kept
+    alongside), Scraped At is a timestamp and each row has a status. Reads go
+    through a pyarrow dataset, so only the requested columns are read and
+    filters on catalogue, run date or run id skip whole files before any data
+    is loaded.
+    """
+    def __init__(self, root: str = config.PRICE_STORE_DIR):
+        _require_pyarrow()
+        self.root = root
+        self.schema, self.partitioning, self.schema_with_partitions = _schemas()
+
+    def run_path(self, catalogue: str, run_id: str) -> str:
+        return os.path.join(self.root, f"catalogue={catalogue}", f"run_date={run_date(run_id)}", f"{run_id}.parquet")
+
+    def write_run(self, df: pd.DataFrame, catalogue: str, run_id: str) -> str:
+        """Store one run's combined frame and return the file written."""
+        if catalogue not in CATALOGUES:
+            raise ValueError(f"catalogue must be one of {CATALOGUES}, got {catalogue!r}")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        path = self.run_path(catalogue, run_id)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        table = pa.Table.from_pandas(to_store_frame(df, run_id), schema=self.schema, preserve_index=False)
+        # Write then rename, so a reader never sees half a file. Datasets skip dot-files.
+        partial = os.path.join(os.path.dirname(path), f".{run_id}.parquet.tmp")
+        pq.write_table(table, partial, compression="zstd")
+        os.replace(partial, path)
+        return path
+
+    def dataset(self):
+        import pyarrow.dataset as ds
+        if not os.path.isdir(self.root):
+            return None
+        return ds.dataset(self.root, format="parquet", partitioning=self.partitioning, schema=self.schema_with_partitions)
+
+    def runs(self, catalogue: str) -> list:
+        """Return the run ids stored for catalogue, oldest first, without reading any data."""
+        pattern = os.path.join(self.root, f"catalogue={catalogue}", "run_date=*", "*.parquet")
+        return sorted(os.path.splitext(os.path.basename(path))[0] for path in glob.glob(pattern))
+
+    def latest_run(self, catalogue: str):
+        runs = self.runs(catalogue)
+        return runs[-1] if runs else None
+
+    def read(self, catalogue: str = None, columns=None, run_id: str = None, since: datetime.date = None,
+             shops=None, filter=None) -> pd.DataFrame:
+        """
+        Read stored prices as a DataFrame.
+
+        columns prunes the columns read; catalogue, run_id, since (a run date)
+        and shops become a filter pushed down to the Parquet scan, together
+        with any extra pyarrow filter expression.
+        """
+        import pyarrow.dataset as ds
+        dataset = self.dataset()
+        if dataset is None:
+            return pd.DataFrame(columns=columns or self.schema_with_partitions.names)
+        expression = filter
+        conditions = []
+        if catalogue is not None:
+            conditions.append(ds.field("catalogue") == catalogue)
+        if run_id is not None:
+            # The run date lets the scan skip every other day's directory before opening a file.
+            conditions.append(ds.field("run_date") == run_date(run_id))
+            conditions.append(ds.field("run_id") == run_id)
+        if since is not None:
+            conditions.append(ds.field("run_date") >= since.isoformat())
+        if shops:
+            conditions.append(ds.field("Shop Name").isin(list(shops)))
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+        return dataset.to_table(columns=columns, filter=expression).to_pandas()
+
+    def read_latest(self, catalogue: str, columns=None) -> pd.DataFrame:
+        """Read the newest run of a catalogue, or an empty frame if none is stored."""
+        run_id = self.latest_run(catalogue)
+        if run_id is None:
+            return pd.DataFrame(columns=columns or self.schema_with_partitions.names)
+        return self.read(catalogue, columns=columns, run_id=run_id)
+
+
+def run_id_from_filename(path: str):
+    """Return the YYYYMMDD_HHMMSS stamp in a combined CSV's name, or None."""
+    match = re.search(r"(\d{8}_\d{6})", os.path.basename(path))
+    return match.group(1) if match else None
+
+
+def catalogue_from_filename(path: str) -> str:
+    return "helmets" if os.path.basename(path).startswith("helmet_") else "welders"
+
+
+def store_combined(df: pd.DataFrame, catalogue: str, run_id: str):
+    """
+    Add a combined run to the price store. Best-effort: returns the file written, or
+    None when the store is switched off or pyarrow is not installed.
+    """
+    if not config.PRICE_STORE or not PARQUET_AVAILABLE:
+        return None
+    return PriceStore().write_run(df, catalogue, run_id)
+
+
+def import_csv(path: str, store: PriceStore = None):
+    """Add an existing combined CSV to the store, dated by the stamp in its file name."""
+    run_id = run_id_from_filename(path)
+    if run_id is None:
+        raise ValueError(f"No YYYYMMDD_HHMMSS stamp in {path}")
+    store = store or PriceStore()
+    return store.write_run(pd.read_csv(path, dtype=str), catalogue_from_filename(path), run_id)
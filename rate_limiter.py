@@ -0,0 +1,108 @@
+import asyncio
+import datetime
+import random
+import time
+from email.utils import parsedate_to_datetime
+
+import config
+
+# Responses that mean "slow down" rather than "no such page".
+THROTTLE_STATUSES = (429, 503)
+# Longest Retry-After we are prepared to honour; beyond this the url is given up on.
+MAX_RETRY_AFTER = 120.0
+# Seconds after a rate decrease during which further throttles don't decrease it again.
+DECREASE_COOLDOWN = 1.0
+
+
+def parse_retry_after(value):
+    """Return the seconds asked for by a Retry-After header (delta or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, retry_after=None) -> float:
+    """Exponential backoff with full jitter, never shorter than what the server asked for."""
+    delay = random.uniform(0, config.RETRY_BACKOFF * (2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+class HostRateLimiter:
+    """
+    A token bucket for one host whose rate adapts AIMD-style: every successful
+    request nudges the rate up (by about `step` requests/second per second of
+    traffic), every 429/503 halves it, and a Retry-After pauses the host.
+
+    Like TCP, a new host starts in slow start: each success adds a whole
+    `step`, so the rate doubles every second until the host first pushes back
+    (a 429/503 or a Retry-After) or max_rate is reached.
+
+    Only used from the fetch_engine loop thread, so it needs no locking.
+    """
+    def __init__(self, rate: float = config.RATE_INITIAL, min_rate: float = config.RATE_MIN,
+                 max_rate: float = config.RATE_MAX, step: float = 1.0, decrease: float = 0.5):
+        self.rate = rate
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.step = step
+        self.decrease = decrease
+        # A burst of at most one second's worth of requests.
+        self.tokens = 1.0
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.slow_start = True
+        self.stats = {"requests": 0, "throttled": 0, "retries": 0, "gave_up": 0}
+
+    def _refill(self, now: float):
+        self.tokens = min(max(1.0, self.rate), self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            if now < self.blocked_until:
+                await asyncio.sleep(self.blocked_until - now)
+                continue
+            self._refill(now)
+            if self.tokens >= 1.0:
+                self.tokens -= 1.0
+                self.stats["requests"] += 1
+                return
+            await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+    def on_success(self, retry_after=None):
+        if retry_after is not None:
+            # The host is asking us to pace ourselves even while it answers.
+            self.slow_start = False
+        increase = self.step if self.slow_start else self.step / self.rate
+        self.rate = min(self.max_rate, self.rate + increase)
+
+    def on_throttle(self, retry_after=None):
+        self.stats["throttled"] += 1
+        self.slow_start = False
+        now = time.monotonic()
+        # Requests already in flight when the host pushed back will be throttled too;
+        # count that as one signal rather than halving once per request.
+        if now - self.last_decrease >= DECREASE_COOLDOWN:
+            self.rate = max(self.min_rate, self.rate * self.decrease)
+            self.last_decrease = now
+        self.tokens = 0.0
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+    def summary(self) -> dict:
+        return {**self.stats, "rate": round(self.rate, 2), "slow_start": self.slow_start}
@@ -0,0 +1,230 @@
+import atexit
+import hashlib
+import sqlite3
+import threading
+import time
+import zlib
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import config
+
+# Query parameters that only track where a click came from and never change the page.
+TRACKING_PARAMS = ("utm_", "gclid", "fbclid", "msclkid", "srsltid")
+# Reads remember when each entry was last used and write it back in batches of this many.
+ACCESS_FLUSH = 200
+# Eviction removes least recently used pages until the cache is this fraction of max_bytes,
+# so a full cache is not trimmed again on every following write.
+EVICT_TO = 0.9
+
+
+def normalise_url(url: str) -> str:
+    """Lower-case the scheme and host, drop the fragment and tracking parameters, and sort the query."""
+    parts = urlsplit(url.strip())
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not key.lower().startswith(TRACKING_PARAMS)
+    )
+    path = parts.path or "/"
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, urlencode(query), ""))
+
+
+class CachedResponse:
+    def __init__(self, text: str, etag, last_modified, fetched_at: float):
+        self.text = text
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+
+    def is_fresh(self, ttl: float) -> bool:
+        return time.time() - self.fetched_at < ttl
+
+    def revalidation_headers(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class ResponseCache:
+    """
+    A SQLite cache of page bodies keyed by normalised URL.
+
+    Bodies are stored zlib-compressed and addressed by their SHA-256, so pages
+    that render identically (e.g. variant URLs of one product) are stored once.
+    Entries older than ttl are revalidated with ETag / Last-Modified rather than
+    refetched, and the least recently read entries are evicted once the stored
+    bodies exceed max_bytes.
+
+    Reads do no writes: last-used times are kept in memory and written in
+    batches. The stored size is kept as a running total rather than summed
+    on every write. Every method blocks on SQLite and zlib, so the fetch
+    engine calls them from worker threads, never from its event loop.
+    """
+    def __init__(self, path: str = config.HTTP_CACHE_PATH, ttl: float = config.HTTP_CACHE_TTL,
+                 max_bytes: int = config.HTTP_CACHE_MAX_MB * 1024 * 1024):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS bodies (
+                digest TEXT PRIMARY KEY,
+                data BLOB NOT NULL,
+                size INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                digest TEXT NOT NULL REFERENCES bodies(digest),
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_accessed ON entries(accessed_at);
+        """)
+        self._conn.commit()
+        self._accessed = {}
+        self._bytes = self._stored_bytes()
+
+    def _stored_bytes(self) -> int:
+        # Caller holds the lock (or is __init__).
+        return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def _flush_accessed(self):
+        # Caller holds the lock.
+        if self._accessed:
+            self._conn.executemany(
+                "UPDATE entries SET accessed_at = ? WHERE url = ?",
+                [(accessed_at, url) for url, accessed_at in self._accessed.items()],
+            )
+            self._accessed.clear()
+
+    def get(self, url: str):
+        """Return the CachedResponse for url, fresh or stale, or None if it was never stored."""
+        key = normalise_url(url)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT b.data, e.etag, e.last_modified, e.fetched_at "
+                "FROM entries e JOIN bodies b ON b.digest = e.digest WHERE e.url = ?",
+                (key,),
+            ).fetchone()
+            if row is None:
+                return None
+            self._accessed[key] = time.time()
+            if len(self._accessed) >= ACCESS_FLUSH:
+                self._flush_accessed()
+                self._conn.commit()
+        data, etag, last_modified, fetched_at = row
+        return CachedResponse(zlib.decompress(data).decode("utf-8"), etag, last_modified, fetched_at)
+
+    def put(self, url: str, text: str, etag=None, last_modified=None):
+        key = normalise_url(url)
+        raw = text.encode("utf-8")
+        digest = hashlib.sha256(raw).hexdigest()
+        now = time.time()
+        data = zlib.compress(raw)
+        with self._lock:
+            inserted = self._conn.execute(
+                "INSERT OR IGNORE INTO bodies (digest, data, size) VALUES (?, ?, ?)",
+                (digest, data, len(data)),
+            ).rowcount
+            self._bytes += len(data) if inserted else 0
+            self._accessed.pop(key, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO entries (url, digest, etag, last_modified, fetched_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, digest, etag, last_modified, now, now),
+            )
+            if self._bytes > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def touch(self, url: str):
+        """Mark url as confirmed unchanged by the shop (a 304), restarting its TTL."""
+        now = time.time()
+        key = normalise_url(url)
+        with self._lock:
+            self._accessed.pop(key, None)
+            self._conn.execute(
+                "UPDATE entries SET fetched_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, key),
+            )
+            self._conn.commit()
+
+    def discard(self, urls):
+        """Drop the entries of urls, e.g. pages that gave no price, so they are fetched again."""
+        keys = [(normalise_url(url),) for url in urls]
+        with self._lock:
+            for key, in keys:
+                self._accessed.pop(key, None)
+            self._conn.executemany("DELETE FROM entries WHERE url = ?", keys)
+            self._conn.execute("DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM entries)")
+            self._bytes = self._stored_bytes()
+            self._conn.commit()
+
+    def _evict(self):
+        # Caller holds the lock. Other processes may share the file, so start from the real size.
+        self._flush_accessed()
+        self._bytes = self._stored_bytes()
+        while self._bytes > self.max_bytes * EVICT_TO:
+            oldest = self._conn.execute(
+                "SELECT url FROM entries ORDER BY accessed_at LIMIT 50"
+            ).fetchall()
+            if not oldest:
+                break
+            self._conn.executemany("DELETE FROM entries WHERE url = ?", oldest)
+            self._conn.execute("DELETE FROM bodies WHERE digest NOT IN (SELECT digest FROM entries)")
+            self._bytes = self._stored_bytes()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+            bodies, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM bodies").fetchone()
+        return {"entries": entries, "bodies": bodies, "bytes": size}
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM entries")
+            self._conn.execute("DELETE FROM bodies")
+            self._conn.commit()
+            self._accessed.clear()
+            self._bytes = 0
+
+    def flush(self):
+        """Write the batched last-used times."""
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+
+    def close(self):
+        with self._lock:
+            self._flush_accessed()
+            self._conn.commit()
+            self._conn.close()
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """Return the process-wide cache, or None when SCRAPER_HTTP_CACHE=0."""
+    global _cache
+    if not config.HTTP_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+            atexit.register(_flush_at_exit)
+        return _cache
+
+
+def _flush_at_exit():
+    try:
+        _cache.flush()
+    except sqlite3.Error:
+        pass
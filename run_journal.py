@@ -0,0 +1,100 @@
+import datetime
+import glob
+import json
+import os
+import sqlite3
+import threading
+
+import pandas as pd
+
+import config
+
+
+def new_run_id() -> str:
+    return datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+
+
+class RunJournal:
+    """
+    Checkpoints of one scrape run, stored in SQLite.
+
+    Every price is recorded the moment it arrives, so a run that crashes or
+    hangs can be resumed with only the unfinished urls left to fetch. The
+    journal also keeps what the run was asked to do (catalogues, incremental)
+    so a resume can be started from the run id alone.
+    """
+    def __init__(self, run_id: str, folder: str = config.RUN_JOURNAL_DIR):
+        self.run_id = run_id
+        os.makedirs(folder, exist_ok=True)
+        self.path = os.path.join(folder, f"{run_id}.sqlite")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS prices (
+                shop TEXT NOT NULL,
+                url TEXT NOT NULL,
+                price TEXT,
+                recorded_at TEXT NOT NULL,
+                PRIMARY KEY (shop, url)
+            );
+        """)
+        self._conn.commit()
+
+    def set_meta(self, **values):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in values.items()],
+            )
+            self._conn.commit()
+
+    def meta(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def record(self, shop: str, url: str, price):
+        price = None if pd.isna(price) else str(price)
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO prices (shop, url, price, recorded_at) VALUES (?, ?, ?, ?)",
+                (shop, url, price, stamp),
+            )
+            self._conn.commit()
+
+    def prices(self) -> dict:
+        """Return {(shop, url): price} for every url that already has a price."""
+        with self._lock:
+            rows = self._conn.execute("SELECT shop, url, price FROM prices WHERE price IS NOT NULL").fetchall()
+        return {(shop, url): price for shop, url, price in rows}
+
+    def failed(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM prices WHERE price IS NULL").fetchone()[0]
+
+    def finish(self):
+        self.set_meta(finished=datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def list_runs(folder: str = config.RUN_JOURNAL_DIR) -> list:
+    """Return the run ids with a journal in folder, oldest first."""
+    paths = sorted(glob.glob(os.path.join(folder, "*.sqlite")))
+    return [os.path.splitext(os.path.basename(path))[0] for path in paths]
+
+
+def open_journal(run_id: str, folder: str = config.RUN_JOURNAL_DIR) -> RunJournal:
+    if not os.path.exists(os.path.join(folder, f"{run_id}.sqlite")):
+        raise FileNotFoundError(f"No journal for run {run_id} in {folder}")
+    return RunJournal(run_id, folder)
+
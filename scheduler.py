@@ -0,0 +1,177 @@
+import glob
+import os
+import re
+import statistics
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+import config
+
+# Matches the per-company timing lines scrape_all / scrape_helmets write to the run log.
+# Newer lines also say how many rows (or unique urls) the time was spent on.
+TOOK_PATTERN = re.compile(
+    r"INFO: (?P<company>.+?) took (?P<seconds>[\d.]+) seconds(?: for (?P<rows>\d+) (?:rows|urls))?\.$")
+# Seconds per row assumed for companies with no history yet.
+DEFAULT_ROW_COST = {"browser": 3.0, "http": 0.25}
+
+
+def load_history(log_dir: str = ".", runs: int = config.HISTORY_RUNS) -> dict:
+    """
+    Return {company: [(seconds, rows), ...]} from the `runs` most recent run
+    logs in log_dir. rows is None for lines logged before row counts were.
+    """
+    history = defaultdict(list)
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.log")))[-runs:]:
+        try:
+            with open(path, encoding="utf-8", errors="replace") as log_file:
+                for line in log_file:
+                    match = TOOK_PATTERN.search(line.rstrip())
+                    if match:
+                        rows = int(match.group("rows")) if match.group("rows") else None
+                        history[match.group("company")].append((float(match.group("seconds")), rows))
+        except OSError:
+            continue
+    return dict(history)
+
+
+def expected_cost(scraper, rows: int, history: dict) -> float:
+    """
+    Predict how long scraping `rows` of a company takes: its median past cost
+    per row times rows, or a default per-row cost if it has no history.
+    """
+    # Older helmet runs were logged as "HELMET HELMET <shop>".
+    for key in (scraper.name, "HELMET " + scraper.name):
+        # Timings without a row count can't be scaled to an incremental or resumed run, so skip them.
+        per_row = [seconds / count for seconds, count in history.get(key, []) if count]
+        if per_row:
+            return rows * statistics.median(per_row)
+    source = getattr(scraper, "source", scraper)
+    kind = "browser" if hasattr(source, "get_price_with_driver") else "http"
+    return rows * DEFAULT_ROW_COST[kind]
+
+
+class Chunk:
+    def __init__(self, scraper, index: int, rows: pd.DataFrame, cost: float):
+        self.scraper = scraper
+        self.index = index
+        self.rows = rows
+        self.cost = cost
+
+
+def plan_chunks(df: pd.DataFrame, scrapers, history: dict, chunk_rows: int = config.CHUNK_ROWS):
+    """
+    Split every company's rows into chunks of at most chunk_rows, each carrying
+    its share of the company's expected cost, ordered most expensive first.
+    """
+    chunks = []
+    chunk_counts = {}
+    for scraper in scrapers:
+        rows = scraper.matching_rows(df).copy()
+        cost = expected_cost(scraper, len(rows), history)
+        # A company with no rows still gets one chunk so its (empty) output is written.
+        starts = range(0, len(rows), chunk_rows) if len(rows) else [0]
+        for index, start in enumerate(starts):
+            part = rows.iloc[start:start + chunk_rows]
+            share = len(part) / len(rows) if len(rows) else 1.0
+            chunks.append(Chunk(scraper, index, part, cost * share))
+        chunk_counts[scraper.name] = len(starts)
+    # Longest-processing-time-first: big work starts early, small chunks fill the gaps at the end.
+    chunks.sort(key=lambda chunk: chunk.cost, reverse=True)
+    return chunks, chunk_counts
+
+
+class ChunkScheduler:
+    """
+    Run chunks on a fixed set of worker threads. Workers take the most expensive
+    chunk left whenever they go idle, so a large company's chunks spread over
+    whichever workers are free instead of tying up one worker to the end.
+    """
+    def __init__(self, chunks, workers: int = config.MAX_WORKERS):
+        self.pending = list(chunks)
+        self.workers = max(1, min(workers, len(self.pending)))
+        self.results = defaultdict(dict)
+        self.durations = defaultdict(float)
+        self.errors = {}
+        self._lock = threading.Lock()
+        self._predicted_done = 0.0
+        self._actual_done = 0.0
+        self._start = None
+
+    def _next_chunk(self):
+        with self._lock:
+            while self.pending:
+                chunk = self.pending.pop(0)
+                # Once one chunk of a company fails, skip the rest of it.
+                if chunk.scraper.name not in self.errors:
+                    return chunk
+            return None
+
+    def eta(self) -> float:
+        """Predicted seconds left, scaled by how far off the predictions have been so far."""
+        with self._lock:
+            remaining = sum(chunk.cost for chunk in self.pending)
+            ratio = self._actual_done / self._predicted_done if self._predicted_done else 1.0
+        return remaining * ratio / self.workers
+
+    def _work(self):
+        while True:
+            chunk = self._next_chunk()
+            if chunk is None:
+                return
+            start = time.time()
+            try:
+                result = chunk.scraper.fill_prices(chunk.rows.copy())
+            except Exception as e:
+                with self._lock:
+                    self.errors.setdefault(chunk.scraper.name, e)
+                continue
+            elapsed = time.time() - start
+            with self._lock:
+                self.results[chunk.scraper.name][chunk.index] = result
+                self.durations[chunk.scraper.name] += elapsed
+                self._predicted_done += chunk.cost
+                self._actual_done += elapsed
+                left = len(self.pending)
+            print(f"{chunk.scraper.name} chunk {chunk.index + 1} done in {elapsed:.2f}s; "
+                  f"{left} chunks queued, ETA {self.eta():.0f}s")
+
+    def run(self):
+        self._start = time.time()
+        print(f"Scheduling {len(self.pending)} chunks on {self.workers} workers, "
+              f"ETA {self.eta():.0f}s")
+        threads = [threading.Thread(target=self._work, name=f"scheduler-{i}") for i in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        print(f"All chunks finished in {time.time() - self._start:.2f}s")
+
+
+def run_scheduled(df: pd.DataFrame, scrapers, workers: int = config.MAX_WORKERS, log_dir: str = "."):
+    """
+    Scrape every company in df, most expensive first and in chunks.
+
+    Returns ({name: (df_company, seconds)}, {name: exception}). Each company's
+    chunks are put back together in their original row order, its stats are
+    set as if scrape() had run, and seconds is the total time spent on its chunks.
+    """
+    history = load_history(log_dir)
+    chunks, chunk_counts = plan_chunks(df, scrapers, history)
+    scheduler = ChunkScheduler(chunks, workers)
+    scheduler.run()
+    finished = {}
+    for scraper in scrapers:
+        if scraper.name in scheduler.errors:
+            continue
+        parts = scheduler.results[scraper.name]
+        if len(parts) != chunk_counts[scraper.name]:
+            continue
+        df_company = pd.concat([parts[i] for i in sorted(parts)])
+        scraper.df = df_company
+        scraper.stats = scraper.compute_stats(df_company)
+        print(f"{scraper.name} stats: {scraper.stats}")
+        finished[scraper.name] = (df_company, scheduler.durations[scraper.name])
+    return finished, scheduler.errors
@@ -1,34 +1,36 @@
+import argparse
+import contextlib
+import json
+import sys
 import pandas as pd
 import numpy as np
 import os
 import datetime
 import re
+import subprocess
+import tempfile
 import time
-import httpx
 import logging
-from parsel import Selector
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.common.by import By
-from selenium import webdriver
-from webdriver_manager.chrome import ChromeDriverManager
 import concurrent.futures
+import threading
+from collections import defaultdict
 
-from scrapers.hare_and_forbes_scraper import get_hares_and_forbes_price
-from scrapers.tools_warehouse_scraper import get_toolswarehouse_price
-from scrapers.kennedys_scraper import get_kennedys_price
-from scrapers.vektools_scraper import get_vektools_price
-from scrapers.sydney_tools_scraper import get_sydney_tools_price
-from scrapers.total_tools_scraper import get_total_tools_price
-from scrapers.alphaweld_scraper import get_alphaweld_price
-from scrapers.waindustrial_scraper import get_waindustrialsupplies_price
-from scrapers.gasrep_scraper import get_gasrep_price
-from scrapers.electroweld_website_scraper import get_electroweld_website_price
-from scrapers.bilba_website_scraper import get_bilba_website_price
-from scrapers.stafford_welding_scraper import get_stafford_welding_price
-from scrapers.gasweld_scraper import get_gasweld_price
-from scrapers.weldquip_scraper import get_weldquip_price
-from scrapers.trade_tools_scraper import get_trade_tools_price
+import config
+
+from driver_pool import close_driver_pool, get_driver_pool
+from page_waits import load_and_wait, timing_summary
+from fetch_engine import DEFAULT_TIMEOUT, cache_stats, fetch_pages, fetch_prices, host_of, is_valid_url, pool_stats, throttle_stats
+from fetch_plan import FetchPlan, replay_fill
+from incremental import SCRAPED_AT, TIMESTAMP_FORMAT, latest_combined, load_previous, now_stamp, split_stale
+from comparison import write_pivot
+from price_parser import benchmark as price_benchmark, default_corpus_files, fuzz as price_fuzz, price_corpus, price_details
+from price_store import PriceStore, catalogue_from_filename, import_csv, run_id_from_filename, store_combined
+from page_archive import archive_page, list_runs, open_run
+from run_journal import RunJournal, new_run_id, open_journal
+from sharding import SHARD_KEYS, Shard
+from site_profiles import PROFILES_PATH, load_profiles
+from work_queue import WorkQueue, run_worker
+from structured_data import extract_structured_price, path_summary, prices_agree, record_path
 
 # Configure logging: the log file will be named with the current timestamp.
 log_filename = datetime.datetime.now().strftime("%Y%m%d_%H%M%S.log")
@@ -39,324 +41,67 @@ logging.basicConfig(
     datefmt='%Y-%m-%d %H:%M:%S'
 )
 
-def init_driver() -> webdriver.Chrome:
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--disable-gpu")
-    chrome_options.add_argument("--no-sandbox")
-    driver = webdriver.Chrome(options=chrome_options)
-    driver.set_page_load_timeout(15)
-    return driver
-
-def close_driver(driver: webdriver.Chrome):
-    driver.quit()
-
-def fetch_value_by_xpath(driver: webdriver.Chrome, url: str, xpath: str) -> str:
-    if not url or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    try:
-        driver.get(url)
-        time.sleep(3)
-        element = driver.find_element(By.XPATH, xpath)
-        value = element.text.strip()
-        return value.replace("A$", "")
-    except Exception as e:
-        return np.nan
-
-def get_ebay_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    session = httpx.Client(
-        headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36 Edg/113.0.1774.35",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,/;q=0.8,application/signed-exchange;v=b3;q=0.7",
-            "Accept-Language": "en-US,en;q=0.9",
-            "Accept-Encoding": "gzip, deflate, br",
-        },
-        http2=True,
-        follow_redirects=True
-    )
-    try:
-        response = session.get(url, timeout=15.0)
-    except (httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    price = sel.css(".x-price-primary>span::text").get(default="").strip()
-    return price
-
-def get_gentronics_website_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not (url.startswith("https://www.googleadservices.com/pagead/aclk") or url.startswith("https://www.gentronics.com.au/")):
-        return np.nan
-    session = httpx.Client(
-        headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        },
-        follow_redirects=True
-    )
-    try:
-        response = session.get(url)
-    except:
-        return np.nan
-    sel = Selector(response.text)
-    price = sel.css("p.gentronics-price.price::text").get(default="").strip()
-    price = price[1:] if price.startswith("$") else price
-    return price.replace("per item", "").strip()
-
-def get_national_welding_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.nationalwelding.com.au/"):
-        return np.nan
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,*/*;q=0.8"
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as client:
-            response = client.get(url)
-    except (httpx.RequestError, httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    promo_price_element = sel.css("div.productpromo[itemprop='price']")
-    if promo_price_element:
-        content_attr = promo_price_element.attrib.get("content", "")
-        if content_attr:
-            return content_attr.strip()
-        promo_price_text = promo_price_element.css("::text").get()
-        if promo_price_text:
-            return promo_price_text.replace("NOW", "").replace("$", "").replace(",", "").strip()
-    price_element = sel.css("div.productprice.productpricetext[itemprop='price']")
-    if not price_element:
-        return np.nan
-    content_attr = price_element.attrib.get("content", "")
-    if content_attr:
-        return content_attr.strip()
-    price_text = price_element.css("::text").get()
-    if not price_text:
-        return np.nan
-    return price_text.replace("$", "").replace(",", "").strip()
-
-def get_hampdon_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.hampdon.com.au/"):
-        return np.nan
+# ------------------------- Row-level parallelism -------------------------
 
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": (
-                    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                    "AppleWebKit/537.36 (KHTML, like Gecko) "
-                    "Chrome/113.0.0.0 Safari/537.36"
-                ),
-                "Accept": (
-                    "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,"
-                    "image/webp,*/*;q=0.8"
-                ),
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as client:
-            response = client.get(url)
-    except (httpx.RequestError, httpx.ReadTimeout, Exception):
-        return np.nan
-
-    sel = Selector(response.text)
-    price_element = sel.css("div.productprice.productpricetext[itemprop='price']")
-    if not price_element:
-        return np.nan
-    content_attr = price_element.attrib.get("content", "")
-    if content_attr:
-        return content_attr.strip()
-    price_text = price_element.css("::text").get()
-    if not price_text:
-        return np.nan
-    return price_text.replace("$", "").replace(",", "").strip()
-
-def get_weld_com_au_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.weld.com.au/product/"):
-        return np.nan
-    session = httpx.Client(
-        headers={
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-            "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-        },
-        follow_redirects=True
-    )
-    response = session.get(url)
-    sel = Selector(response.text)
-    price = sel.css("p.price span.woocommerce-Price-amount.amount bdi::text").get(default="").strip()
-    return price[1:] if price.startswith("$") else price
-
-def get_weldconnect_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.weldconnect.com.au/"):
-        return np.nan
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            },
-            follow_redirects=True
-        ) as session:
-            response = session.get(url, timeout=15.0)
-    except (httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    return sel.css("div.h1[itemprop='price']::attr(content)").get(default="").strip()
-
-def get_metweld_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://metweld.com.au/"):
-        return np.nan
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as session:
-            response = session.get(url)
-    except (httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    price = sel.css("span.price.price--withTax::text").get(default="").strip()
-    return price[1:] if price.startswith("$") else price
-
-def get_toolkitdepot_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://toolkitdepot.com.au/"):
-        return np.nan
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as session:
-            response = session.get(url)
-    except (httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    price = sel.css("span.price.price--withTax span::text").get(default="").strip()
-    if not price:
-        price = "".join(sel.css("span.price.price--withTax ::text").getall()).strip()
-    return price[1:] if price.startswith("$") else price
-
-def get_supercheapauto_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.supercheapauto.com.au/"):
-        return np.nan
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
-        "Accept-Language": "en-US,en;q=0.9",
-        "Accept-Encoding": "gzip, deflate, br",
-    }
-    try:
-        with httpx.Client(headers=headers, follow_redirects=True) as session:
-            response = session.get(url, timeout=15.0)
-    except (httpx.ReadTimeout, Exception):
-        return np.nan
-    sel = Selector(response.text)
-    price_class = "".join(sel.xpath("//span[contains(@class, 'price-sales')]//span[contains(@class, 'promo-price')]/text()").getall()).strip()
-    price_full = sel.xpath("/html/body/div[1]/div[14]/div[3]/div/div[2]/div/div[3]/span/span/text()").get(default="").strip()
-    price = price_class if price_class else price_full
-    return price[1:].strip() if price.startswith("$") else (price if price else np.nan)
-
-def get_primesupplies_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.primesupplies.com.au/product/"):
-        return np.nan
-        
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as session:
-            response = session.get(url)
-    except (httpx.ReadTimeout, Exception) as e:
-        #print(f"Error fetching Prime Supplies URL {url}: {e}")
-        return np.nan
-        
-    sel = Selector(response.text)
-    
-    price = sel.xpath("/html/body/div[2]/main/div[2]/div[2]/div[1]/p[2]/span/bdi/text()").get(default="").strip()
-    
-    if not price:
-        price = sel.css("p.price span.woocommerce-Price-amount.amount bdi::text").get(default="").strip()
-    
-    if not price:
-        price = sel.css(".price .woocommerce-Price-amount.amount::text").get(default="").strip()
-    
-    if price:
-        price = price.replace("$", "").strip()
-        price = price.replace("inc. GST", "").strip()
-        return price
-    else:
-        return np.nan
-    
-def get_australia_industrial_group_price(url: str) -> str:
-    if pd.isna(url) or not isinstance(url, str) or url.strip() == "":
-        return np.nan
-    if not url.startswith("https://www.australiaindustrialgroup.com.au/product-page/"):
-        return np.nan
-        
-    try:
-        with httpx.Client(
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36",
-                "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8",
-            },
-            follow_redirects=True,
-            timeout=15.0,
-        ) as session:
-            response = session.get(url)
-    except (httpx.ReadTimeout, Exception) as e:
-        #print(f"Error fetching Australia Industrial Group URL {url}: {e}")
-        return np.nan
-        
-    sel = Selector(response.text)
-    price = sel.xpath("/html/body/div[1]/div/div[3]/div/main/div/div/div[2]/div/div/div/section/div[2]/div/div/div/div/div/div/article/div[2]/section[2]/div[1]/div/div/div[2]/span[1]/text()").get(default="").strip()
-    if not price:
-        price = sel.css('span[data-hook="formatted-primary-price"]::text').get(default="").strip()
-    if not price:
-        price = sel.css('span.hM4gpp[data-hook="formatted-primary-price"]::text').get(default="").strip()
-    if not price:
-        price = sel.css('div[data-hook="product-price"] span[data-wix-price]::text').get(default="").strip()
-    if price:
-        price = price.replace("$", "").replace(",", "").strip()
+# Shared by every company so the total number of rows in flight stays bounded
+# no matter how many scrapers scrape_all runs at once.
+_row_budget = threading.BoundedSemaphore(config.ROW_WORKERS)
+_host_caps = {}
+_host_caps_lock = threading.Lock()
+
+def _host_cap(url) -> threading.BoundedSemaphore:
+    host = host_of(url) if isinstance(url, str) else ""
+    with _host_caps_lock:
+        if host not in _host_caps:
+            _host_caps[host] = threading.BoundedSemaphore(config.PER_HOST_LIMIT)
+        return _host_caps[host]
+
+def reporting(get_price, on_price=None):
+    """Wrap get_price so on_price(url, price) is called as each row finishes."""
+    if on_price is None:
+        return get_price
+    def report(url):
+        price = get_price(url)
+        on_price(url, price)
         return price
-    else:
-        return np.nan    
-    
+    return report
+
+def map_rows(get_price, urls) -> list:
+    """
+    Run get_price over urls in parallel under the global row budget and the
+    per-host cap, returning the results in the same order as urls.
+    """
+    urls = list(urls)
+    if not urls:
+        return []
+    def task(url):
+        with _host_cap(url), _row_budget:
+            return get_price(url)
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(len(urls), config.ROW_WORKERS)) as executor:
+        return list(executor.map(task, urls))
 
 # ------------------------- Scraper Classes -------------------------
 
+# Scrapers return the price text they found; when a company's rows are filled
+# each price column becomes the amount, with its text, currency and GST basis
+# (ParsedPrice.raw / currency / gst) in these columns beside it.
+PRICE_DETAILS = {"raw": "_Text", "currency": "_Currency", "gst": "_GST"}
+
+def price_detail_columns(column) -> tuple:
+    return tuple(column + suffix for suffix in PRICE_DETAILS.values())
+
+def add_price_details(df_company: pd.DataFrame, column: str) -> pd.DataFrame:
+    details = price_details(df_company[column])
+    df_company[column] = details["amount"]
+    for field, suffix in PRICE_DETAILS.items():
+        df_company[column + suffix] = details[field]
+    return df_company
+
 class CompanyScraper:
+    price_column = 'Price'
+    output_columns = ('Price', 'Price_Bundle') + price_detail_columns('Price')
+    # Set by FetchPlan.run to the journal's run id; names the page archive.
+    run_id = None
     def __init__(self, name, pattern):
         self.name = name
         self.pattern = pattern
@@ -364,24 +109,147 @@ class CompanyScraper:
         self.stats = {}
     def get_price(self, url: str) -> str:
         raise NotImplementedError
-    def scrape(self, df: pd.DataFrame) -> pd.DataFrame:
-        df_company = df[df['Shop Name'].str.contains(self.pattern, case=False, na=False, regex=True)].copy()
-        df_company['Price'] = df_company['PRODUCT LINK'].apply(self.get_price)
-        df_company['Price_Bundle'] = df_company.get('BUNDLE LINK', np.nan)
+    def get_prices(self, urls, on_price=None) -> list:
+        # Scrapers that can fetch in bulk override this; the default fetches rows in parallel.
+        return map_rows(reporting(self.get_price, on_price), urls)
+    def matching_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        return df[df['Shop Name'].str.contains(self.pattern, case=False, na=False, regex=True)]
+    def reparse_price(self, pages: dict):
+        """Extract a price from stored pages ({kind: html}) without touching the network."""
+        raise NotImplementedError
+    def compute_stats(self, df_company: pd.DataFrame) -> dict:
         total = len(df_company)
         valid = df_company['PRODUCT LINK'].notna().sum()
-        extracted = df_company['Price'].notna().sum()
+        extracted = df_company[self.price_column].notna().sum()
+        return {"total_rows": total, "valid_product_links": valid, "extracted_prices": extracted}
+    def fill_prices(self, df_company: pd.DataFrame) -> pd.DataFrame:
+        # Works on any slice of this company's rows, so the scheduler can scrape it in chunks.
+        df_company['Price'] = self.get_prices(df_company['PRODUCT LINK'].tolist())
+        df_company['Price_Bundle'] = df_company.get('BUNDLE LINK', np.nan)
+        return add_price_details(df_company, 'Price')
+    def scrape(self, df: pd.DataFrame) -> pd.DataFrame:
+        df_company = self.fill_prices(self.matching_rows(df).copy())
         self.df = df_company
-        self.stats = {"total_rows": total, "valid_product_links": valid, "extracted_prices": extracted}
+        self.stats = self.compute_stats(df_company)
         print(f"{self.name} stats: {self.stats}")
         return df_company
+
+class HttpCompanyScraper(CompanyScraper):
+    """
+    Base class for shops whose prices can be read from the raw HTML.
+    Subclasses only supply parse_price(html) and the allowed URL prefixes;
+    all of a company's links are fetched concurrently by fetch_engine.
+    """
+    url_prefixes = ()
+    headers = None
+    timeout = DEFAULT_TIMEOUT
+    def parse_price(self, html: str) -> str:
+        raise NotImplementedError
+    def get_price(self, url: str) -> str:
+        return self.get_prices([url])[0]
+    def get_prices(self, urls, on_price=None) -> list:
+        return fetch_prices(
+            urls,
+            self.parse_price,
+            self.url_prefixes,
+            headers=self.headers,
+            timeout=self.timeout,
+            on_page=self.archive_http_page,
+            on_price=on_price,
+        )
+    def archive_http_page(self, url: str, html: str):
+        archive_page(self.name, url, "http", html, self.run_id)
+    def reparse_price(self, pages: dict):
+        if "http" not in pages:
+            return np.nan
+        return self.parse_price(pages["http"])
     
+class BrowserCompanyScraper(CompanyScraper):
+    """
+    Base class for shops that need a real browser. Drivers are borrowed from the
+    shared driver_pool for each page and handed back afterwards, so no scraper
+    owns a Chrome process of its own.
+    """
+    url_prefixes = ()
+    # Try JSON-LD / microdata / OpenGraph from a plain HTTP fetch before starting Chrome.
+    try_structured_data = True
+    def get_price_with_driver(self, url: str, driver) -> str:
+        raise NotImplementedError
+    def parse_price(self, html: str) -> str:
+        # Reads the same nodes as get_price_with_driver from a stored page_source.
+        raise NotImplementedError
+    def get_price(self, url: str) -> str:
+        # Don't start a browser for rows that can never produce a price.
+        if not is_valid_url(url, self.url_prefixes):
+            return np.nan
+        with get_driver_pool().driver() as driver:
+            price = self.get_price_with_driver(url, driver)
+            try:
+                archive_page(self.name, url, "browser", driver.page_source, self.run_id)
+            except Exception as exc:
+                logging.warning(f"Could not archive browser page of {url}: {exc}")
+            return price
+    def reparse_price(self, pages: dict):
+        if "browser" in pages:
+            return self.parse_price(pages["browser"])
+        # Rows answered from structured data during the run only have the plain HTTP page.
+        price, _ = self.structured_price(pages.get("http"))
+        return price
+    def structured_price(self, html: str, url: str = None):
+        """
+        The structured-data price of a plain HTTP page, as (price, method), or
+        (np.nan, None) when the page has to be rendered. Where the page already
+        shows the price the profile selector reads, that price wins if the two
+        disagree, and method is "selector".
+        """
+        price, method = extract_structured_price(html)
+        if not method:
+            return price, None
+        try:
+            visible = self.parse_price(html)
+        except Exception:
+            visible = np.nan
+        if pd.isna(visible):
+            # The price is rendered by script, so there is nothing on the page to check against.
+            return price, method
+        if prices_agree(price, visible):
+            return price, method
+        logging.warning(f"{self.name}: {method} price {price!r} disagrees with the page's {visible!r}"
+                        f"{f' at {url}' if url else ''}; using the page's")
+        return visible, "selector"
+    def get_prices(self, urls, on_price=None) -> list:
+        urls = list(urls)
+        # Rows that share a url are fetched and rendered once.
+        unique = list(dict.fromkeys(url for url in urls if is_valid_url(url, self.url_prefixes)))
+        pages = fetch_pages(unique) if self.try_structured_data else [None] * len(unique)
+        prices = {}
+        needs_browser = []
+        for url, html in zip(unique, pages):
+            archive_page(self.name, url, "http", html, self.run_id)
+            price, method = self.structured_price(html, url)
+            if method:
+                prices[url] = price
+                record_path(self.name, method)
+                if on_price is not None:
+                    on_price(url, price)
+            else:
+                needs_browser.append(url)
+        # Remaining pages render in parallel, bounded by the driver pool size.
+        browser_prices = map_rows(reporting(self.get_price, on_price), needs_browser)
+        for url, price in zip(needs_browser, browser_prices):
+            prices[url] = price
+            record_path(self.name, "browser" if pd.notna(price) else "failed")
+        return [prices.get(url, np.nan) if isinstance(url, str) else np.nan for url in urls]
+
 class HelmetCompanyScraper(CompanyScraper):
+    price_column = 'Helmet_Price'
+    output_columns = (('Helmet_Price', 'Helmet_Price_Bundle') + price_detail_columns('Helmet_Price')
+                      + price_detail_columns('Helmet_Price_Bundle'))
     def __init__(self, name="", pattern=""):
         super().__init__(name, pattern)
         self.name = "HELMET " + name  # Add HELMET prefix to distinguish from welder scrapers
         
-    def scrape(self, df: pd.DataFrame) -> pd.DataFrame:
+    def matching_rows(self, df: pd.DataFrame) -> pd.DataFrame:
         # Use more robust pattern matching to handle variations in company names
         pattern = self.pattern.replace("'", "").replace("-", "").replace(".", "")
         
@@ -394,271 +262,111 @@ class HelmetCompanyScraper(CompanyScraper):
             matching_companies = df.loc[match_mask, 'Shop Name'].unique()
             print(f"Matching companies: {matching_companies[:5]}")
         
-        df_company = df[match_mask].copy()
+        return df[match_mask]
         
+    def fill_prices(self, df_company: pd.DataFrame) -> pd.DataFrame:
         # Create a backup of empty DataFrame to handle no matches
         if df_company.empty:
             print(f"No matching companies found for {self.name}")
-            empty_df = pd.DataFrame(columns=df.columns)
+            empty_df = pd.DataFrame(columns=df_company.columns)
             empty_df['Helmet_Price'] = None
             empty_df['Helmet_Price_Bundle'] = None
-            return empty_df
+            return add_price_details(add_price_details(empty_df, 'Helmet_Price'), 'Helmet_Price_Bundle')
         
         # Apply price extraction to valid URLs only
         df_company['Helmet_Price'] = None
         mask = df_company['PRODUCT LINK'].notna() & (df_company['PRODUCT LINK'] != '')
         if mask.any():
-            df_company.loc[mask, 'Helmet_Price'] = df_company.loc[mask, 'PRODUCT LINK'].apply(self.get_price)
+            df_company.loc[mask, 'Helmet_Price'] = self.get_prices(df_company.loc[mask, 'PRODUCT LINK'].tolist())
         
         # Add bundle price column if needed
         if 'BUNDLE LINK' in df_company.columns:
             df_company['Helmet_Price_Bundle'] = None
             mask = df_company['BUNDLE LINK'].notna() & (df_company['BUNDLE LINK'] != '')
             if mask.any():
-                df_company.loc[mask, 'Helmet_Price_Bundle'] = df_company.loc[mask, 'BUNDLE LINK'].apply(self.get_price)
+                df_company.loc[mask, 'Helmet_Price_Bundle'] = self.get_prices(df_company.loc[mask, 'BUNDLE LINK'].tolist())
         else:
             df_company['Helmet_Price_Bundle'] = None
         
-        # Calculate stats
-        total = len(df_company)
-        valid = df_company['PRODUCT LINK'].notna().sum()
-        extracted = df_company['Helmet_Price'].notna().sum()
-        
-        self.df = df_company
-        self.stats = {"total_rows": total, "valid_product_links": valid, "extracted_prices": extracted}
-        print(f"{self.name} stats: {self.stats}")
-        
-        return df_company
-
-class ElectroweldEbayScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("ELECTROWELD EBAY", "ELECTROWELD EBAY")
-    
-    def get_price(self, url: str) -> str:
-        return get_ebay_price(url)
-
-class HampdonEbayScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("HAMPDON EBAY", "HAMPDON EBAY")
-    
-    def get_price(self, url: str) -> str:
-        return get_ebay_price(url)
-
-class WAIndustrialSuppliesEbayScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("WA INDUSTRIAL SUPPLIES EBAY", "WA INDUSTRIAL SUPPLIES EBAY")
-    
-    def get_price(self, url: str) -> str:
-        return get_ebay_price(url)
-
-class NationalWeldingEbayScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("NATIONAL WELDING EBAY", "NATIONAL WELDING EBAY")
-    
-    def get_price(self, url: str) -> str:
-        return get_ebay_price(url)
-
-class BilbaEbayScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("BILBA EBAY", "BILBA EBAY")
-    
-    def get_price(self, url: str) -> str:
-        return get_ebay_price(url)
-
-class ElectroweldScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("ELECTROWELD WEBSITE", "electroweld website")
-    def get_price(self, url: str) -> str:
-        return get_electroweld_website_price(url)
-
-class BilbaScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("BILBA WEBSITE", "BILBA WEBSITE")
-    def get_price(self, url: str) -> str:
-        return get_bilba_website_price(url)
-
-class GentronicsScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("GENTRONICS", "GENTRONICS")
-    def get_price(self, url: str) -> str:
-        return get_gentronics_website_price(url)
-
-class WeldComAuScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("WELD.COM.AU", "WELD.COM.AU")
-    def get_price(self, url: str) -> str:
-        return get_weld_com_au_price(url)
-
-class WeldConnectScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("WELDCONNECT", "WELDCONNECT")
-    def get_price(self, url: str) -> str:
-        return get_weldconnect_price(url)
-
-class MetweldScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("METRO WELDER SERVICE", "METRO WELDER SERVICE")
-    def get_price(self, url: str) -> str:
-        return get_metweld_price(url)
-
-class ToolkitDepotScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("TKD", "TKD")
-    def get_price(self, url: str) -> str:
-        return get_toolkitdepot_price(url)
-
-class SupercheapAutoScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("SUPERCHEAP AUTO", "SUPERCHEAP AUTO")
-    def get_price(self, url: str) -> str:
-        return get_supercheapauto_price(url)
+        return add_price_details(add_price_details(df_company, 'Helmet_Price'), 'Helmet_Price_Bundle')
 
-class ToolsWarehouseScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("TOOLS WAREHOUSE", "TOOLS WAREHOUSE")
-    def get_price(self, url: str) -> str:
-        return get_toolswarehouse_price(url)
-    
-
-class VekToolsScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("VEK TOOLS", "VEK TOOLS")
-    def get_price(self, url: str) -> str:
-        return get_vektools_price(url)
-
-class KennedysScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("KENNEDY'S WELDING SUPPLIES", "KENNEDY'S WELDING SUPPLIES")
-    def get_price(self, url: str) -> str:
-        return get_kennedys_price(url)
-
-class TotalToolsScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("TOTAL TOOLS", "total tools")
-    def get_price(self, url: str) -> str:
-        return get_total_tools_price(url)
-
-class WAIndustrialScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("WA INDUSTRIAL SUPPLIES WEBSITE", "WA INDUSTRIAL SUPPLIES WEBSITE")
-        self.driver = init_driver()
-    def get_price(self, url: str) -> str:
-        return get_waindustrialsupplies_price(self.driver, url)
-    def close(self):
-        close_driver(self.driver)
-
-class SydneyToolsScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("SYDNEY TOOLS", "SYDNEY TOOLS")
-        self.driver = init_driver()
-    def get_price(self, url: str) -> str:
-        return get_sydney_tools_price(url, self.driver)
-    def close(self):
-        close_driver(self.driver)
-
-class HareAndForbesScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("hare and forbes", "hare and forbes")
-        chrome_options = Options()
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver = webdriver.Chrome(options=chrome_options)
-    def get_price(self, url: str) -> str:
-        return get_hares_and_forbes_price(url, self.driver)
-    def close(self):
-        close_driver(self.driver)
-
-class GasRepScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("GASREP", "GASREP")
-        chrome_options = Options()
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_argument("--no-sandbox")
-        chrome_options.add_argument("--disable-infobars")
-        chrome_options.add_argument("--disable-dev-shm-usage")
-        self.driver = webdriver.Chrome(options=chrome_options)
-        
-    def get_price(self, url: str) -> str:
-        return get_gasrep_price(url, self.driver)
-    
-    def close(self):
-        close_driver(self.driver)
+class HttpProfileScraper(HttpCompanyScraper):
+    """A shop read from raw HTML, configured entirely by its site profile."""
+    def __init__(self, profile):
+        super().__init__(profile.name, profile.pattern)
+        self.profile = profile
+        self.url_prefixes = profile.url_prefixes
+        self.headers = profile.headers
+        self.timeout = profile.timeout
+    def parse_price(self, html: str) -> str:
+        return self.profile.extract_price(html)
 
-class AlphaweldScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("ALPHAWELD", "alphaweld")
-    def get_price(self, url: str) -> str:
-        return get_alphaweld_price(url)
+class BrowserProfileScraper(BrowserCompanyScraper):
+    """A shop rendered in Chrome, configured entirely by its site profile."""
+    def __init__(self, profile):
+        super().__init__(profile.name, profile.pattern)
+        self.profile = profile
+        self.url_prefixes = profile.url_prefixes
+    def get_price_with_driver(self, url: str, driver) -> str:
+        try:
+            # The price is read from the rendered DOM with the same selectors a re-parse uses.
+            load_and_wait(driver, url, self.profile.wait_for, self.profile.site)
+            return self.parse_price(driver.page_source)
+        except Exception:
+            return np.nan
+    def parse_price(self, html: str) -> str:
+        return self.profile.extract_price(html)
 
-class HampdonScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("HAMPDON", "hampdon website")
-    def get_price(self, url: str) -> str:
-        return get_hampdon_price(url)
+def make_scraper(profile):
+    if profile.backend == "browser":
+        return BrowserProfileScraper(profile)
+    return HttpProfileScraper(profile)
 
-class NationalWeldingScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("NATIONAL WELDING WEBSITE", "NATIONAL WELDING WEBSITE")
-    def get_price(self, url: str) -> str:
-        return get_national_welding_price(url)
-    
-class PrimeSuppliesScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("PRIME SUPPLIES", "PRIME SUPPLIES")
-    def get_price(self, url: str) -> str:
-        return get_primesupplies_price(url)
-    
-class AustraliaIndustrialGroupScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("AUSTRALIA INDUSTRIAL GROUP", "AUSTRALIA INDUSTRIAL")
-    def get_price(self, url: str) -> str:
-        return get_australia_industrial_group_price(url)
-
-class TradeToolsScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("TRADE TOOLS", "TRADE TOOLS")
-        options = Options()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        self.driver = webdriver.Chrome(options=options)
-    def get_price(self, url: str) -> str:
-        return get_trade_tools_price(url,self.driver)
-    def close(self):
-        close_driver(self.driver)
-    
-class StaffordWeldingScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("STAFFORD WELDING PRODUCTS", "STAFFORD WELDING")
-    def get_price(self, url: str) -> str:
-        return get_stafford_welding_price(url)
-    
-class GasweldScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("GASWELD", "GASWELD")
-    
-    def get_price(self, url: str) -> str:
-        return get_gasweld_price(url)
-    
-class WeldquipScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("WELDQUIP PRODUCTS", "WELDQUIP")
-    
-    def get_price(self, url: str) -> str:
-        return get_weldquip_price(url)
-    
-from scrapers.toolking_scraper import get_toolking_price
-class ToolKingScraper(CompanyScraper):
-    def __init__(self):
-        super().__init__("Robson's Tool King", "Tool King")
-    
-    def get_price(self, url: str) -> str:
-        return get_toolking_price(url)
+class ScraperRegistry:
+    """
+    The shops in site_profiles.toml, turned into scrapers on first use.
 
+    Profiles are read the first time a scraper list is asked for, and each
+    shop's scraper is built once and shared: a helmet scraper wraps the
+    welder scraper of the same shop instead of building a second one.
+    """
+    def __init__(self, path=PROFILES_PATH):
+        self.path = path
+        self._profiles = None
+        self._scrapers = {}
+        self._helmet_scrapers = None
+    def profiles(self) -> list:
+        if self._profiles is None:
+            self._profiles = load_profiles(self.path)
+        return self._profiles
+    def scraper(self, profile):
+        if profile.name not in self._scrapers:
+            self._scrapers[profile.name] = make_scraper(profile)
+        return self._scrapers[profile.name]
+    def welder_scrapers(self) -> list:
+        return [self.scraper(profile) for profile in self.profiles()]
+    def helmet_scrapers(self) -> list:
+        if self._helmet_scrapers is None:
+            self._helmet_scrapers = []
+            for profile in self.profiles():
+                if not profile.helmets:
+                    continue
+                original = self.scraper(profile)
+                # Helmet scrapers reuse the shop's price extraction under a HELMET-prefixed name.
+                helmet_scraper = HelmetCompanyScraper(name=original.name, pattern=original.pattern)
+                helmet_scraper.get_price = original.get_price
+                helmet_scraper.get_prices = original.get_prices
+                helmet_scraper.source = original
+                self._helmet_scrapers.append(helmet_scraper)
+        return self._helmet_scrapers
 
 # ------------------------- End of Scraper Classes -------------------------
 
+WELDER_INPUT_FILE = "Pricing.xlsx"
+HELMET_INPUT_FILE = "Helmet pricing competition.xlsx"
+SCRAPER_OUTPUT_FOLDER = "scraper_output"
+COMBINED_CSV_FOLDER = "combined_csv"
+
 def read_and_prepare_df(input_file):
     df = pd.read_excel(input_file, sheet_name="Sheet2")
     df['PRODUCT SKU'] = df['PRODUCT SKU'].str.strip().str.upper()
@@ -692,7 +400,7 @@ def read_and_prepare_df(input_file):
 def read_and_prepare_helmet_df():
     try:
         # Read the Excel file
-        helmet_df = pd.read_excel('Helmet pricing competition.xlsx', header=0)
+        helmet_df = pd.read_excel(HELMET_INPUT_FILE, header=0)
         
         print("Original helmet data shape:", helmet_df.shape)
         
@@ -765,51 +473,303 @@ def read_and_prepare_helmet_df():
         traceback.print_exc()
         return pd.DataFrame()  # Return empty DataFrame on error
 
-# A helper function that times the scraping process for each company.
-def timed_scrape(scraper, df_sub):
+class Catalogues:
+    """
+    The welder and helmet work lists, read from Excel the first time a menu
+    option needs them rather than before the menu is shown.
+    """
+    def __init__(self, welder_file=WELDER_INPUT_FILE, helmet_file=HELMET_INPUT_FILE):
+        self.welder_file = welder_file
+        self.helmet_file = helmet_file
+        self._welders = None
+        self._helmets = None
+    @property
+    def helmets_available(self) -> bool:
+        return os.path.exists(self.helmet_file)
+    def welders(self) -> pd.DataFrame:
+        if self._welders is None:
+            self._welders = read_and_prepare_df(self.welder_file)
+            print("Welders data sample:")
+            print(self._welders.head())
+        return self._welders
+    def helmets(self) -> pd.DataFrame:
+        if self._helmets is None:
+            self._helmets = read_and_prepare_helmet_df()
+            print("\nHelmets data sample:")
+            print(self._helmets.head())
+        return self._helmets
+
+def log_page_timings():
+    # Actual browser load + wait time per site, to keep SITE_WAIT_PROFILES honest.
+    for site, summary in sorted(timing_summary().items()):
+        message = (f"Browser pages for {site}: {summary['pages']} pages, "
+                   f"mean {summary['mean']:.2f}s, max {summary['max']:.2f}s")
+        print(message)
+        logging.info(message)
+
+def log_fetch_paths():
+    # How often each browser shop was served from structured data (or, when that disagreed
+    # with the page, the page's own price) instead of Chrome.
+    for shop, counts in sorted(path_summary().items()):
+        message = f"{shop} fetch paths: " + ", ".join(f"{path} {count}" for path, count in sorted(counts.items()))
+        print(message)
+        logging.info(message)
+
+def log_pool_stats():
+    # Connection reuse across rows of the same shop is where the pooled clients pay off.
+    for host, counters in sorted(pool_stats().items()):
+        message = (f"Connection pool {host}: opened {counters['opened']}, "
+                   f"reused {counters['reused']}, idle {counters['idle']}")
+        print(message)
+        logging.info(message)
+    counters = cache_stats()
+    message = (f"Response cache: {counters['fresh']} fresh, "
+               f"{counters['revalidated']} revalidated, {counters['stale']} stale, {counters['fetched']} fetched, "
+               f"{counters['errors']} cache errors")
+    print(message)
+    logging.info(message)
+
+def write_combined(df_list, combined_csv_folder, helmet=False, store=True, run_id=None):
+    """
+    Write the combined CSV of a run, named after its run id, and add it to the
+    price store and pivots under the same id. Without a run id (combining
+    outside a journaled run) a new one is taken from the clock.
+    """
+    run_id = run_id or new_run_id()
+    combined_df = pd.concat(df_list, ignore_index=True)
+    if helmet:
+        combined_df.sort_values("HELMET NAME" if "HELMET NAME" in combined_df.columns else "BRAND", inplace=True, kind="mergesort")
+    else:
+        combined_df.sort_values("PRODUCT NAME", inplace=True, kind="mergesort")
+    prefix = "helmet_combined" if helmet else "combined"
+    combined_filename = os.path.join(combined_csv_folder, f"{prefix}_{run_id}.csv")
+    combined_df.to_csv(combined_filename, index=False)
+    if store:
+        try:
+            # Same id as the CSV, journal and page archive, so all of a run can be joined up.
+            stored = store_combined(combined_df, "helmets" if helmet else "welders", run_id)
+            if stored:
+                logging.info(f"Stored {combined_filename} as {stored}")
+        except Exception as e:
+            print(f"Could not add {combined_filename} to the price store: {e}")
+            logging.error(f"Could not add {combined_filename} to the price store: {e}")
+        try:
+            # The dashboard loads this instead of pivoting the run on every rerun.
+            write_pivot(combined_df, "helmets" if helmet else "welders", run_id)
+        except Exception as e:
+            logging.error(f"Could not write the comparison table for {combined_filename}: {e}")
+    return combined_filename
+
+def log_throttle_stats():
+    # A shop that throttled us, or that we gave up on, is not the same as a page with no price.
+    for host, counters in sorted(throttle_stats().items()):
+        if not (counters['throttled'] or counters['retries'] or counters['gave_up']):
+            continue
+        message = (f"Rate limit {host}: {counters['requests']} requests, {counters['throttled']} throttled, "
+                   f"{counters['retries']} retries, {counters['gave_up']} given up, "
+                   f"settled at {counters['rate']} req/s")
+        print(message)
+        logging.warning(message)
+
+def write_company_csv(scraper, df_company, scraper_output_folder, helmet=False) -> str:
+    prefix = "HELMET_" if helmet else ""
+    filename = os.path.join(scraper_output_folder, f"{prefix}{scraper.name.replace(' ', '_')}.csv")
+    df_company.to_csv(filename, index=False)
+    # Log any URLs with missing price
+    missing_prices = df_company[df_company[scraper.price_column].isna()]
+    label = "Missing Helmet Price" if helmet else "Missing Price"
+    for _, row in missing_prices.iterrows():
+        url = row['PRODUCT LINK']
+        logging.info(f"{label} - {scraper.name},{url}")
+    return filename
+
+def select_work(catalogues, shops=None, shard=None):
+    """
+    Narrow (df, scrapers, helmet) catalogues to the named shops (matched
+    case-insensitively, helmet scrapers by their shop's name) and to one shard.
+    """
+    wanted = {shop.upper() for shop in shops} if shops else None
+    selected = []
+    for df, scrapers, helmet in catalogues:
+        if wanted is not None:
+            scrapers = [scraper for scraper in scrapers if getattr(scraper, "source", scraper).name.upper() in wanted]
+        if shard is not None:
+            scrapers = shard.select_scrapers(scrapers)
+            df = shard.select_rows(df)
+        selected.append((df, scrapers, helmet))
+    return selected
+
+def scrape_catalogues(catalogues, scraper_output_folder, combined_csv_folder, incremental=False, journal=None,
+                      workers=config.MAX_WORKERS, shops=None, shard=None, run_id=None):
+    """
+    Scrape one or more (df, scrapers, helmet) catalogues in a single pass.
+
+    Every link of every catalogue is planned up front and each shop fetches a
+    distinct url once; the prices are then fanned back out to all rows that
+    reference it, and per-company and combined CSVs are written as before.
+
+    With incremental=True, rows whose price in the newest combined CSV is
+    present, recent and for an unchanged catalogue row are carried over, and
+    only the rest are fetched.
+
+    Every price is checkpointed in a run journal as it arrives; pass the
+    journal of an unfinished run to resume it.
+
+    shops and shard narrow the run (see select_work); a sharded run writes
+    its per-company and combined CSVs into a shard_K_of_N subfolder of each
+    output folder so that shards running side by side never overwrite each
+    other.
+
+    Returns a summary dict of the run, suitable for JSON output.
+    """
     start = time.time()
-    df_company = scraper.scrape(df_sub)
-    elapsed = time.time() - start
-    return df_company, elapsed
+    if journal is None:
+        run_id = run_id or new_run_id()
+        journal = RunJournal(run_id if shard is None else f"{run_id}_{shard.tag}")
+        journal.set_meta(
+            catalogues=["helmets" if helmet else "welders" for _, _, helmet in catalogues],
+            incremental=incremental,
+            shops=list(shops) if shops else None,
+            shard=str(shard) if shard is not None else None,
+            shard_by=shard.key if shard is not None else None,
+        )
+    message = f"Run {journal.run_id} (resume with: python scraper_script.py resume {journal.run_id})"
+    print(message)
+    logging.info(message)
+    catalogues = select_work(catalogues, shops, shard)
+    # Incremental runs compare against the shared combined CSVs, but shards write their own.
+    output_folder, combined_output_folder = scraper_output_folder, combined_csv_folder
+    if shard is not None:
+        output_folder = os.path.join(scraper_output_folder, shard.tag)
+        combined_output_folder = os.path.join(combined_csv_folder, shard.tag)
+        os.makedirs(output_folder, exist_ok=True)
+        os.makedirs(combined_output_folder, exist_ok=True)
+        # The shard folder holds this run's companies only, so merge_shards never picks up a stale one.
+        for filename in os.listdir(output_folder):
+            if filename.endswith(".csv"):
+                os.remove(os.path.join(output_folder, filename))
+    plan = FetchPlan()
+    company_rows = []
+    for df, scrapers, helmet in catalogues:
+        previous = None
+        if incremental:
+            previous_file = latest_combined(combined_csv_folder, helmet)
+            if previous_file:
+                previous = load_previous(previous_file)
+                print(f"Incremental run: reusing fresh prices from {previous_file}")
+            else:
+                print("Incremental run: no previous combined CSV, scraping every row")
+        rows = []
+        for scraper in scrapers:
+            df_company = scraper.matching_rows(df).copy()
+            reused, stale = split_stale(df_company, previous, df.columns, scraper.price_column, scraper.output_columns)
+            plan.add(scraper, stale)
+            rows.append((scraper, reused, stale))
+        company_rows.append((rows, helmet))
+    message = f"Fetch plan: {plan.references} links, {plan.unique_count()} unique urls to fetch"
+    print(message)
+    logging.info(message)
 
-def scrape_all(df_sub, scrapers, scraper_output_folder, combined_csv_folder):
-    df_list = []
-    scraper_times = {}
-    # Use ThreadPoolExecutor to run scrapers concurrently.
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_scraper = {executor.submit(timed_scrape, scraper, df_sub): scraper for scraper in scrapers}
-        for future in concurrent.futures.as_completed(future_to_scraper):
-            scraper = future_to_scraper[future]
-            try:
-                df_company, elapsed = future.result()
-                scraper_times[scraper.name] = elapsed
-            except Exception as e:
-                print(f"{scraper.name} generated an exception: {e}")
+    # Shops are split into chunks and run most expensive first; see scheduler.py.
+    prices, durations, errors = plan.run(workers=workers, journal=journal)
+    for name, e in errors.items():
+        print(f"{name} generated an exception: {e}")
+        logging.error(f"{name} generated an exception: {e}")
+
+    scraped_at = now_stamp()
+    shop_summaries = {}
+    combined_files = []
+    for rows, helmet in company_rows:
+        df_list = []
+        for scraper, reused, stale in rows:
+            if getattr(scraper, "source", scraper).name in errors:
+                continue
+            refreshed = replay_fill(scraper, stale, prices)
+            refreshed[SCRAPED_AT] = scraped_at
+            if reused.empty:
+                df_company = refreshed
             else:
-                df_list.append(df_company)
-                filename = os.path.join(scraper_output_folder, f"{scraper.name.replace(' ', '_')}.csv")
-                df_company.to_csv(filename, index=False)
-                # Log any URLs with missing price
-                missing_prices = df_company[df_company['Price'].isna()]
-                for _, row in missing_prices.iterrows():
-                    url = row['PRODUCT LINK']
-                    logging.info(f"Missing Price - {scraper.name},{url}")
-            if hasattr(scraper, 'close'):
-                scraper.close()
-    # Print and log elapsed time for each company
-    for company, elapsed in scraper_times.items():
-        message = f"{company} took {elapsed:.2f} seconds."
+                # Put carried-over and refreshed rows back in catalogue order.
+                df_company = pd.concat([reused, refreshed]).sort_index()
+            scraper.df = df_company
+            scraper.stats = scraper.compute_stats(df_company)
+            df_list.append(df_company)
+            missing = int(df_company[scraper.price_column].isna().sum())
+            shop_summaries[scraper.name] = {
+                "rows": len(df_company),
+                "prices": len(df_company) - missing,
+                "missing": missing,
+                "refreshed": len(refreshed),
+                "seconds": round(durations.get(getattr(scraper, "source", scraper).name, 0.0), 2),
+            }
+            write_company_csv(scraper, df_company, output_folder, helmet)
+        if df_list:
+            # A shard's combined CSV is partial; merge_shards stores the full run.
+            combined_filename = write_combined(df_list, combined_output_folder, helmet, store=shard is None,
+                                               run_id=journal.run_id)
+            combined_files.append(combined_filename)
+            kind = "helmets" if helmet else "welders"
+            print(f"Scraped all companies for {kind}. Combined CSV saved as {combined_filename}")
+        else:
+            print("No helmet data scraped." if helmet else "No data scraped.")
+
+    # Print and log elapsed time for each shop
+    for company, elapsed in durations.items():
+        message = f"{company} took {elapsed:.2f} seconds for {plan.fetched.get(company, 0)} urls."
         print(message)
         logging.info(message)
-    if df_list:
-        combined_df = pd.concat(df_list, ignore_index=True)
-        combined_df.sort_values("PRODUCT NAME", inplace=True)
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        combined_filename = os.path.join(combined_csv_folder, f"combined_{timestamp}.csv")
-        combined_df.to_csv(combined_filename, index=False)
-        print(f"Scraped all companies. Combined CSV saved as {combined_filename}")
-    else:
-        print("No data scraped.")
+    log_pool_stats()
+    log_throttle_stats()
+    log_page_timings()
+    log_fetch_paths()
+    journal.finish()
+    journal.close()
+    return {
+        "run_id": journal.run_id,
+        "catalogues": ["helmets" if helmet else "welders" for _, helmet in company_rows],
+        "incremental": incremental,
+        "shard": str(shard) if shard is not None else None,
+        "shard_by": shard.key if shard is not None else None,
+        "links": plan.references,
+        "unique_urls": plan.unique_count(),
+        "shops": shop_summaries,
+        "errors": {name: str(e) for name, e in errors.items()},
+        "combined_files": combined_files,
+        "seconds": round(time.time() - start, 2),
+    }
+
+def scrape_all(df_sub, scrapers, scraper_output_folder, combined_csv_folder, incremental=False):
+    return scrape_catalogues([(df_sub, scrapers, False)], scraper_output_folder, combined_csv_folder, incremental)
+
+def scrape_everything(df_sub, welder_scrapers, helmet_df_sub, helmet_scrapers, scraper_output_folder, combined_csv_folder):
+    # Urls shared by the welder and helmet sheets are fetched once for both.
+    return scrape_catalogues(
+        [(df_sub, welder_scrapers, False), (helmet_df_sub, helmet_scrapers, True)],
+        scraper_output_folder,
+        combined_csv_folder,
+    )
+
+def resume_run(run_id, df_sub, welder_scrapers, helmet_df_sub, helmet_scrapers, scraper_output_folder, combined_csv_folder):
+    """Continue a scrape_all / scrape_helmets / scrape_everything run from its journal."""
+    journal = open_journal(run_id)
+    meta = journal.meta()
+    if meta.get("finished"):
+        print(f"Run {run_id} already finished at {meta['finished']}; rebuilding its output from the journal.")
+    catalogues = []
+    for name in meta.get("catalogues", ["welders"]):
+        if name == "helmets":
+            if helmet_df_sub is None:
+                print("Run includes helmets but the helmet data could not be loaded.")
+                journal.close()
+                return None
+            catalogues.append((helmet_df_sub, helmet_scrapers, True))
+        else:
+            catalogues.append((df_sub, welder_scrapers, False))
+    # A resumed run covers the same shops and shard as the run it continues.
+    shard = Shard.parse(meta["shard"], meta.get("shard_by") or "shop") if meta.get("shard") else None
+    return scrape_catalogues(catalogues, scraper_output_folder, combined_csv_folder,
+                             incremental=meta.get("incremental", False), journal=journal,
+                             shops=meta.get("shops"), shard=shard)
 
 def scrape_single(df_sub, scraper, scraper_output_folder):
     start = time.time()
@@ -822,10 +782,8 @@ def scrape_single(df_sub, scraper, scraper_output_folder):
     for _, row in missing_prices.iterrows():
         url = row['PRODUCT LINK']
         logging.info(f"Missing Price - {scraper.name},{url}")
-    print(f"{scraper.name} took {elapsed:.2f} seconds.")
-    logging.info(f"{scraper.name} took {elapsed:.2f} seconds.")
-    if hasattr(scraper, 'close'):
-        scraper.close()
+    print(f"{scraper.name} took {elapsed:.2f} seconds for {len(df_company)} rows.")
+    logging.info(f"{scraper.name} took {elapsed:.2f} seconds for {len(df_company)} rows.")
     print(f"{scraper.name} data scraped and saved as {filename}")
 
 def scrape_single_helmet(helmet_df_sub, scraper, scraper_output_folder):
@@ -841,11 +799,9 @@ def scrape_single_helmet(helmet_df_sub, scraper, scraper_output_folder):
         url = row['PRODUCT LINK']
         logging.info(f"Missing Helmet Price - {scraper.name},{url}")
     
-    print(f"{scraper.name} took {elapsed:.2f} seconds.")
-    logging.info(f"{scraper.name} took {elapsed:.2f} seconds.")
+    print(f"{scraper.name} took {elapsed:.2f} seconds for {len(df_company)} rows.")
+    logging.info(f"{scraper.name} took {elapsed:.2f} seconds for {len(df_company)} rows.")
     
-    if hasattr(scraper, 'close'):
-        scraper.close()
     
     print(f"{scraper.name} data scraped and saved as {filename}")
 
@@ -864,55 +820,13 @@ def combine_csv(scrapers, scraper_output_folder, combined_csv_folder):
         combined_filename = os.path.join(combined_csv_folder, f"combined_{timestamp}.csv")
         combined_df.to_csv(combined_filename, index=False)
         print(f"CSV files combined into {combined_filename}")
+        return combined_filename
     else:
         print("No CSV files found to combine.")
+        return None
 
-def scrape_helmets(helmet_df_sub, scrapers, scraper_output_folder, combined_csv_folder):
-    helmet_df_list = []
-    scraper_times = {}
-    
-    with concurrent.futures.ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_scraper = {executor.submit(timed_scrape, scraper, helmet_df_sub): scraper for scraper in scrapers}
-        
-        for future in concurrent.futures.as_completed(future_to_scraper):
-            scraper = future_to_scraper[future]
-            try:
-                df_company, elapsed = future.result()
-                scraper_times[scraper.name] = elapsed
-            except Exception as e:
-                print(f"HELMET {scraper.name} generated an exception: {e}")
-                logging.error(f"HELMET {scraper.name} generated an exception: {e}")
-            else:
-                helmet_df_list.append(df_company)
-                filename = os.path.join(scraper_output_folder, f"HELMET_{scraper.name.replace(' ', '_')}.csv")
-                df_company.to_csv(filename, index=False)
-                
-                # Log any URLs with missing price
-                missing_prices = df_company[df_company['Helmet_Price'].isna()]
-                for _, row in missing_prices.iterrows():
-                    url = row['PRODUCT LINK']
-                    logging.info(f"Missing Helmet Price - {scraper.name},{url}")
-            
-            if hasattr(scraper, 'close'):
-                scraper.close()
-    
-    # Print and log elapsed time for each company
-    for company, elapsed in scraper_times.items():
-        message = f"HELMET {company} took {elapsed:.2f} seconds."
-        print(message)
-        logging.info(message)
-    
-    if helmet_df_list:
-        helmet_combined_df = pd.concat(helmet_df_list, ignore_index=True)
-        helmet_combined_df.sort_values("HELMET NAME" if "HELMET NAME" in helmet_combined_df.columns else "BRAND", inplace=True)
-        
-        timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        combined_filename = os.path.join(combined_csv_folder, f"helmet_combined_{timestamp}.csv")
-        helmet_combined_df.to_csv(combined_filename, index=False)
-        
-        print(f"Scraped all companies for helmets. Combined CSV saved as {combined_filename}")
-    else:
-        print("No helmet data scraped.")
+def scrape_helmets(helmet_df_sub, scrapers, scraper_output_folder, combined_csv_folder, incremental=False):
+    return scrape_catalogues([(helmet_df_sub, scrapers, True)], scraper_output_folder, combined_csv_folder, incremental)
 
 def combine_helmet_csv(scrapers, scraper_output_folder, combined_csv_folder):
     dfs = []
@@ -931,96 +845,278 @@ def combine_helmet_csv(scrapers, scraper_output_folder, combined_csv_folder):
         combined_df.to_csv(combined_filename, index=False)
         
         print(f"Helmet CSV files combined into {combined_filename}")
+        return combined_filename
     else:
         print("No helmet CSV files found to combine.")
+        return None
+
+# ------------------------- Sharded runs -------------------------
+
+# Row order of merged shard output, so the result doesn't depend on which shard finished first.
+MERGE_SORT_COLUMNS = ("PRODUCT NAME", "HELMET NAME", "BRAND", "PRODUCT SKU", "HELMET SKU", "Shop Name", "PRODUCT LINK")
+
+def sort_for_merge(df: pd.DataFrame) -> pd.DataFrame:
+    columns = [column for column in MERGE_SORT_COLUMNS if column in df.columns]
+    if not columns:
+        return df.reset_index(drop=True)
+    return df.sort_values(columns, kind="mergesort", na_position="last").reset_index(drop=True)
+
+def merge_shards(count, scraper_output_folder, combined_csv_folder, run_id=None):
+    """
+    Merge the per-company CSVs written by the N shards of a run (into their
+    shard_K_of_N folders) back into scraper_output_folder, and write one
+    combined CSV per catalogue. The output is the same whatever the number of
+    shards, the shard key, or the order the shards finished in. run_id is the
+    id the shards' journals were started under, without the shard suffix.
+
+    Returns the combined file names, or None if a shard's folder is missing.
+    """
+    folders = [os.path.join(scraper_output_folder, tag) for tag in Shard.tags(count)]
+    missing = [folder for folder in folders if not os.path.isdir(folder)]
+    if missing:
+        message = f"Cannot merge {count} shards, missing output: {', '.join(missing)}"
+        print(message)
+        logging.error(message)
+        return None
+    parts = defaultdict(list)
+    for folder in folders:
+        for filename in sorted(os.listdir(folder)):
+            if filename.endswith(".csv"):
+                # As text, so prices are written back exactly as the shard wrote them.
+                parts[filename].append(pd.read_csv(os.path.join(folder, filename), dtype=str))
+    welder_frames, helmet_frames = [], []
+    for filename, frames in sorted(parts.items()):
+        df_company = sort_for_merge(pd.concat(frames, ignore_index=True))
+        df_company.to_csv(os.path.join(scraper_output_folder, filename), index=False)
+        (helmet_frames if filename.startswith("HELMET_") else welder_frames).append(df_company)
+    combined_files = []
+    for frames, helmet in ((welder_frames, False), (helmet_frames, True)):
+        if frames:
+            combined_filename = write_combined(frames, combined_csv_folder, helmet, run_id=run_id)
+            combined_files.append(combined_filename)
+            print(f"Merged {count} shards into {combined_filename}")
+    if not combined_files:
+        print(f"No shard output found to merge in {scraper_output_folder}.")
+    return combined_files
+
+def _strip_options(argv, options) -> list:
+    """Drop options that take a value (as --opt value or --opt=value) from an argv list."""
+    kept = []
+    skip = False
+    for arg in argv:
+        if skip:
+            skip = False
+            continue
+        if arg.split("=", 1)[0] in options:
+            skip = "=" not in arg
+            continue
+        kept.append(arg)
+    return kept
+
+def run_children(argvs) -> list:
+    """
+    Run this script once per argv list, all at the same time, each writing a
+    JSON summary. Returns [(exit code, summary or None)] in argvs order.
+    """
+    script = os.path.abspath(__file__)
+    results = []
+    with tempfile.TemporaryDirectory() as summary_folder:
+        children = []
+        for index, argv in enumerate(argvs, start=1):
+            summary_path = os.path.join(summary_folder, f"child_{index}.json")
+            command = [sys.executable, script, *argv, "--json", summary_path]
+            children.append((subprocess.Popen(command, stdout=sys.stdout), summary_path))
+        for process, summary_path in children:
+            code = process.wait()
+            summary = None
+            if os.path.exists(summary_path):
+                with open(summary_path, encoding="utf-8") as summary_file:
+                    summary = json.load(summary_file)
+            results.append((code, summary))
+    return results
+
+def scrape_in_processes(argv, count, shard_by, scraper_output_folder, combined_csv_folder):
+    """
+    Run `scrape` with the given arguments as `count` child processes, one per
+    shard, then merge their output. Each process parses with its own
+    interpreter, so lxml parsing is no longer serialised by the GIL and every
+    process has its own browser pool.
+    """
+    start = time.time()
+    # Every shard journals under this id plus its shard suffix, and the merged output under this id.
+    run_id = new_run_id()
+    print(f"Starting {count} shard processes for run {run_id}")
+    results = run_children([[*argv, "--shard", f"{index}/{count}", "--shard-by", shard_by, "--run-id", run_id]
+                            for index in range(1, count + 1)])
+    errors = {}
+    for index, (code, summary) in enumerate(results, start=1):
+        if summary is None:
+            errors[f"shard {index}/{count}"] = f"exited with code {code} without a summary"
+        else:
+            errors.update(summary.get("errors", {}))
+    combined_files = merge_shards(count, scraper_output_folder, combined_csv_folder, run_id=run_id)
+    return {
+        "run_id": run_id,
+        "processes": count,
+        "shard_by": shard_by,
+        "shards": [summary for _, summary in results],
+        "errors": errors,
+        "combined_files": combined_files or [],
+        "seconds": round(time.time() - start, 2),
+    }
+
+# ------------------------- Work queue -------------------------
+
+def fill_queue(queue, catalogues, catalog, shops=None):
+    """Replace the queue's tasks with every distinct url of the selected catalogues."""
+    plan = FetchPlan()
+    for df, scrapers, helmet in select_work(catalogues, shops):
+        for scraper in scrapers:
+            plan.add(scraper, scraper.matching_rows(df))
+    queue.reset(catalog=catalog, shops=list(shops) if shops else None, filled_at=now_stamp())
+    for name, urls in sorted(plan.urls.items()):
+        queue.enqueue(name, sorted(urls))
+    message = f"Queued {plan.unique_count()} urls from {plan.references} links in {queue.path}"
+    print(message)
+    logging.info(message)
+    return {"queue": queue.path, "tasks": plan.unique_count(), "shops": {name: len(urls) for name, urls in sorted(plan.urls.items())}}
+
+def collect_queue(queue, catalogues, scraper_output_folder, combined_csv_folder):
+    """
+    Write per-company and combined CSVs, in the same format scrape_catalogues
+    writes, from the prices workers have put in the queue. Urls still
+    outstanding or failed come out without a price.
+    """
+    meta = queue.meta()
+    prices = queue.prices()
+    scraped_at = now_stamp()
+    shop_summaries = {}
+    combined_files = []
+    for df, scrapers, helmet in select_work(catalogues, meta.get("shops")):
+        df_list = []
+        for scraper in scrapers:
+            df_company = replay_fill(scraper, scraper.matching_rows(df).copy(), prices)
+            df_company[SCRAPED_AT] = scraped_at
+            write_company_csv(scraper, df_company, scraper_output_folder, helmet)
+            df_list.append(df_company)
+            missing = int(df_company[scraper.price_column].isna().sum())
+            shop_summaries[scraper.name] = {"rows": len(df_company), "prices": len(df_company) - missing, "missing": missing}
+        if df_list:
+            combined_filename = write_combined(df_list, combined_csv_folder, helmet)
+            combined_files.append(combined_filename)
+            print(f"Collected queue {queue.path} into {combined_filename}")
+    return {"queue": queue.path, "tasks": queue.counts(), "shops": shop_summaries, "combined_files": combined_files}
+
+# ------------------------- Re-parse stored pages -------------------------
+
+def _reparse_batch(reparse, batch):
+    # Runs in a worker process; batch is a list of {kind: html} dicts for one shop.
+    prices = []
+    for pages in batch:
+        try:
+            prices.append(reparse(pages))
+        except Exception:
+            prices.append(np.nan)
+    return prices
+
+def reparse_run(run_id, df_sub, scrapers, combined_csv_folder, helmet=False, batch_size=50):
+    """
+    Re-extract every price of an archived run from its stored pages, in
+    parallel across processes, and write a new combined CSV. Nothing is fetched;
+    urls that were not archived come back without a price.
+    """
+    start = time.time()
+    archive = open_run(run_id)
+    plan = FetchPlan()
+    company_rows = []
+    for scraper in scrapers:
+        rows = scraper.matching_rows(df_sub).copy()
+        plan.add(scraper, rows)
+        company_rows.append((scraper, rows))
+    stored = archive.pages(url for urls in plan.urls.values() for url in urls)
+    archive.close()
+
+    prices = {}
+    with concurrent.futures.ProcessPoolExecutor(max_workers=config.REPARSE_WORKERS) as executor:
+        futures = {}
+        for name, urls in plan.urls.items():
+            urls = sorted(url for url in urls if url in stored)
+            for i in range(0, len(urls), batch_size):
+                batch = urls[i:i + batch_size]
+                future = executor.submit(_reparse_batch, plan.sources[name].reparse_price, [stored[url] for url in batch])
+                futures[future] = (name, batch)
+        for future in concurrent.futures.as_completed(futures):
+            name, batch = futures[future]
+            prices.update({(name, url): price for url, price in zip(batch, future.result())})
+
+    # Stored pages are as old as the run that fetched them.
+    try:
+        scraped_at = datetime.datetime.strptime(run_id[:15], "%Y%m%d_%H%M%S").strftime(TIMESTAMP_FORMAT)
+    except ValueError:
+        scraped_at = None
+    df_list = []
+    for scraper, rows in company_rows:
+        df_company = replay_fill(scraper, rows, prices)
+        df_company[SCRAPED_AT] = scraped_at
+        missing = df_company[scraper.price_column].isna().sum()
+        print(f"{scraper.name}: re-parsed {len(df_company) - missing}/{len(df_company)} prices")
+        df_list.append(df_company)
+
+    if not df_list:
+        print("No data re-parsed.")
+        return None
+    # Under the run's own id: the re-parsed prices replace that run's combined CSV and stored history.
+    combined_filename = write_combined(df_list, combined_csv_folder, helmet, run_id=run_id)
+    message = f"Re-parsed run {run_id} in {time.time() - start:.2f} seconds. Combined CSV saved as {combined_filename}"
+    print(message)
+    logging.info(message)
+    return combined_filename
+
+def choose_archived_run():
+    runs = list_runs()
+    if not runs:
+        print("No archived runs found.")
+        return None
+    print("\nSelect an archived run to re-parse:")
+    for idx, run_id in enumerate(runs, start=1):
+        print(f"{idx}. {run_id}")
+    choice = input(f"Enter run number (default {len(runs)}): ").strip()
+    if not choice:
+        return runs[-1]
+    try:
+        return runs[int(choice) - 1]
+    except (ValueError, IndexError):
+        print("Invalid run number.")
+        return None
 
-def main_with_helmets():
-    scraper_output_folder = "scraper_output"
-    combined_csv_folder = "combined_csv"
+def main_with_helmets(resume=None):
+    scraper_output_folder = SCRAPER_OUTPUT_FOLDER
+    combined_csv_folder = COMBINED_CSV_FOLDER
     os.makedirs(scraper_output_folder, exist_ok=True)
     os.makedirs(combined_csv_folder, exist_ok=True)
     
-    input_file = "Pricing.xlsx"
-    
-    df_sub = read_and_prepare_df(input_file)
-    
-    try:
-        helmet_df_sub = read_and_prepare_helmet_df()
-        helmets_available = True
-        print("\nHelmets data sample:")
-        print(helmet_df_sub.head())
-    except Exception as e:
-        helmets_available = False
-        print(f"Error loading helmet data: {e}")
-        logging.error(f"Error loading helmet data: {e}")
-    
-    print("Welders data sample:")
-    print(df_sub.head())
+    # Nothing is read, imported or started until a menu option needs it.
+    catalogues = Catalogues()
+    registry = ScraperRegistry()
+    helmets_available = catalogues.helmets_available
+    if not helmets_available:
+        print(f"Helmet data not found: {catalogues.helmet_file}")
+        logging.error(f"Helmet data not found: {catalogues.helmet_file}")
     
-    # Create scrapers for welders
-    welder_scrapers = [
-        ElectroweldEbayScraper(),
-        HampdonEbayScraper(),
-        WAIndustrialSuppliesEbayScraper(),
-        NationalWeldingEbayScraper(),
-        BilbaEbayScraper(),
-        ElectroweldScraper(),
-        BilbaScraper(),
-        GentronicsScraper(),
-        WeldComAuScraper(), 
-        WeldConnectScraper(),
-        MetweldScraper(), 
-        ToolkitDepotScraper(), 
-        SupercheapAutoScraper(),
-        ToolsWarehouseScraper(), 
-        VekToolsScraper(), 
-        KennedysScraper(),
-        TotalToolsScraper(), 
-        WAIndustrialScraper(), 
-        SydneyToolsScraper(),
-        HareAndForbesScraper(), 
-        AlphaweldScraper(), 
-        HampdonScraper(),
-        NationalWeldingScraper(), 
-        PrimeSuppliesScraper(),
-        StaffordWeldingScraper(),
-        GasweldScraper(),
-        WeldquipScraper(),
-        ToolKingScraper(),
-        TradeToolsScraper(),
-        AustraliaIndustrialGroupScraper()
-    ]
-    
-    helmet_scrapers = []
-    if helmets_available:
-        for scraper_class in [ElectroweldScraper, BilbaScraper, 
-                         GentronicsScraper, WeldComAuScraper, WeldConnectScraper,
-                         MetweldScraper, ToolkitDepotScraper, SupercheapAutoScraper,
-                         ToolsWarehouseScraper, VekToolsScraper, KennedysScraper,
-                         TotalToolsScraper, WAIndustrialScraper, SydneyToolsScraper,
-                         HareAndForbesScraper, AlphaweldScraper, HampdonScraper,
-                         NationalWeldingScraper, PrimeSuppliesScraper, 
-                         StaffordWeldingScraper, GasweldScraper, WeldquipScraper,
-                         ToolKingScraper, TradeToolsScraper, AustraliaIndustrialGroupScraper]:
-        # Create a new instance using the same pattern but with HelmetCompanyScraper as base
-            original = scraper_class()
-        # Create helmet scraper with name and pattern
-            helmet_scraper = HelmetCompanyScraper(name=original.name, pattern=original.pattern)
-        # We don't need to set name and pattern again since we passed them to the constructor
-            helmet_scraper.get_price = original.get_price  # Reuse the same price extractor
-            if hasattr(original, 'driver'):
-                helmet_scraper.driver = original.driver
-            if hasattr(original, 'close'):
-                    helmet_scraper.close = original.close
-        
-            helmet_scrapers.append(helmet_scraper)
+    if resume:
+        resume_run(resume, catalogues.welders(), registry.welder_scrapers(),
+                   catalogues.helmets() if helmets_available else None,
+                   registry.helmet_scrapers(), scraper_output_folder, combined_csv_folder)
+        close_driver_pool()
+        return
     
     while True:
         print("\nMAIN MENU")
         print("1. Welder Scraping")
         if helmets_available:
             print("2. Helmet Scraping")
-        print("3. Exit")
+            print("3. Scrape everything (welders and helmets)")
+        print("4. Exit")
         main_choice = input("Enter option: ").strip()
         
         if main_choice == "1":
@@ -1030,27 +1126,35 @@ def main_with_helmets():
                 print("1. Scrape all welders")
                 print("2. Choose a company to scrape for welders")
                 print("3. Create new welders combined.csv")
-                print("4. Back to main menu")
+                print("4. Re-parse stored pages from a previous run")
+                print("5. Refresh only missing or stale welder prices")
+                print("6. Back to main menu")
                 choice = input("Enter option: ").strip()
                 
                 if choice == "1":
-                    scrape_all(df_sub, welder_scrapers, scraper_output_folder, combined_csv_folder)
+                    scrape_all(catalogues.welders(), registry.welder_scrapers(), scraper_output_folder, combined_csv_folder)
                 elif choice == "2":
                     print("\nSelect a company to scrape for welders:")
-                    for idx, scraper in enumerate(welder_scrapers, start=1):
+                    for idx, scraper in enumerate(registry.welder_scrapers(), start=1):
                         print(f"{idx}. {scraper.name}")
                     comp_choice = input("Enter company number: ").strip()
                     try:
                         comp_idx = int(comp_choice) - 1
-                        if 0 <= comp_idx < len(welder_scrapers):
-                            scrape_single(df_sub, welder_scrapers[comp_idx], scraper_output_folder)
+                        if 0 <= comp_idx < len(registry.welder_scrapers()):
+                            scrape_single(catalogues.welders(), registry.welder_scrapers()[comp_idx], scraper_output_folder)
                         else:
                             print("Invalid company number.")
                     except ValueError:
                         print("Invalid input. Please enter a number.")
                 elif choice == "3":
-                    combine_csv(welder_scrapers, scraper_output_folder, combined_csv_folder)
+                    combine_csv(registry.welder_scrapers(), scraper_output_folder, combined_csv_folder)
                 elif choice == "4":
+                    run_id = choose_archived_run()
+                    if run_id:
+                        reparse_run(run_id, catalogues.welders(), registry.welder_scrapers(), combined_csv_folder)
+                elif choice == "5":
+                    scrape_all(catalogues.welders(), registry.welder_scrapers(), scraper_output_folder, combined_csv_folder, incremental=True)
+                elif choice == "6":
                     break
                 else:
                     print("Invalid option. Try again.")
@@ -1062,37 +1166,322 @@ def main_with_helmets():
                 print("1. Scrape all helmets")
                 print("2. Choose a company to scrape for helmets")
                 print("3. Create new helmets combined.csv")
-                print("4. Back to main menu")
+                print("4. Re-parse stored pages from a previous run")
+                print("5. Refresh only missing or stale helmet prices")
+                print("6. Back to main menu")
                 choice = input("Enter option: ").strip()
                 
                 if choice == "1":
-                    scrape_helmets(helmet_df_sub, helmet_scrapers, scraper_output_folder, combined_csv_folder)
+                    scrape_helmets(catalogues.helmets(), registry.helmet_scrapers(), scraper_output_folder, combined_csv_folder)
                 elif choice == "2":
                     print("\nSelect a company to scrape for helmets:")
-                    for idx, scraper in enumerate(helmet_scrapers, start=1):
+                    for idx, scraper in enumerate(registry.helmet_scrapers(), start=1):
                         print(f"{idx}. {scraper.name}")
                     comp_choice = input("Enter company number: ").strip()
                     try:
                         comp_idx = int(comp_choice) - 1
-                        if 0 <= comp_idx < len(helmet_scrapers):
-                            scrape_single_helmet(helmet_df_sub, helmet_scrapers[comp_idx], scraper_output_folder)
+                        if 0 <= comp_idx < len(registry.helmet_scrapers()):
+                            scrape_single_helmet(catalogues.helmets(), registry.helmet_scrapers()[comp_idx], scraper_output_folder)
                         else:
                             print("Invalid company number.")
                     except ValueError:
                         print("Invalid input. Please enter a number.")
                 elif choice == "3":
-                    combine_helmet_csv(helmet_scrapers, scraper_output_folder, combined_csv_folder)
+                    combine_helmet_csv(registry.helmet_scrapers(), scraper_output_folder, combined_csv_folder)
                 elif choice == "4":
+                    run_id = choose_archived_run()
+                    if run_id:
+                        reparse_run(run_id, catalogues.helmets(), registry.helmet_scrapers(), combined_csv_folder, helmet=True)
+                elif choice == "5":
+                    scrape_helmets(catalogues.helmets(), registry.helmet_scrapers(), scraper_output_folder, combined_csv_folder, incremental=True)
+                elif choice == "6":
                     break
                 else:
                     print("Invalid option. Try again.")
         
-        elif main_choice == "3":
+        elif main_choice == "3" and helmets_available:
+            scrape_everything(catalogues.welders(), registry.welder_scrapers(), catalogues.helmets(), registry.helmet_scrapers(), scraper_output_folder, combined_csv_folder)
+        
+        elif main_choice == "4":
             print("Exiting.")
+            close_driver_pool()
             break
         
         else:
             print("Invalid option. Try again.")       
 
+# ------------------------- Command line -------------------------
+
+# Exit codes for cron and CI.
+EXIT_OK = 0
+EXIT_SHOP_ERRORS = 1  # the run finished but at least one shop raised
+EXIT_USAGE = 2        # bad arguments; argparse exits with 2 as well
+EXIT_NO_DATA = 3      # nothing was scraped or combined
+
+CATALOGUE_CHOICES = ("welders", "helmets", "all")
+
+def bench(catalogues, repeat=3, workers=config.MAX_WORKERS, shops=None, shard=None):
+    """
+    Fetch and parse the selected urls `repeat` times without writing any CSV,
+    journal or archive, and report how long each pass took. The response
+    cache is off, so every pass goes to the network rather than timing
+    SQLite reads after the first.
+    """
+    config.ARCHIVE_PAGES = 0
+    config.HTTP_CACHE = 0
+    passes = []
+    errors = {}
+    for number in range(1, repeat + 1):
+        plan = FetchPlan()
+        for df, scrapers, helmet in select_work(catalogues, shops, shard):
+            for scraper in scrapers:
+                plan.add(scraper, scraper.matching_rows(df))
+        start = time.time()
+        prices, durations, pass_errors = plan.run(workers=workers)
+        elapsed = time.time() - start
+        extracted = sum(1 for price in prices.values() if not pd.isna(price))
+        errors.update({name: str(e) for name, e in pass_errors.items()})
+        passes.append({
+            "pass": number,
+            "seconds": round(elapsed, 2),
+            "unique_urls": plan.unique_count(),
+            "prices": extracted,
+            "urls_per_second": round(plan.unique_count() / elapsed, 2) if elapsed else None,
+            "shops": {name: round(seconds, 2) for name, seconds in durations.items()},
+        })
+        print(f"Bench pass {number}: {plan.unique_count()} urls, {extracted} prices in {elapsed:.2f} seconds")
+    seconds = [result["seconds"] for result in passes]
+    return {
+        "passes": passes,
+        "best_seconds": min(seconds) if seconds else None,
+        "mean_seconds": round(sum(seconds) / len(seconds), 2) if seconds else None,
+        "errors": errors,
+    }
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Scrape competitor welder and helmet prices. Without a command, the interactive menu is shown.",
+    )
+    parser.add_argument("--resume", metavar="RUN_ID", help="continue an interrupted run from its journal (same as the resume command)")
+
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--output-dir", default=SCRAPER_OUTPUT_FOLDER, help="per-company CSV folder (default: %(default)s)")
+    common.add_argument("--combined-dir", default=COMBINED_CSV_FOLDER, help="combined CSV folder (default: %(default)s)")
+    common.add_argument("--json", metavar="PATH", help="write a JSON summary to PATH, or to stdout with '-' (other output then goes to stderr)")
+
+    selection = argparse.ArgumentParser(add_help=False)
+    selection.add_argument("--catalog", choices=CATALOGUE_CHOICES, default="welders", help="which catalogue to scrape (default: %(default)s)")
+    selection.add_argument("--shops", nargs="+", metavar="NAME", help="only these shops, by site profile name")
+    selection.add_argument("--workers", type=int, default=config.MAX_WORKERS, help="shops scraped at once (default: %(default)s)")
+    selection.add_argument("--shard", metavar="K/N", help="only the K-th of N disjoint slices of the catalogue")
+    selection.add_argument("--shard-by", choices=SHARD_KEYS, default="shop", help="split shards by shop or by url hash (default: %(default)s)")
+    selection.add_argument("--no-cache", action="store_true", help="bypass the HTTP response cache")
+
+    commands = parser.add_subparsers(dest="command", metavar="COMMAND")
+    scrape = commands.add_parser("scrape", parents=[common, selection], help="scrape a catalogue and write CSVs")
+    scrape.add_argument("--incremental", action="store_true", help="refresh only missing or stale prices")
+    scrape.add_argument("--processes", type=int, default=1, help="run N shards as separate processes and merge them (default: %(default)s)")
+    # Set by scrape --processes so that every shard process belongs to one run.
+    scrape.add_argument("--run-id", help=argparse.SUPPRESS)
+    combine = commands.add_parser("combine", parents=[common], help="combine existing per-company CSVs")
+    combine.add_argument("--catalog", choices=CATALOGUE_CHOICES, default="welders", help="which catalogue to combine (default: %(default)s)")
+    merge = commands.add_parser("merge", parents=[common], help="merge the output of an N-way sharded scrape")
+    merge.add_argument("--shards", type=int, required=True, help="number of shards the run was split into")
+    queue_options = argparse.ArgumentParser(add_help=False)
+    queue_options.add_argument("--queue", default=config.WORK_QUEUE_PATH, help="work queue file (default: %(default)s)")
+    queue_parser = commands.add_parser("queue", help="scrape through a work queue shared by worker processes")
+    queue_commands = queue_parser.add_subparsers(dest="queue_command", metavar="ACTION", required=True)
+    fill = queue_commands.add_parser("fill", parents=[common, queue_options], help="queue every url of a catalogue")
+    fill.add_argument("--catalog", choices=CATALOGUE_CHOICES, default="welders", help="which catalogue to queue (default: %(default)s)")
+    fill.add_argument("--shops", nargs="+", metavar="NAME", help="only these shops, by site profile name")
+    work = queue_commands.add_parser("work", parents=[common, queue_options], help="price queued urls until the queue is empty")
+    work.add_argument("--batch", type=int, default=10, help="urls leased at a time (default: %(default)s)")
+    work.add_argument("--processes", type=int, default=1, help="start N worker processes (default: %(default)s)")
+    work.add_argument("--no-cache", action="store_true", help="bypass the HTTP response cache")
+    collect = queue_commands.add_parser("collect", parents=[common, queue_options], help="write CSVs from the queued prices")
+    collect.add_argument("--wait", action="store_true", help="wait until no url is pending or leased")
+    queue_commands.add_parser("status", parents=[common, queue_options], help="count queued urls by status")
+    store_parser = commands.add_parser("store", help="the typed Parquet history of combined runs")
+    store_commands = store_parser.add_subparsers(dest="store_command", metavar="ACTION", required=True)
+    store_import = store_commands.add_parser("import", parents=[common], help="add existing combined CSVs to the store")
+    store_import.add_argument("files", nargs="+", help="combined_*.csv / helmet_combined_*.csv files")
+    store_commands.add_parser("runs", parents=[common], help="list the stored runs of each catalogue")
+    resume = commands.add_parser("resume", parents=[common], help="continue an interrupted run from its journal")
+    resume.add_argument("run_id", help="run id printed when the run started")
+    bench_parser = commands.add_parser("bench", parents=[common, selection], help="time fetching and parsing without writing output")
+    bench_parser.add_argument("--repeat", type=int, default=3, help="number of passes (default: %(default)s)")
+    prices_parser = commands.add_parser("prices", help="check the price parser against scraped price text")
+    prices_commands = prices_parser.add_subparsers(dest="prices_command", metavar="ACTION", required=True)
+    corpus_files = argparse.ArgumentParser(add_help=False)
+    corpus_files.add_argument("files", nargs="*", help="CSVs to take price text from (default: every scraper output and combined CSV)")
+    price_fuzz_parser = prices_commands.add_parser("fuzz", parents=[common, corpus_files], help="parse the corpus under many decorations and random junk")
+    price_fuzz_parser.add_argument("--seed", type=int, default=0, help="random seed (default: %(default)s)")
+    price_bench_parser = prices_commands.add_parser("bench", parents=[common, corpus_files], help="time parsing single prices and whole columns")
+    price_bench_parser.add_argument("--repeat", type=int, default=5, help="timed runs, best is reported (default: %(default)s)")
+    return parser
+
+def selected_catalogues(name, catalogues, registry) -> list:
+    """Return the (df, scrapers, helmet) list for a --catalog choice."""
+    selected = []
+    if name in ("welders", "all"):
+        selected.append((catalogues.welders(), registry.welder_scrapers(), False))
+    if name in ("helmets", "all"):
+        selected.append((catalogues.helmets(), registry.helmet_scrapers(), True))
+    return selected
+
+def exit_code(summary) -> int:
+    if not summary:
+        return EXIT_NO_DATA
+    if summary.get("errors"):
+        return EXIT_SHOP_ERRORS
+    if "combined_files" in summary and not summary["combined_files"]:
+        return EXIT_NO_DATA
+    return EXIT_OK
+
+def run_queue_command(args, catalogues, registry, argv=()):
+    if args.queue_command == "work" and args.processes > 1:
+        child_argv = _strip_options(argv, ("--processes", "--json"))
+        results = run_children([child_argv] * args.processes)
+        queue = WorkQueue(args.queue)
+        errors = {f"worker {index}": f"exited with code {code}" for index, (code, summary) in enumerate(results, start=1) if code}
+        summary = {"queue": args.queue, "workers": [summary for _, summary in results], "tasks": queue.counts(), "errors": errors}
+        queue.close()
+        return summary
+    queue = WorkQueue(args.queue)
+    try:
+        if args.queue_command == "fill":
+            return fill_queue(queue, selected_catalogues(args.catalog, catalogues, registry), args.catalog, args.shops)
+        if args.queue_command == "work":
+            sources = {scraper.name: scraper for scraper in registry.welder_scrapers()}
+            result = run_worker(queue, sources, batch=args.batch)
+            print(f"Worker {result['worker']} priced {result['urls']} urls in {result['batches']} batches")
+            return {"queue": args.queue, **result, "tasks": queue.counts()}
+        if args.queue_command == "collect":
+            while args.wait and queue.outstanding():
+                time.sleep(5)
+            catalog = queue.meta().get("catalog")
+            if catalog is None:
+                print(f"Queue {args.queue} has not been filled.")
+                return None
+            return collect_queue(queue, selected_catalogues(catalog, catalogues, registry), args.output_dir, args.combined_dir)
+        if args.queue_command == "status":
+            counts = queue.counts()
+            print(f"Queue {args.queue}: " + ", ".join(f"{count} {status}" for status, count in counts.items()))
+            return {"queue": args.queue, "meta": queue.meta(), "tasks": counts}
+    finally:
+        queue.close()
+    raise ValueError(f"Unknown queue action {args.queue_command!r}")
+
+def run_command(args, catalogues, registry, argv=()):
+    """Run one CLI command and return its summary dict (None if it could not run)."""
+    shard = Shard.parse(args.shard, args.shard_by) if getattr(args, "shard", None) else None
+    if args.command == "scrape" and args.processes > 1:
+        child_argv = _strip_options(argv, ("--processes", "--shard", "--shard-by", "--run-id", "--json"))
+        return scrape_in_processes(child_argv, args.processes, args.shard_by, args.output_dir, args.combined_dir)
+    if args.command == "queue":
+        return run_queue_command(args, catalogues, registry, argv)
+    if args.command == "store":
+        store = PriceStore()
+        if args.store_command == "import":
+            stored = []
+            for path in args.files:
+                stored.append(import_csv(path, store))
+                write_pivot(pd.read_csv(path, dtype=str), catalogue_from_filename(path), run_id_from_filename(path))
+                print(f"Stored {path} as {stored[-1]}")
+            return {"stored": stored}
+        runs = {catalogue: store.runs(catalogue) for catalogue in ("welders", "helmets")}
+        for catalogue, run_ids in runs.items():
+            print(f"{catalogue}: {len(run_ids)} runs" + (f", latest {run_ids[-1]}" if run_ids else ""))
+        return {"runs": runs}
+    if args.command == "prices":
+        corpus = price_corpus(args.files or default_corpus_files())
+        if not corpus:
+            print("No price text found to check.")
+            return None
+        if args.prices_command == "fuzz":
+            result = price_fuzz(corpus, seed=args.seed)
+            print(f"Parsed {result['cases']} price texts built from {result['corpus']} scraped ones: {len(result['errors'])} failures")
+            for failure in result["errors"]:
+                print(f"  {failure['text']!r}: expected {failure['expected']}, got {failure['got']}")
+            return result
+        result = price_benchmark(corpus, repeat=args.repeat)
+        print(f"{result['parse_us']} us per price ({result['cached_parse_us']} us cached), "
+              f"{result['column_rows']} row column in {result['column_ms']} ms")
+        return result
+    if args.command == "merge":
+        combined_files = merge_shards(args.shards, args.output_dir, args.combined_dir)
+        return {"shards": args.shards, "combined_files": combined_files} if combined_files is not None else None
+    if args.command in ("scrape", "bench"):
+        work = selected_catalogues(args.catalog, catalogues, registry)
+        if args.command == "bench":
+            return bench(work, repeat=args.repeat, workers=args.workers, shops=args.shops, shard=shard)
+        return scrape_catalogues(work, args.output_dir, args.combined_dir, incremental=args.incremental,
+                                 workers=args.workers, shops=args.shops, shard=shard, run_id=args.run_id)
+    if args.command == "combine":
+        combined_files = []
+        if args.catalog in ("welders", "all"):
+            combined_files.append(combine_csv(registry.welder_scrapers(), args.output_dir, args.combined_dir))
+        if args.catalog in ("helmets", "all"):
+            combined_files.append(combine_helmet_csv(registry.helmet_scrapers(), args.output_dir, args.combined_dir))
+        return {"combined_files": [filename for filename in combined_files if filename]}
+    if args.command == "resume":
+        helmets = catalogues.helmets() if catalogues.helmets_available else None
+        return resume_run(args.run_id, catalogues.welders(), registry.welder_scrapers(), helmets,
+                          registry.helmet_scrapers(), args.output_dir, args.combined_dir)
+    raise ValueError(f"Unknown command {args.command!r}")
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command is None:
+        main_with_helmets(resume=args.resume)
+        return EXIT_OK
+
+    registry = ScraperRegistry()
+    catalogues = Catalogues()
+    # Validate everything up front so a cron typo fails fast with EXIT_USAGE.
+    if getattr(args, "shard", None):
+        try:
+            Shard.parse(args.shard, args.shard_by)
+        except ValueError as e:
+            parser.error(str(e))
+    if getattr(args, "processes", 1) > 1 and getattr(args, "shard", None):
+        parser.error("--processes starts its own shards; it cannot be combined with --shard")
+    if getattr(args, "processes", 1) < 1 or getattr(args, "shards", 1) < 1:
+        parser.error("the number of processes or shards must be at least 1")
+    if getattr(args, "shops", None):
+        known = {profile.name.upper() for profile in registry.profiles()}
+        unknown = [shop for shop in args.shops if shop.upper() not in known]
+        if unknown:
+            parser.error(f"unknown shops: {', '.join(unknown)} (see site_profiles.toml)")
+    if getattr(args, "catalog", "welders") in ("helmets", "all") and not catalogues.helmets_available:
+        print(f"Helmet data not found: {catalogues.helmet_file}", file=sys.stderr)
+        return EXIT_NO_DATA
+    if getattr(args, "no_cache", False):
+        config.HTTP_CACHE = 0
+    os.makedirs(args.output_dir, exist_ok=True)
+    os.makedirs(args.combined_dir, exist_ok=True)
+
+    stdout = sys.stdout
+    # With --json -, stdout carries only the summary; progress goes to stderr.
+    redirect = contextlib.redirect_stdout(sys.stderr) if args.json == "-" else contextlib.nullcontext()
+    try:
+        with redirect:
+            summary = run_command(args, catalogues, registry, argv)
+    finally:
+        close_driver_pool()
+    code = exit_code(summary)
+    if args.json:
+        command = " ".join(filter(None, (args.command, getattr(args, "queue_command", None), getattr(args, "store_command", None),
+                                            getattr(args, "prices_command", None))))
+        text = json.dumps({"command": command, "exit_code": code, **(summary or {})}, indent=2, default=str)
+        if args.json == "-":
+            stdout.write(text + "\n")
+        else:
+            with open(args.json, "w", encoding="utf-8") as summary_file:
+                summary_file.write(text + "\n")
+    return code
+
 if __name__ == "__main__":
-    main_with_helmets()
\ No newline at end of file
+    sys.exit(main())
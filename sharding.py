@@ -0,0 +1,72 @@
+import hashlib
+from urllib.parse import urlsplit
+
+import pandas as pd
+
+# What a catalogue can be split on: whole shops, the host of each product
+# url, or individual product urls.
+SHARD_KEYS = ("shop", "host", "url")
+
+
+def stable_bucket(value: str, count: int) -> int:
+    # A digest rather than hash(), which is salted per process, so every process
+    # and every machine agrees on which shard a shop or url belongs to. crc32
+    # is not used: urls differing only in their last character share its low bits.
+    digest = hashlib.blake2b(str(value).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big") % count
+
+
+class Shard:
+    """
+    One of `count` disjoint slices of a catalogue, written K/N on the command
+    line with 1 <= K <= N. Splitting by shop keeps each shop's rows (and its
+    per-company CSV) in one process; splitting by host keeps every request to
+    a host, and so its rate limit, in one process; splitting by url spreads a
+    single large shop over several processes.
+    """
+    def __init__(self, index: int, count: int, key: str = "shop"):
+        if count < 1 or not 1 <= index <= count:
+            raise ValueError(f"Shard must be K/N with 1 <= K <= N, got {index}/{count}")
+        if key not in SHARD_KEYS:
+            raise ValueError(f"Shard key must be one of {SHARD_KEYS}, got {key!r}")
+        self.index = index
+        self.count = count
+        self.key = key
+
+    @classmethod
+    def parse(cls, text: str, key: str = "shop") -> "Shard":
+        try:
+            index, count = (int(part) for part in text.split("/"))
+        except ValueError:
+            raise ValueError(f"Shard must be written K/N, e.g. 1/4, got {text!r}")
+        return cls(index, count, key)
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+    @property
+    def tag(self) -> str:
+        """Folder and run id suffix for this shard's output, e.g. shard_1_of_4."""
+        return f"shard_{self.index}_of_{self.count}"
+
+    def owns(self, value) -> bool:
+        return stable_bucket(value, self.count) == self.index - 1
+
+    def select_scrapers(self, scrapers) -> list:
+        if self.key != "shop":
+            return list(scrapers)
+        # Helmet scrapers go with the welder scraper of the same shop.
+        return [scraper for scraper in scrapers if self.owns(getattr(scraper, "source", scraper).name)]
+
+    def select_rows(self, df: pd.DataFrame) -> pd.DataFrame:
+        if self.key == "shop" or df is None or 'PRODUCT LINK' not in df.columns:
+            return df
+        links = df['PRODUCT LINK'].fillna("").astype(str)
+        if self.key == "host":
+            links = links.map(lambda url: urlsplit(url).netloc.lower())
+        return df[links.map(self.owns)]
+
+    @staticmethod
+    def tags(count: int) -> list:
+        """The shard_K_of_N folder names of every shard in an N-way split."""
+        return [Shard(index, count).tag for index in range(1, count + 1)]
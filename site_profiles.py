@@ -0,0 +1,99 @@
+import os
+
+import numpy as np
+
+from price_parser import parse_price
+
+try:
+    import tomllib
+except ModuleNotFoundError:  # Python < 3.11
+    import tomli as tomllib
+
+# SCRAPER_SITE_PROFILES points every process of a run (including shard workers) at another file.
+PROFILES_PATH = os.environ.get(
+    "SCRAPER_SITE_PROFILES",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "site_profiles.toml"),
+)
+BACKENDS = ("http", "browser")
+# Selenium locator strategies, spelled out so this module doesn't need to import Selenium.
+LOCATOR_STRATEGIES = {"css": "css selector", "xpath": "xpath"}
+
+
+class SelectorRule:
+    def __init__(self, spec: dict, where: str):
+        kinds = [kind for kind in ("css", "xpath") if kind in spec]
+        if len(kinds) != 1:
+            raise ValueError(f"{where}: each selector needs exactly one of css or xpath, got {spec}")
+        self.kind = kinds[0]
+        self.query = spec[self.kind]
+        self.join = bool(spec.get("join", False))
+
+    def extract(self, sel) -> str:
+        nodes = sel.css(self.query) if self.kind == "css" else sel.xpath(self.query)
+        values = [value.strip() for value in nodes.getall()]
+        if self.join:
+            return "".join(values).strip()
+        return next((value for value in values if value), "")
+
+    def locator(self):
+        return (LOCATOR_STRATEGIES[self.kind], self.query)
+
+
+class SiteProfile:
+    """One shop's entry in site_profiles.toml; see the comment at the top of that file."""
+    def __init__(self, data: dict, header_presets: dict):
+        self.name = data["name"]
+        where = f"site profile {self.name!r}"
+        self.pattern = data.get("pattern", self.name)
+        self.backend = data.get("backend", "http")
+        if self.backend not in BACKENDS:
+            raise ValueError(f"{where}: backend must be one of {BACKENDS}, got {self.backend!r}")
+        self.url_prefixes = tuple(data.get("url_prefixes", ()))
+        preset = data.get("headers")
+        if preset is not None and preset not in header_presets:
+            raise ValueError(f"{where}: unknown headers preset {preset!r}")
+        self.headers = dict(header_presets[preset]) if preset else None
+        self.timeout = float(data.get("timeout", 15.0))
+        self.selectors = [SelectorRule(spec, where) for spec in data.get("selectors", ())]
+        if not self.selectors:
+            raise ValueError(f"{where}: at least one selector is required")
+        self.remove = tuple(data.get("remove", ()))
+        self.helmets = bool(data.get("helmets", True))
+        self.enabled = bool(data.get("enabled", True))
+        self.site = data.get("site", self.name.lower())
+        self.wait_for = [SelectorRule(spec, where).locator() for spec in data.get("wait_for", ())]
+        if self.backend == "browser" and not self.wait_for:
+            raise ValueError(f"{where}: browser profiles need wait_for selectors")
+
+    def extract_price(self, html: str):
+        """
+        Run the profile's selectors over html and return the first match's text,
+        or np.nan if nothing matched or the text holds no price. The text is
+        parsed into typed columns when the company's rows are filled.
+        """
+        if not html:
+            return np.nan
+        from parsel import Selector  # lxml is only loaded once there is a page to parse
+        sel = Selector(html)
+        for rule in self.selectors:
+            price = rule.extract(sel)
+            if price:
+                break
+        else:
+            return np.nan
+        for token in self.remove:
+            price = price.replace(token, "")
+        return price if parse_price(price).ok else np.nan
+
+
+def load_profiles(path: str = PROFILES_PATH, include_disabled: bool = False) -> list:
+    """Read the [[site]] profiles from the TOML file, in file order, leaving out enabled = false ones."""
+    with open(path, "rb") as profile_file:
+        data = tomllib.load(profile_file)
+    header_presets = data.get("headers", {})
+    profiles = [SiteProfile(entry, header_presets) for entry in data.get("site", [])]
+    names = [profile.name for profile in profiles]
+    duplicates = {name for name in names if names.count(name) > 1}
+    if duplicates:
+        raise ValueError(f"Duplicate site profile names: {sorted(duplicates)}")
+    return [profile for profile in profiles if include_disabled or profile.enabled]
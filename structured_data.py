@@ -0,0 +1,121 @@
+import json
+import threading
+from collections import Counter, defaultdict
+
+import numpy as np
+
+import config
+from price_parser import amount, parse_price
+
+OPENGRAPH_PRICE_PROPERTIES = ("product:price:amount", "og:price:amount", "product:sale_price:amount")
+
+_path_counts = defaultdict(Counter)
+_path_counts_lock = threading.Lock()
+
+
+def _iter_json_ld_nodes(data):
+    """Yield every dict in a JSON-LD document, including those nested in @graph or lists."""
+    if isinstance(data, list):
+        for item in data:
+            yield from _iter_json_ld_nodes(item)
+    elif isinstance(data, dict):
+        yield data
+        for value in data.values():
+            if isinstance(value, (dict, list)):
+                yield from _iter_json_ld_nodes(value)
+
+
+def _is_type(node: dict, name: str) -> bool:
+    node_type = node.get("@type", "")
+    types = node_type if isinstance(node_type, list) else [node_type]
+    return name in types
+
+
+def _offer_price(offers):
+    for offer in offers if isinstance(offers, list) else [offers]:
+        if not isinstance(offer, dict):
+            continue
+        for key in ("price", "lowPrice"):
+            value = offer.get(key)
+            if value not in (None, ""):
+                return str(value).strip()
+        # Some shops nest the amount in a priceSpecification block.
+        spec = offer.get("priceSpecification")
+        if spec:
+            price = _offer_price(spec)
+            if price:
+                return price
+    return None
+
+
+def price_from_json_ld(sel):
+    for block in sel.css('script[type="application/ld+json"]::text').getall():
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        for node in _iter_json_ld_nodes(data):
+            if _is_type(node, "Product") and "offers" in node:
+                price = _offer_price(node["offers"])
+                if price:
+                    return price
+    return None
+
+
+def price_from_microdata(sel):
+    price = sel.css('[itemprop="price"]::attr(content)').get(default="").strip()
+    if not price:
+        price = "".join(sel.css('[itemprop="price"] ::text').getall()).strip()
+    return price or None
+
+
+def price_from_opengraph(sel):
+    for name in OPENGRAPH_PRICE_PROPERTIES:
+        price = sel.css(f'meta[property="{name}"]::attr(content)').get(default="").strip()
+        if price:
+            return price
+    return None
+
+
+def extract_structured_price(html: str):
+    """
+    Try schema.org JSON-LD, then microdata, then OpenGraph price tags.
+
+    Returns (price, method) where price is the price text and method is
+    "json-ld", "microdata" or "opengraph", or (np.nan, None) if the page
+    carries no structured price.
+    """
+    if not html:
+        return np.nan, None
+    from parsel import Selector  # lxml is only loaded once there is a page to parse
+    sel = Selector(html)
+    for method, extractor in (
+        ("json-ld", price_from_json_ld),
+        ("microdata", price_from_microdata),
+        ("opengraph", price_from_opengraph),
+    ):
+        price = parse_price(extractor(sel))
+        if price.ok:
+            return price.raw, method
+    return np.nan, None
+
+
+def prices_agree(structured, visible, tolerance: float = config.STRUCTURED_PRICE_TOLERANCE) -> bool:
+    """
+    True if two price texts are within tolerance (a fraction of the larger) of
+    each other. Structured data can carry the ex-GST price or the first
+    variant's, which the page does not show.
+    """
+    structured, visible = amount(structured), amount(visible)
+    return abs(structured - visible) <= tolerance * max(abs(structured), abs(visible))
+
+
+def record_path(shop: str, path: str):
+    with _path_counts_lock:
+        _path_counts[shop][path] += 1
+
+
+def path_summary() -> dict:
+    """Return {shop: {path: count}} for every page fetched so far."""
+    with _path_counts_lock:
+        return {shop: dict(counts) for shop, counts in _path_counts.items()}
@@ -0,0 +1,88 @@
+import http.server
+import threading
+
+import numpy as np
+import pytest
+
+import config
+import fetch_engine
+from fetch_engine import fetch_pages, fetch_prices, is_valid_url
+
+
+class _PriceHandler(http.server.BaseHTTPRequestHandler):
+    """Serves /<n> as a page priced $n, /missing as a 404 and counts requests per path."""
+    def do_GET(self):
+        self.server.hits[self.path] = self.server.hits.get(self.path, 0) + 1
+        if self.path == "/missing":
+            self.send_error(404)
+            return
+        body = f"<span class='price'>${self.path.strip('/')}</span>".encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def shop(monkeypatch):
+    # Measure the engine, not the response cache.
+    monkeypatch.setattr(fetch_engine, "get_response_cache", lambda: None)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _PriceHandler)
+    server.hits = {}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def base(server) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def parse(html: str) -> float:
+    return float(html.split("$")[1].split("<")[0])
+
+
+def test_fetch_pages_keeps_the_order_of_urls(shop):
+    urls = [f"{base(shop)}/{n}" for n in range(20, 0, -1)]
+    pages = fetch_pages(urls)
+    assert [parse(page) for page in pages] == list(range(20, 0, -1))
+
+
+def test_fetch_prices(shop):
+    url = f"{base(shop)}/5"
+    urls = [url, None, "", "ftp://elsewhere/1", url, f"{base(shop)}/missing", f"{base(shop)}/7"]
+    priced = []
+    prices = fetch_prices(urls, parse, url_prefixes=(base(shop),), on_price=lambda url, price: priced.append(url))
+    assert prices[0] == prices[4] == 5.0
+    assert prices[6] == 7.0
+    # Invalid urls and the 404 page, which parse cannot read, come back as NaN.
+    assert all(np.isnan(prices[i]) for i in (1, 2, 3, 5))
+    # Rows sharing a url are fetched and priced once.
+    assert shop.hits["/5"] == 1
+    assert sorted(priced) == sorted([url, f"{base(shop)}/missing", f"{base(shop)}/7"])
+
+
+def test_failed_requests_come_back_as_none(shop, monkeypatch):
+    monkeypatch.setattr(config, "MAX_RETRIES", 0)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _PriceHandler)
+    closed = base(server)
+    server.server_close()
+    assert fetch_pages([f"{closed}/1", f"{base(shop)}/2"]) == [None, "<span class='price'>$2</span>"]
+
+
+@pytest.mark.parametrize("url, expected", [
+    ("https://shop.example.com/p", True),
+    ("https://other.example.com/p", False),
+    ("", False),
+    ("  ", False),
+    (None, False),
+    (np.nan, False),
+])
+def test_is_valid_url(url, expected):
+    assert is_valid_url(url, ("https://shop.example.com",)) == expected
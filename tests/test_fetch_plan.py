@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+
+from fetch_plan import FetchPlan, replay_fill
+
+
+class FakeScraper:
+    """Fills prices the way CompanyScraper does, from a {url: price} table."""
+    price_column = 'Price'
+
+    def __init__(self, name, prices=None):
+        self.name = name
+        self.prices = prices or {}
+        self.fetched = []
+        self.df = None
+        self.stats = {}
+
+    def get_prices(self, urls, on_price=None):
+        self.fetched.extend(urls)
+        prices = [self.prices.get(url, np.nan) for url in urls]
+        if on_price is not None:
+            for url, price in zip(urls, prices):
+                on_price(url, price)
+        return prices
+
+    def fill_prices(self, df_company):
+        df_company['Price'] = self.get_prices(df_company['PRODUCT LINK'].tolist())
+        df_company['Price_Bundle'] = df_company.get('BUNDLE LINK', np.nan)
+        return df_company
+
+
+class FakeHelmetScraper(FakeScraper):
+    def __init__(self, source):
+        super().__init__(f"{source.name} helmets")
+        self.source = source
+
+
+class FakeJournal:
+    run_id = "20250101_120000_shard_1_of_2"
+
+    def __init__(self, prices=None):
+        self.recorded = dict(prices or {})
+
+    def prices(self):
+        return dict(self.recorded)
+
+    def record(self, shop, url, price):
+        self.recorded[(shop, url)] = price
+
+
+def links(*urls, bundles=None):
+    df = pd.DataFrame({'PRODUCT LINK': list(urls)})
+    if bundles is not None:
+        df['BUNDLE LINK'] = bundles
+    return df
+
+
+def test_plan_fetches_each_url_once():
+    welders = FakeScraper("SHOP", {"https://a/1": 10.0, "https://a/2": 20.0, "https://a/3": 30.0})
+    plan = FetchPlan()
+    plan.add(welders, links("https://a/1", "https://a/2", "https://a/1", None, " ",
+                            bundles=["https://a/3", np.nan, "https://a/2", np.nan, np.nan]))
+    # Helmet rows of the same shop share its urls.
+    plan.add(FakeHelmetScraper(welders), links("https://a/2", "https://a/3"))
+    assert plan.unique_count() == 3
+    assert plan.references == 7
+    prices, durations, errors = plan.run(workers=2)
+    assert sorted(welders.fetched) == ["https://a/1", "https://a/2", "https://a/3"]
+    assert prices == {("SHOP", "https://a/1"): 10.0, ("SHOP", "https://a/2"): 20.0, ("SHOP", "https://a/3"): 30.0}
+    assert set(durations) == {"SHOP"} and not errors
+
+
+def test_plan_resumes_from_the_journal():
+    scraper = FakeScraper("SHOP", {"https://a/1": 10.0, "https://a/2": 20.0})
+    journal = FakeJournal({("SHOP", "https://a/1"): 9.0})
+    plan = FetchPlan()
+    plan.add(scraper, links("https://a/1", "https://a/2"))
+    prices, _, _ = plan.run(workers=1, journal=journal)
+    assert scraper.fetched == ["https://a/2"]
+    assert prices == {("SHOP", "https://a/1"): 9.0, ("SHOP", "https://a/2"): 20.0}
+    assert journal.recorded[("SHOP", "https://a/2")] == 20.0
+    assert scraper.run_id == journal.run_id
+
+
+def test_replay_fill_answers_from_prices_without_fetching():
+    welders = FakeScraper("SHOP")
+    helmets = FakeHelmetScraper(welders)
+    prices = {("SHOP", "https://a/1"): 10.0, ("SHOP", "https://a/2"): 20.0}
+    rows = links("https://a/2", "https://a/1", "https://a/9", bundles=["https://a/1", np.nan, np.nan])
+    filled = replay_fill(helmets, rows, prices)
+    assert filled['Price'].tolist()[:2] == [20.0, 10.0]
+    assert np.isnan(filled['Price'].iloc[2])
+    assert filled['Price_Bundle'].iloc[0] == "https://a/1"
+    assert not welders.fetched and not helmets.fetched
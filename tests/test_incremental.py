@@ -0,0 +1,64 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from incremental import SCRAPED_AT, TIMESTAMP_FORMAT, split_stale
+
+KEYS = ("PRODUCT SKU", "PRODUCT LINK")
+OUTPUT = ("Price", "Price_Bundle")
+
+
+def stamp(hours_ago: float) -> str:
+    return (datetime.datetime.now() - datetime.timedelta(hours=hours_ago)).strftime(TIMESTAMP_FORMAT)
+
+
+def catalogue() -> pd.DataFrame:
+    return pd.DataFrame({
+        "PRODUCT SKU": ["A1", "B2", "C3", "D4", "E5"],
+        "PRODUCT LINK": [f"https://shop.example.com/{sku}" for sku in ["a1", "b2", "c3", "d4", "e5"]],
+    }, index=[10, 11, 12, 13, 14])
+
+
+def previous_run() -> pd.DataFrame:
+    return pd.DataFrame({
+        "PRODUCT SKU": ["A1", "B2", "C3", "D4", "E5"],
+        # D4's link changed since the last run.
+        "PRODUCT LINK": [f"https://shop.example.com/{sku}" for sku in ["a1", "b2", "c3", "d4-new", "e5"]],
+        "Price": ["$100", "$200", np.nan, "$400", "$500"],
+        "Price_Bundle": ["$150", np.nan, np.nan, np.nan, np.nan],
+        SCRAPED_AT: [stamp(1), stamp(2), stamp(1), stamp(1), stamp(100)],
+    })
+
+
+def test_split_stale():
+    reused, stale = split_stale(catalogue(), previous_run(), KEYS, "Price", OUTPUT, max_age_hours=24)
+    # C3 had no price, D4's row changed and E5's price is too old.
+    assert list(reused.index) == [10, 11]
+    assert list(stale.index) == [12, 13, 14]
+    assert list(reused["Price"]) == ["$100", "$200"]
+    assert reused["Price_Bundle"].iloc[0] == "$150"
+    assert list(reused[SCRAPED_AT]) == list(previous_run()[SCRAPED_AT][:2])
+
+
+def test_split_stale_keeps_the_last_duplicate():
+    previous = pd.concat([previous_run().iloc[[0]].assign(Price="$90", **{SCRAPED_AT: stamp(3)}), previous_run()])
+    reused, _ = split_stale(catalogue(), previous, KEYS, "Price", OUTPUT, max_age_hours=24)
+    assert reused.loc[10, "Price"] == "$100"
+
+
+def test_split_stale_matches_text_and_numbers():
+    # The catalogue comes from Excel, the previous run from a CSV read as text.
+    df = pd.DataFrame({"PRODUCT SKU": [1234], "PRODUCT LINK": ["https://shop.example.com/x"]})
+    previous = pd.DataFrame({"PRODUCT SKU": ["1234"], "PRODUCT LINK": ["https://shop.example.com/x"],
+                             "Price": ["$1"], SCRAPED_AT: [stamp(1)]})
+    reused, stale = split_stale(df, previous, KEYS, "Price", OUTPUT, max_age_hours=24)
+    assert (len(reused), len(stale)) == (1, 0)
+
+
+def test_split_stale_without_a_usable_previous_run():
+    df = catalogue()
+    for previous in (None, previous_run().drop(columns=["PRODUCT SKU"])):
+        reused, stale = split_stale(df, previous, KEYS, "Price", OUTPUT, max_age_hours=24)
+        assert reused.empty
+        assert stale is df
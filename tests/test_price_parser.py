@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from price_parser import amount, amounts, default_corpus_files, fuzz, fuzz_texts, parse_price, price_corpus, price_details
+
+
+@pytest.fixture(scope="module")
+def corpus():
+    texts = price_corpus(default_corpus_files(ROOT))
+    if not texts:
+        pytest.skip("no scraper output CSVs to build the corpus from")
+    return texts
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("$1,299.00", 1299.0),
+    ("A$2,690.00", 2690.0),
+    ("AU $749.00", 749.0),
+    ('<span class="price">$349.00</span>', 349.0),
+    ("$1 299", 1299.0),
+    ("1 299,00 AUD", 1299.0),
+    ("1.299,00", 1299.0),
+    ("12,50", 12.5),
+    ("1,299", 1299.0),
+    ("-5", -5.0),
+    ("-$5.00", -5.0),
+    ("$199 -$299", 199.0),
+    ("NOW $199 RRP $249", 199.0),
+    ("Was $249.00 Now $199.00", 199.0),
+])
+def test_amount(text, expected):
+    assert amount(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Price on application", "", "$", "inf", None, np.nan,
+    # Malformed numbers are no price rather than the part of them that reads as one.
+    "$1,2345", "1,2345", "$1,234,5", "12.345.67", "1.2345,00",
+])
+def test_no_amount(text):
+    assert np.isnan(amount(text))
+
+
+def test_attributes():
+    parsed = parse_price("NOW $199 RRP $249 inc. GST")
+    assert (parsed.rrp, parsed.gst, parsed.on_sale) == (249.0, "inc", True)
+    parsed = parse_price("$199 - $299 excl GST")
+    assert (parsed.amount, parsed.high, parsed.gst) == (199.0, 299.0, "ex")
+    assert parse_price("NZ$50").currency == "NZD"
+
+
+def test_amounts_matches_amount(corpus):
+    texts = fuzz_texts(corpus)
+    np.testing.assert_array_equal(amounts(texts).to_numpy(), np.array([amount(text) for text in texts]))
+
+
+def test_amounts_of_numbers():
+    assert amounts(pd.Series([1.5, np.nan, -2])).tolist()[::2] == [1.5, -2.0]
+
+
+def test_fuzz(corpus):
+    assert fuzz(corpus)["errors"] == []
+
+
+def test_price_details():
+    values = pd.Series(["A$1,299.00 inc GST", np.nan, "Call for price", "$99 + GST", "A$1,299.00 inc GST"], index=[5, 6, 7, 8, 9])
+    details = price_details(values)
+    assert list(details.index) == [5, 6, 7, 8, 9]
+    np.testing.assert_array_equal(details["amount"], [1299.0, np.nan, np.nan, 99.0, 1299.0])
+    assert details["raw"].tolist() == ["A$1,299.00 inc GST", pd.NA, "Call for price", "$99 + GST", "A$1,299.00 inc GST"]
+    assert details["currency"].tolist() == ["AUD", pd.NA, pd.NA, "AUD", "AUD"]
+    assert details["gst"].tolist() == ["inc", pd.NA, pd.NA, "ex", "inc"]
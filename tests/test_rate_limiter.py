@@ -0,0 +1,94 @@
+import asyncio
+import datetime
+import time
+from email.utils import format_datetime
+
+import pytest
+
+import config
+from rate_limiter import DECREASE_COOLDOWN, HostRateLimiter, backoff_delay, parse_retry_after
+
+
+def limiter(**kwargs) -> HostRateLimiter:
+    return HostRateLimiter(**{"rate": 4.0, "min_rate": 0.5, "max_rate": 20.0, "step": 1.0, "decrease": 0.5, **kwargs})
+
+
+def test_slow_start_adds_a_step_per_success():
+    host = limiter()
+    for _ in range(4):
+        host.on_success()
+    assert host.rate == pytest.approx(8.0)
+    assert host.slow_start
+
+
+def test_slow_start_stops_at_max_rate():
+    host = limiter()
+    for _ in range(100):
+        host.on_success()
+    assert host.rate == 20.0
+
+
+def test_throttle_halves_and_ends_slow_start():
+    host = limiter()
+    host.on_success()
+    host.on_throttle()
+    assert host.rate == pytest.approx(2.5)
+    assert not host.slow_start
+    assert host.tokens == 0.0
+    # Additive increase from here on.
+    host.on_success()
+    assert host.rate == pytest.approx(2.5 + 1.0 / 2.5)
+
+
+def test_retry_after_on_a_success_ends_slow_start():
+    host = limiter()
+    host.on_success(retry_after=5.0)
+    assert not host.slow_start
+    assert host.rate == pytest.approx(4.0 + 1.0 / 4.0)
+
+
+def test_throttles_in_one_cooldown_count_once():
+    host = limiter(rate=16.0)
+    host.on_throttle()
+    host.on_throttle()
+    assert host.rate == pytest.approx(8.0)
+    assert host.stats["throttled"] == 2
+    host.last_decrease -= DECREASE_COOLDOWN
+    host.on_throttle()
+    assert host.rate == pytest.approx(4.0)
+
+
+def test_rate_never_drops_below_min_rate():
+    host = limiter(rate=0.6)
+    host.on_throttle()
+    assert host.rate == 0.5
+
+
+def test_retry_after_blocks_the_host():
+    host = limiter()
+    host.on_throttle(retry_after=0.2)
+    start = time.monotonic()
+    asyncio.run(host.acquire())
+    assert time.monotonic() - start >= 0.19
+    assert host.stats["requests"] == 1
+
+
+def test_summary():
+    host = limiter()
+    host.on_success()
+    assert host.summary() == {"requests": 0, "throttled": 0, "retries": 0, "gave_up": 0, "rate": 5.0, "slow_start": True}
+
+
+@pytest.mark.parametrize("value, expected", [("5", 5.0), (" 0.5 ", 0.5), ("-3", 0.0), ("", None), (None, None), ("soon", None)])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    when = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=30)
+    assert 25 <= parse_retry_after(format_datetime(when, usegmt=True)) <= 30
+
+
+def test_backoff_honours_retry_after():
+    assert backoff_delay(0, retry_after=7.0) >= 7.0
+    assert 0 <= backoff_delay(3) <= config.RETRY_BACKOFF * 2 ** 3
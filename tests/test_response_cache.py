@@ -0,0 +1,166 @@
+import functools
+import http.server
+import os
+import socket
+import sqlite3
+import threading
+import time
+import zlib
+
+import numpy as np
+import pytest
+
+import config
+import fetch_engine
+from response_cache import EVICT_TO, CachedResponse, ResponseCache, normalise_url
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, max_bytes=1024 * 1024)
+    yield cache
+    cache.close()
+
+
+def age(cache, url, seconds):
+    # Pretend the entry was fetched `seconds` ago.
+    with cache._lock:
+        cache._conn.execute("UPDATE entries SET fetched_at = fetched_at - ? WHERE url = ?", (seconds, normalise_url(url)))
+        cache._conn.commit()
+
+
+def test_normalise_url():
+    assert normalise_url("HTTPS://Shop.Example.com?b=2&utm_source=x&a=1#reviews") == "https://shop.example.com/?a=1&b=2"
+
+
+def test_put_and_get(cache):
+    cache.put("https://shop.example.com/p?utm_medium=email", "<p>$10</p>", etag='"v1"', last_modified="Mon, 01 Jan 2024 00:00:00 GMT")
+    cached = cache.get("https://shop.example.com/p")
+    assert cached.text == "<p>$10</p>"
+    assert cached.is_fresh(cache.ttl)
+    assert cached.revalidation_headers() == {"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"}
+    assert cache.get("https://shop.example.com/other") is None
+
+
+def test_entries_expire_after_ttl_and_touch_restarts_it(cache):
+    cache.put("https://shop.example.com/p", "<p>$10</p>", etag='"v1"')
+    age(cache, "https://shop.example.com/p", 61)
+    stale = cache.get("https://shop.example.com/p")
+    assert not stale.is_fresh(cache.ttl)
+    # A stale entry is still returned, so it can be revalidated instead of refetched.
+    assert stale.text == "<p>$10</p>"
+    cache.touch("https://shop.example.com/p")
+    assert cache.get("https://shop.example.com/p").is_fresh(cache.ttl)
+
+
+def test_is_fresh():
+    assert CachedResponse("", None, None, time.time() - 10).is_fresh(60)
+    assert not CachedResponse("", None, None, time.time() - 61).is_fresh(60)
+    assert CachedResponse("", None, None, time.time()).revalidation_headers() == {}
+
+
+def test_identical_bodies_are_stored_once(cache):
+    cache.put("https://shop.example.com/p?colour=red", "<p>$10</p>")
+    cache.put("https://shop.example.com/p?colour=blue", "<p>$10</p>")
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bodies"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    pages = [os.urandom(1000).hex() for _ in range(101)]
+    size = max(len(zlib.compress(page.encode("utf-8"))) for page in pages)
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, max_bytes=100 * size)
+    try:
+        for i, page in enumerate(pages[:100]):
+            cache.put(f"https://shop.example.com/{i}", page)
+        # Reading page 0 makes page 1 the least recently used.
+        assert cache.get("https://shop.example.com/0") is not None
+        cache.put("https://shop.example.com/100", pages[100])
+        assert cache.get("https://shop.example.com/1") is None
+        assert cache.get("https://shop.example.com/0") is not None
+        assert cache.get("https://shop.example.com/100") is not None
+        assert cache.stats()["bytes"] <= cache.max_bytes * EVICT_TO
+    finally:
+        cache.close()
+
+
+class _QuietHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def site(tmp_path):
+    folder = tmp_path / "site"
+    folder.mkdir()
+    (folder / "p.html").write_text("<span class='price'>$399</span>")
+    # Last-Modified is in whole seconds; keep If-Modified-Since comparisons unambiguous.
+    os.utime(folder / "p.html", (time.time() - 10, time.time() - 10))
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), functools.partial(_QuietHandler, directory=str(folder)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stale_pages_are_revalidated(site, tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, max_bytes=1024 * 1024)
+    monkeypatch.setattr(fetch_engine, "get_response_cache", lambda: cache)
+    url = f"{site}/p.html"
+
+    def fetch():
+        before = fetch_engine.cache_stats()
+        assert fetch_engine.fetch_pages([url]) == ["<span class='price'>$399</span>"]
+        after = fetch_engine.cache_stats()
+        return {key: after[key] - before[key] for key in after}
+
+    try:
+        assert fetch()["fetched"] == 1
+        assert cache.get(url).last_modified
+        assert fetch()["fresh"] == 1
+        age(cache, url, 61)
+        # The server answers the stale entry's If-Modified-Since with a 304.
+        assert fetch()["revalidated"] == 1
+        assert cache.get(url).is_fresh(cache.ttl)
+    finally:
+        cache.close()
+
+
+def test_pages_without_a_price_are_not_cached(site, tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, max_bytes=1024 * 1024)
+    monkeypatch.setattr(fetch_engine, "get_response_cache", lambda: cache)
+    url = f"{site}/p.html"
+    try:
+        # A changed layout: the page comes back but the parser finds nothing.
+        assert np.isnan(fetch_engine.fetch_prices([url], lambda html: float("nan"))[0])
+        assert cache.get(url) is None
+        assert fetch_engine.fetch_prices([url], lambda html: 399.0) == [399.0]
+        assert cache.get(url) is not None
+    finally:
+        cache.close()
+
+
+def test_stale_page_is_served_when_the_shop_is_unreachable(tmp_path, monkeypatch):
+    cache = ResponseCache(str(tmp_path / "cache.sqlite"), ttl=60, max_bytes=1024 * 1024)
+    monkeypatch.setattr(fetch_engine, "get_response_cache", lambda: cache)
+    monkeypatch.setattr(config, "MAX_RETRIES", 0)
+    with socket.socket() as unused:
+        unused.bind(("127.0.0.1", 0))
+        url = f"http://127.0.0.1:{unused.getsockname()[1]}/p.html"
+    try:
+        cache.put(url, "<p>$10</p>")
+        age(cache, url, 61)
+        before = fetch_engine.cache_stats()["stale"]
+        assert fetch_engine.fetch_pages([url]) == ["<p>$10</p>"]
+        assert fetch_engine.cache_stats()["stale"] == before + 1
+    finally:
+        cache.close()
+
+
+def test_a_broken_cache_falls_back_to_the_network(site, monkeypatch):
+    def locked():
+        raise sqlite3.OperationalError("database is locked")
+
+    monkeypatch.setattr(fetch_engine, "get_response_cache", locked)
+    assert fetch_engine.fetch_pages([f"{site}/p.html"]) == ["<span class='price'>$399</span>"]
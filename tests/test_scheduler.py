@@ -0,0 +1,42 @@
+import pytest
+
+from scheduler import expected_cost, load_history
+
+
+class Shop:
+    def __init__(self, name):
+        self.name = name
+
+
+def write_log(path, lines):
+    path.write_text("".join(f"2026-01-01 00:00:00,000 INFO: {line}\n" for line in lines), encoding="utf-8")
+
+
+def test_load_history_reads_row_counts(tmp_path):
+    write_log(tmp_path / "20260101_000000.log", [
+        "Shop A took 100.00 seconds for 50 urls.",
+        "Shop B took 12.50 seconds for 5 rows.",
+        "Shop C took 30.00 seconds.",
+    ])
+    assert load_history(str(tmp_path)) == {
+        "Shop A": [(100.0, 50)],
+        "Shop B": [(12.5, 5)],
+        "Shop C": [(30.0, None)],
+    }
+
+
+def test_expected_cost_scales_with_rows():
+    history = {"Shop A": [(100.0, 50), (300.0, 100), (40.0, 20)]}
+    # Median of 2, 3 and 2 seconds per row.
+    assert expected_cost(Shop("Shop A"), 10, history) == pytest.approx(20.0)
+    assert expected_cost(Shop("Shop A"), 100, history) == pytest.approx(200.0)
+
+
+def test_expected_cost_reads_old_helmet_names():
+    history = {"HELMET Shop A": [(60.0, 30)]}
+    assert expected_cost(Shop("Shop A"), 4, history) == pytest.approx(8.0)
+
+
+def test_expected_cost_ignores_timings_without_row_counts():
+    history = {"Shop A": [(1000.0, None)]}
+    assert expected_cost(Shop("Shop A"), 4, history) == pytest.approx(4 * 0.25)
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+
+import pandas as pd
+import pytest
+
+from conftest import ROOT
+from sharding import Shard, stable_bucket
+
+VALUES = [f"https://shop{i % 7}.example.com/product/{i}" for i in range(200)] + ["WELDCO", "TOOLSHED", ""]
+
+
+def test_stable_bucket_is_the_same_in_every_process():
+    # hash() is salted per process; the bucket must not be.
+    script = (
+        "import sys; from sharding import stable_bucket; "
+        "print(','.join(str(stable_bucket(v, 5)) for v in sys.argv[1:]))"
+    )
+    runs = set()
+    for seed in ("1", "2"):
+        env = {**os.environ, "PYTHONHASHSEED": seed}
+        result = subprocess.run([sys.executable, "-c", script, *VALUES], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        runs.add(result.stdout.strip())
+    assert runs == {",".join(str(stable_bucket(value, 5)) for value in VALUES)}
+
+
+@pytest.mark.parametrize("count", [1, 2, 3, 8])
+def test_every_value_has_exactly_one_shard(count):
+    shards = [Shard(index, count) for index in range(1, count + 1)]
+    for value in VALUES:
+        assert sum(shard.owns(value) for shard in shards) == 1
+
+
+def test_buckets_are_spread():
+    buckets = [stable_bucket(f"https://example.com/p/{i}", 4) for i in range(1000)]
+    assert all(buckets.count(bucket) > 150 for bucket in range(4))
+
+
+def test_select_rows_by_host_keeps_a_host_together():
+    df = pd.DataFrame({"PRODUCT LINK": VALUES[:200]})
+    shards = [Shard(index, 3, key="host") for index in range(1, 4)]
+    parts = [shard.select_rows(df) for shard in shards]
+    assert sum(len(part) for part in parts) == len(df)
+    hosts = [set(part["PRODUCT LINK"].str.split("/").str[2]) for part in parts]
+    for i, left in enumerate(hosts):
+        for right in hosts[i + 1:]:
+            assert not left & right
+
+
+def test_select_rows_by_shop_keeps_every_row():
+    df = pd.DataFrame({"PRODUCT LINK": VALUES[:10]})
+    assert Shard(1, 4).select_rows(df) is df
+
+
+@pytest.mark.parametrize("text", ["0/2", "3/2", "1/0", "1-2", "a/b"])
+def test_parse_rejects_bad_shards(text):
+    with pytest.raises(ValueError):
+        Shard.parse(text)
+
+
+def test_parse_and_tag():
+    shard = Shard.parse("2/4", key="url")
+    assert (shard.index, shard.count, shard.key, str(shard)) == (2, 4, "url", "2/4")
+    assert shard.tag == "shard_2_of_4"
+    assert Shard.tags(2) == ["shard_1_of_2", "shard_2_of_2"]
@@ -0,0 +1,37 @@
+import numpy as np
+import pytest
+
+from structured_data import extract_structured_price, prices_agree
+
+JSON_LD = """<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [{"@type": "Product", "name": "MIG 200",
+ "offers": {"@type": "Offer", "priceSpecification": {"price": "1299.00", "priceCurrency": "AUD"}}}]}
+</script>"""
+
+
+@pytest.mark.parametrize("html, expected", [
+    (JSON_LD, ("1299.00", "json-ld")),
+    ('<span itemprop="price" content="349.00">$349</span>', ("349.00", "microdata")),
+    ('<meta property="product:price:amount" content="99.5">', ("99.5", "opengraph")),
+    ('<script type="application/ld+json">{"@type": "Product", "offers": {"price": ""}}</script>'
+     '<meta property="og:price:amount" content="12">', ("12", "opengraph")),
+])
+def test_extract_structured_price(html, expected):
+    assert extract_structured_price(html) == expected
+
+
+@pytest.mark.parametrize("html", ["", None, "<p>$10</p>", '<meta property="og:price:amount" content="TBA">'])
+def test_no_structured_price(html):
+    price, method = extract_structured_price(html)
+    assert np.isnan(price) and method is None
+
+
+@pytest.mark.parametrize("structured, visible, expected", [
+    ("1299.00", "$1,299.00", True),
+    ("1299", "$1,300.00", True),
+    # The ex-GST price, and another variant's price.
+    ("1181.82", "$1,299.00 inc GST", False),
+    ("899.00", "$1,299.00", False),
+])
+def test_prices_agree(structured, visible, expected):
+    assert prices_agree(structured, visible, tolerance=0.01) == expected
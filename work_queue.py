@@ -0,0 +1,228 @@
+import datetime
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+import config
+
+
+def worker_id() -> str:
+    """A name for this worker process that is unique across machines sharing the queue."""
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+class WorkQueue:
+    """
+    A queue of (shop, url) tasks in SQLite that any number of worker
+    processes, on this machine or on others sharing the file, pull from.
+
+    Workers lease a batch of one shop's urls at a time. A lease that is not
+    completed before it expires (the worker crashed or hung) goes back to the
+    queue. A url that comes back without a price is retried until it has been
+    tried max_attempts times, then marked failed. Every connection is the
+    process's own; SQLite's locking keeps leases exclusive across processes.
+    """
+    def __init__(self, path: str = config.WORK_QUEUE_PATH, lease_seconds: int = config.QUEUE_LEASE_SECONDS,
+                 max_attempts: int = config.QUEUE_MAX_ATTEMPTS):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._lock = threading.Lock()
+        # Leasing takes a write lock; other processes wait for it rather than failing.
+        self._conn = sqlite3.connect(path, timeout=60, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS tasks (
+                shop TEXT NOT NULL,
+                url TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                lease_owner TEXT,
+                lease_expires REAL,
+                price TEXT,
+                updated_at TEXT,
+                PRIMARY KEY (shop, url)
+            );
+            CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, shop);
+        """)
+
+    def _write(self, statements):
+        # One IMMEDIATE transaction, so no other process can lease between our read and our update.
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                result = statements(self._conn)
+                self._conn.execute("COMMIT")
+                return result
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+
+    def reset(self, **meta):
+        """Drop every task and start a new queue described by meta."""
+        def statements(conn):
+            conn.execute("DELETE FROM tasks")
+            conn.execute("DELETE FROM meta")
+            conn.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in meta.items()],
+            )
+        self._write(statements)
+
+    def meta(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT key, value FROM meta").fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def enqueue(self, shop: str, urls) -> int:
+        rows = [(shop, url) for url in urls]
+        def statements(conn):
+            before = conn.total_changes
+            conn.executemany("INSERT OR IGNORE INTO tasks (shop, url) VALUES (?, ?)", rows)
+            return conn.total_changes - before
+        return self._write(statements)
+
+    def lease(self, owner: str, limit: int) -> list:
+        """
+        Lease up to limit urls of one shop and return [(shop, url)], or [] when
+        nothing is available right now. The shop with the fewest urls leased
+        by other workers is picked, so workers spread over shops (and hosts)
+        instead of piling onto one.
+        """
+        def statements(conn):
+            now = time.time()
+            # A url whose every attempt ended in an expired lease keeps crashing its worker; give up on it.
+            conn.execute(
+                "UPDATE tasks SET status = 'failed', lease_owner = NULL, lease_expires = NULL "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?",
+                (now, self.max_attempts),
+            )
+            available = "(status = 'pending' OR (status = 'leased' AND lease_expires < :now))"
+            row = conn.execute(f"""
+                SELECT shop FROM tasks WHERE {available}
+                GROUP BY shop
+                ORDER BY (SELECT COUNT(*) FROM tasks AS busy
+                          WHERE busy.shop = tasks.shop AND busy.status = 'leased' AND busy.lease_expires >= :now),
+                         shop
+                LIMIT 1
+            """, {"now": now}).fetchone()
+            if row is None:
+                return []
+            shop = row[0]
+            urls = [url for (url,) in conn.execute(
+                f"SELECT url FROM tasks WHERE shop = :shop AND {available} ORDER BY url LIMIT :limit",
+                {"shop": shop, "now": now, "limit": limit},
+            )]
+            conn.executemany(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1 "
+                "WHERE shop = ? AND url = ?",
+                [(owner, now + self.lease_seconds, shop, url) for url in urls],
+            )
+            return [(shop, url) for url in urls]
+        return self._write(statements)
+
+    def complete(self, owner: str, shop: str, url: str, price):
+        """
+        Record the outcome of a leased url. A missing price is put back for
+        another attempt until max_attempts is reached.
+        """
+        price = None if pd.isna(price) else str(price)
+        stamp = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        def statements(conn):
+            conn.execute("""
+                UPDATE tasks
+                SET status = CASE WHEN :price IS NOT NULL THEN 'done'
+                                  WHEN attempts >= :max_attempts THEN 'failed'
+                                  ELSE 'pending' END,
+                    price = :price, lease_owner = NULL, lease_expires = NULL, updated_at = :stamp
+                WHERE shop = :shop AND url = :url AND status = 'leased' AND lease_owner = :owner
+            """, {"price": price, "max_attempts": self.max_attempts, "stamp": stamp,
+                  "shop": shop, "url": url, "owner": owner})
+        self._write(statements)
+
+    def release(self, owner: str):
+        """Hand every url leased by owner back to the queue without counting the attempt."""
+        def statements(conn):
+            conn.execute(
+                "UPDATE tasks SET status = 'pending', lease_owner = NULL, lease_expires = NULL, "
+                "attempts = MAX(attempts - 1, 0) WHERE status = 'leased' AND lease_owner = ?",
+                (owner,),
+            )
+        self._write(statements)
+
+    def counts(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        counts = {"pending": 0, "leased": 0, "done": 0, "failed": 0}
+        counts.update(dict(rows))
+        return counts
+
+    def outstanding(self) -> int:
+        counts = self.counts()
+        return counts["pending"] + counts["leased"]
+
+    def prices(self) -> dict:
+        """Return {(shop, url): price} for every url that has a price."""
+        with self._lock:
+            rows = self._conn.execute("SELECT shop, url, price FROM tasks WHERE status = 'done'").fetchall()
+        return {(shop, url): price for shop, url, price in rows}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def run_worker(queue: WorkQueue, sources: dict, owner: str = None, batch: int = 10, poll: float = 2.0) -> dict:
+    """
+    Pull batches from queue and price them with sources ({shop: scraper})
+    until no task is pending or leased. Returns {"worker", "batches", "urls"}.
+    """
+    owner = owner or worker_id()
+    try:
+        return _work(queue, sources, owner, batch, poll)
+    finally:
+        # Stopped (e.g. Ctrl+C) with a batch in hand: let another worker have it straight away.
+        queue.release(owner)
+
+
+def _work(queue, sources, owner, batch, poll):
+    batches = urls_done = 0
+    while True:
+        tasks = queue.lease(owner, batch)
+        if not tasks:
+            # Another worker's lease may still expire and come back, so wait for the queue to drain.
+            if queue.outstanding() == 0:
+                break
+            time.sleep(poll)
+            continue
+        shop = tasks[0][0]
+        urls = [url for _, url in tasks]
+        reported = set()
+        def on_price(url, price):
+            reported.add(url)
+            queue.complete(owner, shop, url, price)
+        try:
+            if shop not in sources:
+                raise KeyError(f"no site profile for {shop}")
+            prices = sources[shop].get_prices(urls, on_price=on_price)
+        except Exception as e:
+            # Counts as a failed attempt for every url not yet reported, so a broken shop ends up failed.
+            print(f"{owner}: {shop} batch failed: {e}")
+            prices = [np.nan] * len(urls)
+        for url, price in zip(urls, prices):
+            if url not in reported:
+                queue.complete(owner, shop, url, price)
+        batches += 1
+        urls_done += len(urls)
+    return {"worker": owner, "batches": batches, "urls": urls_done}